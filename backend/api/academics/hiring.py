@@ -11,10 +11,17 @@ from backend.models.pagination import Paginated, PaginationParams
 
 from ...services.academics import HiringService
 
-from ...models.academics.hiring.application_review import HiringStatus
+from ...models.academics.hiring.application_review import (
+    ApplicationReviewChange,
+    HiringStatus,
+)
 from ...models.academics.hiring.hiring_assignment import *
 from ...models.academics.hiring.hiring_level import *
-from ...models.academics.hiring.conflict_check import ConflictCheck
+from ...models.academics.hiring.hiring_rollup import HiringRollup
+from ...models.academics.hiring.conflict_check import (
+    ConflictCheck,
+    ConflictCheckMatrix,
+)
 
 from ...api.authentication import registered_user
 from ...models.user import User
@@ -55,6 +62,43 @@ def get_hiring_admin_course_overview(
     return hiring_service.get_hiring_admin_course_overview(subject, course_site_id)
 
 
+@api.get("/admin/{term_id}/proposal", tags=["Hiring"])
+def propose_hiring_assignments(
+    term_id: str,
+    budget: float | None = None,
+    subject: User = Depends(registered_user),
+    hiring_service: HiringService = Depends(),
+) -> list[HiringAssignmentDraft]:
+    """
+    Proposes draft hiring assignments for every course site in a term.
+    """
+    return hiring_service.propose_hiring_assignments(subject, term_id, budget)
+
+
+@api.get("/admin/{term_id}/rollup", tags=["Hiring"])
+def get_hiring_rollup(
+    term_id: str,
+    subject: User = Depends(registered_user),
+    hiring_service: HiringService = Depends(),
+) -> HiringRollup:
+    """
+    Returns the term-wide coverage, costs, and assignment counts of hiring.
+    """
+    return hiring_service.get_hiring_rollup(subject, term_id)
+
+
+@api.get("/admin/{term_id}/conflict_check", tags=["Hiring"])
+def conflict_check_matrix(
+    term_id: str,
+    subject: User = Depends(registered_user),
+    hiring_service: HiringService = Depends(),
+) -> ConflictCheckMatrix:
+    """
+    Returns the conflict checks of every application in a term.
+    """
+    return hiring_service.conflict_check_matrix(subject, term_id)
+
+
 @api.post("/assignment", tags=["Hiring"])
 def create_hiring_assignment(
     assignment: HiringAssignmentDraft,
@@ -138,6 +182,18 @@ def create_missing_course_sites_for_term(
     return hiring_service.create_missing_course_sites_for_term(subject, term_id)
 
 
+@api.post("/create_reviews", tags=["Hiring"])
+def create_missing_reviews_for_term(
+    term_id: str,
+    subject: User = Depends(registered_user),
+    hiring_service: HiringService = Depends(),
+) -> int:
+    """
+    Creates missing application reviews for every course site in the term
+    """
+    return hiring_service.create_missing_reviews_for_term(subject, term_id)
+
+
 @api.get("/{course_site_id}", tags=["Hiring"])
 def get_status(
     course_site_id: int,
@@ -163,6 +219,19 @@ def update_status(
     return hiring_service.update_status(subject, course_site_id, hiring_status)
 
 
+@api.patch("/{course_site_id}", tags=["Hiring"])
+def update_status_changes(
+    course_site_id: int,
+    changes: list[ApplicationReviewChange],
+    subject: User = Depends(registered_user),
+    hiring_service: HiringService = Depends(),
+) -> list[ApplicationReviewChange]:
+    """
+    Saves only the moved or edited reviews of a course site's hiring board.
+    """
+    return hiring_service.update_status_changes(subject, course_site_id, changes)
+
+
 @api.get("/summary/{term_id}", tags=["Hiring"])
 def get_hiring_summary_overview(
     term_id: str,
@@ -191,22 +260,11 @@ def get_hiring_summary_csv(
     hiring_service: HiringService = Depends(),
 ) -> StreamingResponse:
     """
-    Returns the state of hiring as a summary.
+    Streams the state of hiring as a summary CSV.
     """
-    # Get the data
-    data = hiring_service.get_hiring_summary_for_csv(subject, term_id)
-    # Create IO Stream
-    stream = io.StringIO()
-    # Create dictionary writer to convert objects to CSV rows
-    # Note: __dict__ converts the Pydantic model into a dictionary of key-value
-    # pairs, enabling access of the object's keys.
-    wr = csv.DictWriter(stream, delimiter=",", fieldnames=list(data[0].__dict__.keys()))
-    wr.writeheader()
-    wr.writerows([d.__dict__ for d in data])
-    # Create HTTP response of type `text/csv`
-    response = StreamingResponse(iter([stream.getvalue()]), media_type="text/csv")
+    chunks = hiring_service.get_hiring_summary_for_csv(subject, term_id)
+    response = StreamingResponse(chunks, media_type="text/csv")
     response.headers["Content-Disposition"] = "attachment; filename=export.csv"
-    # Return the response
     return response
 
 
@@ -217,22 +275,11 @@ def get_applicants_for_site_csv(
     hiring_service: HiringService = Depends(),
 ) -> StreamingResponse:
     """
-    Returns the state of hiring as a summary.
+    Streams the applicants to a course site as a CSV.
     """
-    # Get the data
-    data = hiring_service.get_course_site_hiring_status_csv(subject, course_site_id)
-    # Create IO Stream
-    stream = io.StringIO()
-    # Create dictionary writer to convert objects to CSV rows
-    # Note: __dict__ converts the Pydantic model into a dictionary of key-value
-    # pairs, enabling access of the object's keys.
-    wr = csv.DictWriter(stream, delimiter=",", fieldnames=list(data[0].__dict__.keys()))
-    wr.writeheader()
-    wr.writerows([d.__dict__ for d in data])
-    # Create HTTP response of type `text/csv`
-    response = StreamingResponse(iter([stream.getvalue()]), media_type="text/csv")
+    chunks = hiring_service.get_course_site_hiring_status_csv(subject, course_site_id)
+    response = StreamingResponse(chunks, media_type="text/csv")
     response.headers["Content-Disposition"] = "attachment; filename=export.csv"
-    # Return the response
     return response
 
 
@@ -319,39 +366,15 @@ def get_assignments_csv(
     hiring_service: HiringService = Depends(),
 ) -> StreamingResponse:
     """
-    Returns the state of hiring as a summary.
+    Streams the committed and final hires of a course site as a CSV.
     """
-    data = hiring_service.get_assignment_summary_for_instructors_csv(
+    chunks = hiring_service.get_assignment_summary_for_instructors_csv(
         subject, course_site_id
     )
-    # Create IO Stream
-    stream = io.StringIO()
-    # Create dictionary writer to convert objects to CSV rows
-    # Note: __dict__ converts the Pydantic model into a dictionary of key-value
-    # pairs, enabling access of the object's keys.
-    keys = ["first_name", "last_name", "onyen", "pid", "email", "level_title"]
-
-    wr = csv.DictWriter(stream, delimiter=",", fieldnames=keys)
-    wr.writeheader()
-    rows = []
-    for d in data:
-        rows.append(
-            {
-                "first_name": d.first_name,
-                "last_name": d.last_name,
-                "pid": d.pid,
-                "onyen": d.onyen,
-                "email": d.email,
-                "level_title": d.level_title,
-            }
-        )
-    wr.writerows(rows)
-    # Create HTTP response of type `text/csv`
-    response = StreamingResponse(iter([stream.getvalue()]), media_type="text/csv")
+    response = StreamingResponse(chunks, media_type="text/csv")
     response.headers["Content-Disposition"] = (
-        f"attachment; filename=hiring_assignments.csv"
+        "attachment; filename=hiring_assignments.csv"
     )
-    # Return the response
     return response
 
 
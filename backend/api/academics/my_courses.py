@@ -35,16 +35,20 @@ openapi_tags = {
 
 @api.get("", tags=["My Courses"])
 def get_user_courses(
+    current_only: bool = False,
     subject: User = Depends(registered_user),
     course_site_svc: CourseSiteService = Depends(),
 ) -> list[TermOverview]:
     """
     Get the courses for the current user organized by term.
 
+    Args:
+        current_only: Whether to only include terms that have not ended.
+
     Returns:
         list[TermOverview]
     """
-    return course_site_svc.get_user_course_sites(subject)
+    return course_site_svc.get_user_course_sites(subject, current_only)
 
 
 @api.get("/{course_site_id}", tags=["My Courses"])
@@ -1,8 +1,10 @@
 """User administration API."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from ...services import UserService, UserPermissionException
 from ...models import User, Paginated, PaginationParams
+from ...models.export_format import ExportFormat
 from ..authentication import registered_user
 
 
@@ -35,3 +37,22 @@ def list_users(
         return user_service.list(subject, pagination_params)
     except UserPermissionException as e:
         raise HTTPException(status_code=403, detail=str(e))
+
+
+@api.get("/export", tags=["(Admin) Users"])
+def export_users(
+    subject: User = Depends(registered_user),
+    user_service: UserService = Depends(),
+    filter: str = "",
+    format: ExportFormat = ExportFormat.CSV,
+) -> StreamingResponse:
+    """Stream users matching the filter as a CSV or NDJSON file."""
+    try:
+        chunks = user_service.export(subject, filter, format)
+    except UserPermissionException as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    response = StreamingResponse(chunks, media_type=format.media_type)
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=users.{format.value}"
+    )
+    return response
@@ -2,7 +2,7 @@
 
 Application routes are used to create, retrieve, and update Applications."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from typing import List
 
@@ -100,13 +100,16 @@ def delete_application(
 )
 def get_eligible_sections(
     application_service: ApplicationService = Depends(),
-) -> list[CatalogSectionIdentity]:
+) -> Response:
     """
     Get sections that an applicant can apply to.
 
+    The response body is served from cached, pre-serialized sections.
+
     Returns:
         list[CatalogSectionIdentity]: All sections.
     """
-
-    # Return all applications
-    return application_service.eligible_sections()
+    return Response(
+        content=application_service.eligible_sections_json(),
+        media_type="application/json",
+    )
@@ -1,6 +1,6 @@
 """Articles API"""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from ..api.authentication import registered_user
 
@@ -29,12 +29,17 @@ def get_welcome_status(
     return article_svc.get_welcome_overview(subject)
 
 
-@api.get("/welcome/unauthenticated", tags=["Articles"])
+@api.get("/welcome/unauthenticated", response_model=WelcomeOverview, tags=["Articles"])
 def get_welcome_status_unauthenticated(
     article_svc: ArticleService = Depends(),
-) -> WelcomeOverview:
-    """Retrieves the welcome status for an unauthenticated user."""
-    return article_svc.get_welcome_overview(None)
+) -> Response:
+    """Retrieves the welcome status for an unauthenticated user.
+
+    The response body is served from a cached, pre-serialized overview."""
+    return Response(
+        content=article_svc.get_welcome_overview_json_unauthenticated(),
+        media_type="application/json",
+    )
 
 
 @api.get("/list", tags=["Articles"])
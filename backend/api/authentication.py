@@ -89,18 +89,24 @@ def registered_user(
 ) -> User:
     """Returns the authenticated user or raises a 401 HTTPException if the user is not authenticated."""
     if token:
-        try:
-            auth_info = jwt.decode(
-                token.credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM]
-            )
-            user = user_service.get(auth_info["pid"])
-            if user:
-                return user
-        except:
-            ...
+        user = user_from_token(token.credentials, user_service)
+        if user:
+            return user
     raise HTTPException(status_code=401, detail="Unauthorized")
 
 
+def user_from_token(token: str, user_service: UserService) -> User | None:
+    """Returns the user a bearer token was issued to, or None if the token is invalid.
+
+    Used directly by WebSocket routes, where browsers cannot send an Authorization header
+    and the token is passed as a query parameter instead."""
+    try:
+        auth_info = jwt.decode(token, _JWT_SECRET, algorithms=[_JST_ALGORITHM])
+        return user_service.get(auth_info["pid"])
+    except:
+        return None
+
+
 def authenticated_pid(
     token: HTTPAuthorizationCredentials | None = Depends(HTTPBearer()),
 ) -> tuple[int, str]:
@@ -6,6 +6,7 @@ This API handles AI-powered chatbot requests using the OpenAI service.
 from fastapi import APIRouter, Depends
 from datetime import datetime, timedelta
 import json
+import logging
 
 from backend.models import User
 from backend.models.chat import ChatRequest, ChatResponse
@@ -25,6 +26,7 @@ from backend.services.office_hours.office_hours import OfficeHoursService
 from backend.services.office_hours.ticket import OfficeHourTicketService
 from backend.services.academics.course_site import CourseSiteService
 
+logger = logging.getLogger(__name__)
 
 api = APIRouter(prefix="/api", tags=["Chat"])
 openapi_tags = {
@@ -35,9 +37,9 @@ openapi_tags = {
 
 def get_user_course_sites(subject: User, course_site_svc: CourseSiteService):
     """
-    Get all course sites associated with the current user.
+    Get the course sites of the current user in terms that have not ended.
     """
-    return course_site_svc.get_user_course_sites(subject)
+    return course_site_svc.get_user_course_sites(subject, current_only=True)
 
 
 def get_office_hours_student_can_attend(
@@ -103,9 +105,20 @@ def chat_with_bot(
     oh_ticket_svc: OfficeHourTicketService = Depends(),
     subject: User = Depends(registered_user),
 ):
-    print("Chat endpoint hit")
-    print("Incoming ChatRequest message:", request.message)
-    print("Incoming ChatRequest history:", request.history)
+    logger.info(
+        "Chat request received",
+        extra={"history_length": len(request.history or [])},
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Chat request contents",
+            extra={
+                "chat_message": request.message,
+                "chat_history": [
+                    message.model_dump() for message in request.history or []
+                ],
+            },
+        )
 
     today = datetime.now().strftime("%A, %B %d, %Y")
     time = datetime.now()
@@ -463,7 +476,7 @@ available room.
                     )
                 }
             except Exception as e:
-                print("Error changing reservation:", e)
+                logger.exception("Error changing reservation")
 
                 return {"response": f"Could not change reservation: {str(e)}"}
 
@@ -533,6 +546,5 @@ available room.
             except Exception as e:
                 return {"response": f"Failed to submit ticket: {e}"}
 
-    print("GPT message:", response)
-    print("GPT message content:", response.content)
+    logger.debug("Chat completion received", extra={"content": response.content})
     return {"response": response.content or "I'm not sure how to help with that."}
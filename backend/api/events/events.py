@@ -3,6 +3,7 @@
 Event routes are used to create, retrieve, and update Events."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta
 from typing import Sequence
 from backend.models.public_user import PublicUser
@@ -15,6 +16,7 @@ from ...services.user import UserService
 from ...services.exceptions import ResourceNotFoundException, UserPermissionException
 from ...models.event import EventDraft, EventOverview, EventStatusOverview
 from ...models.coworking.time_range import TimeRange
+from ...models.export_format import ExportFormat
 from ...api.authentication import registered_user
 from ...models.user import User
 
@@ -310,3 +312,35 @@ def get_registered_users_of_event(
         )
     except UserPermissionException as e:
         raise HTTPException(status_code=403, detail=str(e))
+
+
+@api.get("/{event_id}/registrations/users/export", tags=["Events"])
+def export_registered_users_of_event(
+    event_id: int,
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+    format: ExportFormat = ExportFormat.CSV,
+) -> StreamingResponse:
+    """
+    Stream the registered users of an event as a CSV or NDJSON file.
+
+    Args:
+        event_id: an int representing a unique Event
+        subject: a valid User model representing the currently logged in User
+        event_service: a valid EventService
+        format: the file format of the export, `csv` or `ndjson`
+
+    Returns:
+        StreamingResponse: The attendees of the event, one row per attendee
+    """
+    try:
+        chunks = event_service.export_registered_users_of_event(
+            subject, event_id, format
+        )
+    except UserPermissionException as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    response = StreamingResponse(chunks, media_type=format.media_type)
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=event_{event_id}_registrations.{format.value}"
+    )
+    return response
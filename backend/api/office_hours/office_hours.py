@@ -3,6 +3,7 @@
 APIs handling office hours.
 """
 
+from datetime import date
 from fastapi import APIRouter, Depends
 
 from ...models.office_hours.office_hours_details import PrimaryOfficeHoursDetails
@@ -108,6 +109,29 @@ def create_recurring_office_hours(
     return oh_event_recurrence_svc.create_recurring(subject, site_id, oh, recur)
 
 
+@api.post(
+    "/{site_id}/recurring/{recurrence_pattern_id}/{occurrence_date}",
+    tags=["Office Hours"],
+)
+def materialize_office_hours_occurrence(
+    site_id: int,
+    recurrence_pattern_id: int,
+    occurrence_date: date,
+    subject: User = Depends(registered_user),
+    oh_event_recurrence_svc: OfficeHoursRecurrenceService = Depends(),
+) -> OfficeHours:
+    """
+    Stores an occurrence of a virtual recurrence pattern as office hours of its own, so
+    that it can be edited, deleted, or receive tickets.
+
+    Returns:
+        OfficeHours
+    """
+    return oh_event_recurrence_svc.materialize_occurrence(
+        subject, site_id, recurrence_pattern_id, occurrence_date
+    )
+
+
 @api.put("/{site_id}", tags=["Office Hours"])
 def update_office_hours(
     site_id: int,
@@ -1,8 +1,25 @@
-from fastapi import APIRouter
+import asyncio
+from fastapi import APIRouter, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
 from starlette.types import Scope, Receive, Send
 from fastapi.websockets import WebSocket, WebSocketDisconnect
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from .authentication import user_from_token
+from ..database import engine
+from ..models.user import User
+from ..models.roster_role import RosterRole
+from ..models.office_hours.queue_event import OfficeHoursQueueEvent
+from ..services import PermissionService, UserService
+from ..services.exceptions import CoursePermissionException, ResourceNotFoundException
+from ..services.academics.course_membership import CourseMembershipResolver
+from ..services.office_hours import OfficeHoursService
+from ..services.office_hours.queue_broadcaster import (
+    QueueSubscription,
+    queue_broadcaster,
+)
+
 
 class WebSocketMiddleware(BaseHTTPMiddleware):
 
@@ -27,3 +44,73 @@ async def echo(websocket: WebSocket):
             await websocket.send_json({"type": "echo", "data": message})
     except WebSocketDisconnect:
         ...
+
+
+@api.websocket("/office-hours/{office_hours_id}/queue")
+async def office_hours_queue(websocket: WebSocket, office_hours_id: int, token: str):
+    """
+    Pushes changes to an office hours queue as they happen.
+
+    Clients load the queue over HTTP, then connect here with their bearer token as the
+    `token` query parameter and apply each `OfficeHoursQueueEvent` they receive. Course
+    staff receive every ticket; students receive the full ticket only for their own.
+    """
+    member = await run_in_threadpool(
+        _authorize_queue_subscriber, token, office_hours_id
+    )
+    if member is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    user, role = member
+    subscription = queue_broadcaster.subscribe(office_hours_id)
+    await websocket.accept()
+    sender = asyncio.create_task(
+        _send_queue_events(websocket, subscription, user, role)
+    )
+    try:
+        # Clients do not send messages; receiving only detects the disconnect.
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        ...
+    finally:
+        sender.cancel()
+        queue_broadcaster.unsubscribe(subscription)
+
+
+def _authorize_queue_subscriber(
+    token: str, office_hours_id: int
+) -> tuple[User, RosterRole] | None:
+    """Returns the user and their role in an office hours event, or None if not allowed.
+
+    Uses its own short-lived session so that a database connection is not held for the
+    lifetime of the socket."""
+    with Session(engine) as session:
+        user = user_from_token(token, UserService(session, PermissionService(session)))
+        if user is None:
+            return None
+        try:
+            role = OfficeHoursService(
+                session, CourseMembershipResolver(session)
+            ).get_oh_event_role(user, office_hours_id)
+        except (CoursePermissionException, ResourceNotFoundException):
+            return None
+        return user, RosterRole(role.role)
+
+
+async def _send_queue_events(
+    websocket: WebSocket,
+    subscription: QueueSubscription,
+    user: User,
+    role: RosterRole,
+) -> None:
+    """Forwards events from a queue subscription to a client, hiding other students' tickets."""
+    while True:
+        event: OfficeHoursQueueEvent = await subscription.get()
+        if role == RosterRole.STUDENT and (
+            event.ticket is None
+            or user.id not in [creator.id for creator in event.ticket.creators]
+        ):
+            event = event.model_copy(update={"ticket": None})
+        await websocket.send_json(event.model_dump(mode="json"))
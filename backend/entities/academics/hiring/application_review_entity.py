@@ -13,6 +13,7 @@ from ....models.academics.hiring.application_review import (
     ApplicationReviewOverview,
     ApplicationReviewCsvRow,
 )
+from ....models.academics.section import CatalogSectionIdentity
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2024"
@@ -58,6 +59,10 @@ class ApplicationReviewEntity(EntityBase):
     preference: Mapped[int] = mapped_column(Integer)
     # Notes
     notes: Mapped[str] = mapped_column(String)
+    # Incremented on every change, so that changes made from a stale copy are rejected
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     @classmethod
     def from_model(cls, model: ApplicationReview) -> Self:
@@ -76,6 +81,7 @@ class ApplicationReviewEntity(EntityBase):
             status=model.status,
             preference=model.preference,
             notes=model.notes,
+            version=model.version,
         )
 
     def to_overview_model(self) -> ApplicationReviewOverview:
@@ -129,18 +135,27 @@ class ApplicationReviewEntity(EntityBase):
             status=self.status,
             preference=self.preference,
             notes=self.notes,
+            version=self.version,
             application=self.application.to_review_overview_model(),
             applicant_id=self.application.user_id,
             applicant_course_ranking=applicant_preference_for_course
             + 1,  # Increment since starting index is 0.
         )
 
-    def to_csv_row(self) -> ApplicationReviewCsvRow:
+    def to_csv_row(
+        self, catalog_sections: dict[int, CatalogSectionIdentity] | None = None
+    ) -> ApplicationReviewCsvRow:
         """
         This method converts an application into an application overview.
+
+        Args:
+            catalog_sections: Catalog identities of sections by ID, such as a term's
+                cached section labels. Sections not in it are looked up through their
+                course.
         """
+        catalog_sections = catalog_sections or {}
         section_preferences_models = [
-            section.to_catalog_identity_model()
+            catalog_sections.get(section.id) or section.to_catalog_identity_model()
             for section in self.application.preferred_sections
         ]
         section_preferences = [
@@ -136,7 +136,16 @@ class HiringAssignmentEntity(EntityBase):
             notes=self.notes,
         )
 
-    def to_summary_overview_model(self) -> HiringAssignmentSummaryOverview:
+    def to_summary_overview_model(
+        self, course: str | None = None
+    ) -> HiringAssignmentSummaryOverview:
+        """
+        Converts the assignment into a summary overview.
+
+        Args:
+            course: Label of the assignment's course, such as `COMP110`. Computed from
+                the course site's first section when not given.
+        """
         sections = self.course_site.sections
         instructors: list[str] = []
         for section in sections:
@@ -150,7 +159,7 @@ class HiringAssignmentEntity(EntityBase):
             id=self.id,
             application_review_id=self.application_review_id,
             course_site_id=self.course_site_id,
-            course="COMP" + self.course_site.sections[0].course.number,
+            course=course or "COMP" + self.course_site.sections[0].course.number,
             user=self.user.to_model(),
             instructors=", ".join(map(str, list(set(instructors)))),
             level=self.hiring_level.to_model(),
@@ -8,6 +8,7 @@ from typing import Self
 from ..models.event import EventOverview, EventDraft
 from ..models.registration_type import RegistrationType
 from ..models.user import User
+from ..models.public_user import PublicUser
 
 from datetime import datetime
 
@@ -40,6 +41,12 @@ class EventEntity(EntityBase):
     public: Mapped[bool] = mapped_column(Boolean)
     # Maximim number of people who can register for the event
     registration_limit: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Number of attendees registered for the event
+    # NOTE: This counter is maintained by `EventService` with atomic updates so that the
+    # registration limit can be enforced without counting registrations.
+    registration_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     # URL for the image for an event.
     image_url: Mapped[str] = mapped_column(String, nullable=True)
     # This field provides a registration URL if external registration is used.
@@ -81,12 +88,6 @@ class EventEntity(EntityBase):
 
     def to_overview_model(self, subject: User | None = None) -> EventOverview:
         """Creates an overview model from an event."""
-        attendees = [
-            registration.to_flat_model()
-            for registration in self.registrations
-            if registration.registration_type == RegistrationType.ATTENDEE
-        ]
-
         user_registration = (
             [
                 registration
@@ -117,6 +118,29 @@ class EventEntity(EntityBase):
             for registration in organizer_registrations
         ]
 
+        return self.to_overview_model_from_aggregates(
+            organizers=organizers,
+            user_registration_type=(
+                user_registration.registration_type if user_registration else None
+            ),
+        )
+
+    def to_overview_model_from_aggregates(
+        self,
+        organizers: list[PublicUser],
+        user_registration_type: RegistrationType | None,
+    ) -> EventOverview:
+        """
+        Creates an overview model from an event using registration data that was
+        already computed by the caller, so that the `registrations` relationship
+        is never lazily loaded.
+
+        Parameters:
+            organizers (list[PublicUser]): Organizers of the event
+            user_registration_type (RegistrationType | None): Registration type of the subject, if any
+        Returns:
+            EventOverview: Overview model of the event
+        """
         return EventOverview(
             id=self.id,
             name=self.name,
@@ -126,15 +150,13 @@ class EventEntity(EntityBase):
             description=self.description,
             public=self.public,
             registration_limit=self.registration_limit,
-            number_registered=len(attendees),
+            number_registered=self.registration_count,
             organization_slug=self.organization.slug,
             organization_icon=self.organization.logo,
             organization_name=self.organization.shorthand,
             organization_id=self.organization.id,
             organizers=organizers,
-            user_registration_type=(
-                user_registration.registration_type if user_registration else None
-            ),
+            user_registration_type=user_registration_type,
             image_url=self.image_url,
             override_registration_url=self.override_registration_url,
         )
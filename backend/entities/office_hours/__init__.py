@@ -3,3 +3,6 @@ from .office_hours_recurrence_pattern_entity import OfficeHoursRecurrencePattern
 from .course_site_entity import CourseSiteEntity
 from .ticket_entity import OfficeHoursTicketEntity
 from .user_created_tickets_table import user_created_tickets_table
+from .office_hours_recurrence_exception_table import (
+    office_hours_recurrence_exception_table,
+)
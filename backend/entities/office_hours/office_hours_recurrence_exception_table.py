@@ -0,0 +1,29 @@
+"""Definition of SQLAlchemy table recording exceptions to virtual recurrence patterns."""
+
+from sqlalchemy import Column, Date, ForeignKey, Table
+from ..entity_base import EntityBase
+
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+# Occurrences of a virtual recurrence pattern that are no longer expanded when read,
+# because they were stored as an office hours event of their own so that they could be
+# edited or receive tickets. The event is cleared when it is deleted, which leaves the
+# occurrence cancelled.
+office_hours_recurrence_exception_table = Table(
+    "office_hours__recurrence_exception",
+    EntityBase.metadata,
+    Column(
+        "recurrence_pattern_id",
+        ForeignKey("office_hours_recurrence_pattern.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("occurrence_date", Date, primary_key=True),
+    Column(
+        "office_hours_id",
+        ForeignKey("office_hours.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
+)
@@ -40,6 +40,13 @@ class OfficeHoursRecurrencePatternEntity(EntityBase):
     recur_saturday: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     recur_sunday: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
+    # Whether occurrences after the first are expanded when read rather than stored.
+    # Occurrences of a virtual pattern are only stored once they are needed, such as
+    # when they are in progress and may receive tickets.
+    virtual: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default="false", nullable=False
+    )
+
     # NOTE: One-to-many relationship of OfficeHoursRecurrence to OfficeHoursEvent
     office_hours: Mapped[list["OfficeHoursEntity"]] = relationship(
         back_populates="recurrence_pattern", cascade="all, delete"
@@ -66,6 +73,7 @@ class OfficeHoursRecurrencePatternEntity(EntityBase):
             recur_friday=model.recur_friday,
             recur_saturday=model.recur_saturday,
             recur_sunday=model.recur_sunday,
+            virtual=model.virtual,
         )
 
     @classmethod
@@ -90,6 +98,7 @@ class OfficeHoursRecurrencePatternEntity(EntityBase):
             recur_friday=model.recur_friday,
             recur_saturday=model.recur_saturday,
             recur_sunday=model.recur_sunday,
+            virtual=model.virtual,
         )
 
     def to_model(self) -> OfficeHoursRecurrencePattern:
@@ -111,4 +120,5 @@ class OfficeHoursRecurrencePatternEntity(EntityBase):
             recur_friday=self.recur_friday,
             recur_saturday=self.recur_saturday,
             recur_sunday=self.recur_sunday,
+            virtual=self.virtual,
         )
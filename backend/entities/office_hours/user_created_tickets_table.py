@@ -1,6 +1,6 @@
 """Definition of SQLAlchemy table-backed object mapping entity for Office Hour tickets."""
 
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Table, text
 from ..entity_base import EntityBase
 
 
@@ -14,4 +14,15 @@ user_created_tickets_table = Table(
     EntityBase.metadata,
     Column("ticket_id", ForeignKey("office_hours__ticket.id"), primary_key=True),
     Column("member_id", ForeignKey("academics__user_section.id"), primary_key=True),
+    # Copies of the ticket's event and whether it is queued, so that the database can
+    # enforce that a member has at most one queued ticket per office hours event
+    Column("office_hours_id", ForeignKey("office_hours.id"), nullable=True),
+    Column("queued", Boolean, default=False, server_default="false", nullable=False),
+    Index(
+        "office_hours__user_created_ticket_queued_idx",
+        "office_hours_id",
+        "member_id",
+        unique=True,
+        postgresql_where=text("queued"),
+    ),
 )
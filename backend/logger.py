@@ -0,0 +1,120 @@
+"""Structured, non-blocking application logging.
+
+Modules log through the standard library with `logging.getLogger(__name__)`. Once
+`configure_logging` is called, records are handed to a queue by the thread that logs
+them and written to stdout as JSON lines by a background listener thread, so request
+handlers never block on output. Each record carries the ID of the request it was logged
+during, and extra fields passed with `extra={...}` are included as JSON properties.
+
+Levels are configured with environment variables: `LOG_LEVEL` sets the root level and
+`LOG_LEVELS` overrides it per module, e.g. `backend.api.chat=DEBUG,sqlalchemy=WARNING`.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+from .env import getenv
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+"""ID of the request being handled, attached to every record logged while handling it."""
+
+# Attributes every LogRecord has, which are not reported as extra fields
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "request_id"}
+
+_listener: QueueListener | None = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the ID of the request being handled when they are logged."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry |= {
+            key: value
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """Queues records without formatting them, leaving that to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the base class, keep the message unformatted so that the listener's
+        # formatter does not nest a plain-text record inside the JSON message
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_traceback_formatter = logging.Formatter()
+
+
+def parse_levels(levels: str) -> dict[str, str]:
+    """Parses per-module levels in the form `module=LEVEL,module=LEVEL`."""
+    parsed = {}
+    for assignment in levels.split(","):
+        if assignment.strip() == "":
+            continue
+        module, _, level = assignment.partition("=")
+        parsed[module.strip()] = level.strip().upper()
+    return parsed
+
+
+def configure_logging() -> None:
+    """Routes all logging through a queue to JSON on stdout. Safe to call repeatedly."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    queue_handler = _StructuredQueueHandler(queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(getenv("LOG_LEVEL", "INFO").upper())
+    for module, level in parse_levels(getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(module).setLevel(level)
+
+    _listener = QueueListener(queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
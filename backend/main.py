@@ -1,6 +1,7 @@
 """Entrypoint of backend API exposing the FastAPI `app` to be served by an application server such as uvicorn."""
 
 from pathlib import Path
+from uuid import uuid4
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.gzip import GZipMiddleware
@@ -33,18 +34,23 @@ from .api.admin import users as admin_users
 from .api.admin import roles as admin_roles
 from .api.admin import facts as admin_facts
 
+from .logger import configure_logging, request_id
 from .services.exceptions import (
     RecurringOfficeHourEventException,
     UserPermissionException,
     ResourceNotFoundException,
     CoursePermissionException,
     CourseDataScrapingException,
+    StaleResourceException,
 )
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+# Route application logging through the non-blocking JSON log pipeline
+configure_logging()
+
 description = """
 Welcome to the UNC Computer Science **Experience Labs** RESTful Application Programming Interface.
 """
@@ -79,6 +85,19 @@ app = FastAPI(
 # Use GZip middleware for compressing HTML responses over the network
 app.add_middleware(GZipMiddleware)
 
+
+# Correlate log records with the request they were logged during
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    token = request_id.set(request.headers.get("X-Request-ID") or uuid4().hex)
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id.get()
+        return response
+    finally:
+        request_id.reset(token)
+
+
 # Plugging in each of the router APIs
 feature_apis = [
     status,
@@ -141,6 +160,11 @@ def resource_not_found_exception_handler(
     return JSONResponse(status_code=404, content={"message": str(e)})
 
 
+@app.exception_handler(StaleResourceException)
+def stale_resource_exception_handler(request: Request, e: StaleResourceException):
+    return JSONResponse(status_code=409, content={"message": str(e)})
+
+
 @app.exception_handler(ReservationException)
 def reservation_exception_handler(request: Request, e: ReservationException):
     return JSONResponse(status_code=403, content={"message": str(e)})
@@ -166,7 +190,9 @@ import logging
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logging.error(f"Validation error: {exc.errors()}")
+    logging.getLogger(__name__).error(
+        "Validation error", extra={"errors": exc.errors()}
+    )
     return JSONResponse(status_code=422, content={"detail": exc.errors()})
 
 
@@ -0,0 +1,36 @@
+"""Add maintained registration_count to event
+
+Revision ID: 3c9e5d2a7b41
+Revises: fadbd2b135e9
+Create Date: 2025-06-02 10:12:41.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e5d2a7b41'
+down_revision = 'fadbd2b135e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('event', sa.Column('registration_count', sa.Integer(), server_default='0', nullable=False))
+    # Backfill the counter from existing attendee registrations
+    op.execute(
+        """
+        UPDATE event
+        SET registration_count = (
+            SELECT COUNT(*)
+            FROM event_registration
+            WHERE event_registration.event_id = event.id
+            AND event_registration.registration_type = 'ATTENDEE'
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('event', 'registration_count')
@@ -0,0 +1,24 @@
+"""Add a version number to application reviews for optimistic concurrency
+
+Revision ID: 3e5a7c9d1b24
+Revises: 9b4c6e1f2a57
+Create Date: 2026-10-19 10:14:52.118346
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e5a7c9d1b24'
+down_revision = '9b4c6e1f2a57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('academics__hiring__application_review', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('academics__hiring__application_review', 'version')
@@ -0,0 +1,24 @@
+"""Add queue index to office hours tickets
+
+Revision ID: 5a7e1c3d9b20
+Revises: 3c9e5d2a7b41
+Create Date: 2025-06-04 14:27:09.512836
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7e1c3d9b20'
+down_revision = '3c9e5d2a7b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('office_hours__ticket_queue_idx', 'office_hours__ticket', ['office_hours_id', 'state', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('office_hours__ticket_queue_idx', table_name='office_hours__ticket')
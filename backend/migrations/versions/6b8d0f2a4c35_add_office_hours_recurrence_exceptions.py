@@ -0,0 +1,60 @@
+"""Record stored and cancelled occurrences of virtual office hours recurrence patterns
+
+Revision ID: 6b8d0f2a4c35
+Revises: 3e5a7c9d1b24
+Create Date: 2026-10-19 16:22:08.530194
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "6b8d0f2a4c35"
+down_revision = "3e5a7c9d1b24"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "office_hours__recurrence_exception",
+        sa.Column("recurrence_pattern_id", sa.Integer(), nullable=False),
+        sa.Column("occurrence_date", sa.Date(), nullable=False),
+        sa.Column("office_hours_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["office_hours_id"], ["office_hours.id"], ondelete="SET NULL"
+        ),
+        sa.ForeignKeyConstraint(
+            ["recurrence_pattern_id"],
+            ["office_hours_recurrence_pattern.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("recurrence_pattern_id", "occurrence_date"),
+    )
+    # Backfill the occurrences of virtual patterns stored after their first, which is
+    # the template the other occurrences are expanded from
+    op.execute(
+        """
+        INSERT INTO office_hours__recurrence_exception
+            (recurrence_pattern_id, occurrence_date, office_hours_id)
+        SELECT DISTINCT ON (office_hours.recurrence_pattern_id, office_hours.start_time::date)
+            office_hours.recurrence_pattern_id, office_hours.start_time::date, office_hours.id
+        FROM office_hours
+        JOIN office_hours_recurrence_pattern
+            ON office_hours_recurrence_pattern.id = office_hours.recurrence_pattern_id
+        WHERE office_hours_recurrence_pattern.virtual
+        AND office_hours.id NOT IN (
+            SELECT DISTINCT ON (recurrence_pattern_id) id
+            FROM office_hours
+            WHERE recurrence_pattern_id IS NOT NULL
+            ORDER BY recurrence_pattern_id, start_time
+        )
+        ORDER BY office_hours.recurrence_pattern_id, office_hours.start_time::date, office_hours.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("office_hours__recurrence_exception")
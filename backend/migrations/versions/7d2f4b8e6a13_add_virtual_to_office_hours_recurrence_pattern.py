@@ -0,0 +1,24 @@
+"""Add virtual expansion mode to office hours recurrence patterns
+
+Revision ID: 7d2f4b8e6a13
+Revises: 5a7e1c3d9b20
+Create Date: 2025-06-06 09:41:52.207319
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2f4b8e6a13'
+down_revision = '5a7e1c3d9b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('office_hours_recurrence_pattern', sa.Column('virtual', sa.Boolean(), server_default='false', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('office_hours_recurrence_pattern', 'virtual')
@@ -0,0 +1,52 @@
+"""Enforce one queued office hours ticket per creator and event
+
+Revision ID: 9b4c6e1f2a57
+Revises: 7d2f4b8e6a13
+Create Date: 2025-06-09 11:03:26.740912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4c6e1f2a57'
+down_revision = '7d2f4b8e6a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('office_hours__user_created_ticket', sa.Column('office_hours_id', sa.Integer(), nullable=True))
+    op.add_column('office_hours__user_created_ticket', sa.Column('queued', sa.Boolean(), server_default='false', nullable=False))
+    op.create_foreign_key(None, 'office_hours__user_created_ticket', 'office_hours', ['office_hours_id'], ['id'])
+    # Backfill from the tickets, only marking a member's earliest queued ticket in an
+    # event as queued so that existing duplicates do not violate the new index
+    op.execute(
+        """
+        UPDATE office_hours__user_created_ticket
+        SET office_hours_id = office_hours__ticket.office_hours_id,
+            queued = office_hours__ticket.state = 'QUEUED'
+        FROM office_hours__ticket
+        WHERE office_hours__ticket.id = office_hours__user_created_ticket.ticket_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE office_hours__user_created_ticket AS later
+        SET queued = false
+        FROM office_hours__user_created_ticket AS earlier
+        WHERE later.queued AND earlier.queued
+        AND later.office_hours_id = earlier.office_hours_id
+        AND later.member_id = earlier.member_id
+        AND later.ticket_id > earlier.ticket_id
+        """
+    )
+    op.create_index('office_hours__user_created_ticket_queued_idx', 'office_hours__user_created_ticket', ['office_hours_id', 'member_id'], unique=True, postgresql_where=sa.text('queued'))
+
+
+def downgrade() -> None:
+    op.drop_index('office_hours__user_created_ticket_queued_idx', table_name='office_hours__user_created_ticket', postgresql_where=sa.text('queued'))
+    op.drop_constraint('office_hours__user_created_ticket_office_hours_id_fkey', 'office_hours__user_created_ticket', type_='foreignkey')
+    op.drop_column('office_hours__user_created_ticket', 'queued')
+    op.drop_column('office_hours__user_created_ticket', 'office_hours_id')
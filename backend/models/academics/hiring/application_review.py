@@ -28,6 +28,7 @@ class ApplicationReview(BaseModel):
     status: ApplicationReviewStatus = ApplicationReviewStatus.NOT_PROCESSED
     preference: int
     notes: str
+    version: int = 0
 
 
 class ApplicationReviewOverview(ApplicationReview):
@@ -47,6 +48,21 @@ class HiringStatus(BaseModel):
     preferred: list[ApplicationReviewOverview]
 
 
+class ApplicationReviewChange(BaseModel):
+    """
+    A review that was moved or edited on a course site's hiring board.
+
+    `version` is the version of the review the change was made from. In responses, it
+    is the version of the review after the change was saved.
+    """
+
+    id: int
+    status: ApplicationReviewStatus
+    preference: int
+    notes: str
+    version: int
+
+
 class ApplicationReviewCsvRow(BaseModel):
     """
     Model that represents the flat application data for CSV exporting.
@@ -1,6 +1,9 @@
 from pydantic import BaseModel
 
-from .hiring_assignment import HiringAssignmentSummaryOverview
+from .hiring_assignment import (
+    HiringAssignmentStatus,
+    HiringAssignmentSummaryOverview,
+)
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2024"
@@ -27,3 +30,48 @@ class ConflictCheck(BaseModel):
     application_id: int
     assignments: list[HiringAssignmentSummaryOverview]
     priorities: list[ApplicationPriority]
+
+
+class ConflictCheckCell(BaseModel):
+    """
+    Student and instructor rankings of one application for one course site, making up
+    a single cell of a `ConflictCheckMatrix`.
+    """
+
+    application_id: int
+    course_site_id: int
+    student_priority: int
+    instructor_priority: int
+
+
+class ConflictCheckAssignment(BaseModel):
+    """
+    An existing hiring assignment made from an application's review.
+    """
+
+    id: int
+    application_id: int
+    course_site_id: int
+    level_title: str
+    status: HiringAssignmentStatus
+
+
+class ConflictCheckCourseSite(BaseModel):
+    """
+    A course site that appears in a `ConflictCheckMatrix`.
+    """
+
+    id: int
+    title: str
+
+
+class ConflictCheckMatrix(BaseModel):
+    """
+    Sparse matrix of the conflict checks of every application in a term, indexed by
+    application and course site, so that admins can load them all at once.
+    """
+
+    term_id: str
+    course_sites: list[ConflictCheckCourseSite]
+    cells: list[ConflictCheckCell]
+    assignments: list[ConflictCheckAssignment]
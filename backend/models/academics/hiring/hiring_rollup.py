@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+
+from .hiring_assignment import HiringAssignmentStatus
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class HiringLevelRollup(BaseModel):
+    """
+    Number and total cost of the hiring assignments at one hiring level in a term.
+    """
+
+    level_id: int
+    title: str
+    count: int
+    cost: float
+
+
+class HiringRollup(BaseModel):
+    """
+    Term-wide totals of hiring, used by the hiring budget dashboard.
+    """
+
+    term_id: str
+    total_enrollment: int
+    total_cost: float
+    coverage: float
+    """Coverage the term's course sites still need, in the units of the admin overview."""
+    levels: list[HiringLevelRollup]
+    status_counts: dict[HiringAssignmentStatus, int]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
 
 from ...models.office_hours.office_hours_recurrence_pattern import (
     OfficeHoursRecurrencePattern,
@@ -69,7 +69,7 @@ class CourseMemberOverview(BaseModel):
 
 
 class OfficeHoursOverview(BaseModel):
-    id: int
+    id: int | None
     type: str
     mode: str
     description: str
@@ -80,6 +80,10 @@ class OfficeHoursOverview(BaseModel):
     queued: int
     total_tickets: int
     recurrence_pattern_id: int | None
+    # Unstored occurrences of virtual recurrence patterns have no ID, and are identified
+    # by their recurrence pattern and occurrence date instead
+    virtual: bool = False
+    occurrence_date: date | None = None
 
 
 class OfficeHourTicketOverview(BaseModel):
@@ -104,6 +108,9 @@ class OfficeHourQueueOverview(BaseModel):
     personal_tickets_called: int
     average_minutes: int
     total_tickets_called: int
+    average_handle_minutes: int
+    median_wait_minutes: int
+    p90_wait_minutes: int
     history: list[OfficeHourTicketOverview]
 
 
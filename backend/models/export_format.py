@@ -0,0 +1,21 @@
+"""Enum definition for the file formats of streamed exports."""
+
+from enum import Enum
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class ExportFormat(Enum):
+    """
+    Determines the file format of a streamed export.
+    """
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @property
+    def media_type(self) -> str:
+        """Media type of the HTTP response body for this format."""
+        return "text/csv" if self == ExportFormat.CSV else "application/x-ndjson"
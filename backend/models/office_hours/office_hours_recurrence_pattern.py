@@ -25,6 +25,9 @@ class NewOfficeHoursRecurrencePattern(BaseModel):
     recur_friday: bool
     recur_saturday: bool
     recur_sunday: bool
+    # When set, only the first occurrence is stored; later occurrences are expanded
+    # from it when office hours are read.
+    virtual: bool = False
 
     @field_validator("start_date", "end_date", mode="before")
     @classmethod
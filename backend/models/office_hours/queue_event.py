@@ -0,0 +1,38 @@
+"""Models for live changes pushed to subscribers of an office hours queue."""
+
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+
+from ..academics.my_courses import OfficeHourTicketOverview
+
+__authors__ = ["Ajay Gandecha"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class QueueEventType(Enum):
+    """
+    Determines the kind of change made to a ticket in an office hours queue.
+    """
+
+    CREATED = "created"
+    CALLED = "called"
+    CANCELED = "canceled"
+    CLOSED = "closed"
+
+
+class OfficeHoursQueueEvent(BaseModel):
+    """
+    Pydantic model to represent a single change to an office hours queue.
+
+    Clients load the queue once and then apply these events to keep it current.
+    `ticket_created_at` is enough for a student to recompute their queue position,
+    while the full `ticket` is only sent to course staff and the ticket's creators.
+    """
+
+    office_hours_id: int
+    type: QueueEventType
+    ticket_id: int
+    ticket_created_at: datetime
+    ticket: OfficeHourTicketOverview | None = None
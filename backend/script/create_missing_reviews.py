@@ -0,0 +1,30 @@
+"""Create missing application reviews for every course site in a term.
+
+Hiring pages only show applications that have a review for the course site. Reviews are
+created as applications are submitted or updated and as course sites are set up; run
+this to backfill reviews for applications that predate those paths.
+
+Usage: python3 -m backend.script.create_missing_reviews <term_id>
+"""
+
+import sys
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..services.application_review import insert_missing_reviews
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+if len(sys.argv) != 2:
+    print("Usage: python3 -m backend.script.create_missing_reviews <term_id>")
+    exit(1)
+
+term_id = sys.argv[1]
+
+with Session(engine) as session:
+    created = insert_missing_reviews(session, term_id)
+    session.commit()
+
+print(f"Created {created} application reviews for term {term_id}.")
@@ -12,6 +12,7 @@ from ...models.academics import CourseDetails
 from ...models.user import User
 from ...entities.academics import CourseEntity
 from ..permission import PermissionService
+from ..application import eligible_sections_cache
 
 from ...services.exceptions import ResourceNotFoundException
 from datetime import datetime
@@ -124,6 +125,7 @@ class CourseService:
 
         # Commit changes
         self._session.commit()
+        eligible_sections_cache.clear()
 
         # Return edited object
         return course_entity.to_details_model()
@@ -149,3 +151,4 @@ class CourseService:
         # Delete and commit changes
         self._session.delete(course_entity)
         self._session.commit()
+        eligible_sections_cache.clear()
@@ -0,0 +1,118 @@
+"""
+Request-scoped lookup of users' course memberships for permission checks, and the
+process-wide cache of each user's My Courses overview.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...database import db_session
+from ...models.user import User
+from ...models.roster_role import RosterRole
+from ...models.academics.my_courses import TermOverview
+from ...entities.academics.section_entity import SectionEntity
+from ...entities.academics.section_member_entity import SectionMemberEntity
+from ...entities.office_hours import CourseSiteEntity
+from ..cache import ServiceCache
+
+__authors__ = ["Ajay Gandecha", "Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+user_course_sites_cache: ServiceCache[tuple[int, bool], list[TermOverview]] = (
+    ServiceCache(ttl=timedelta(minutes=5))
+)
+"""Course sites of a user grouped by term, keyed by user ID and whether only current
+terms are included. Cleared whenever section memberships or course sites change."""
+
+
+@dataclass(frozen=True)
+class CourseSiteMembership:
+    """A user's membership in one section, along with the section's course site."""
+
+    id: int
+    section_id: int
+    course_site_id: int | None
+    member_role: RosterRole
+
+
+class CourseMembershipResolver:
+    """
+    Loads each user's section memberships, and each course site's sections, at most
+    once and answers permission checks from memory.
+
+    FastAPI caches dependencies for the duration of a request, so every service that
+    depends on this resolver while handling a request shares one instance.
+    """
+
+    def __init__(self, session: Session = Depends(db_session)):
+        """
+        Initializes the database session.
+        """
+        self._session = session
+        self._memberships: dict[int, list[CourseSiteMembership]] = {}
+        self._site_sections: dict[int, list[int] | None] = {}
+
+    def memberships(self, user: User) -> list[CourseSiteMembership]:
+        """
+        Gets every section membership of a user.
+
+        Returns:
+            list[CourseSiteMembership]
+        """
+        if user.id not in self._memberships:
+            membership_query = (
+                select(
+                    SectionMemberEntity.id,
+                    SectionMemberEntity.section_id,
+                    SectionEntity.course_site_id,
+                    SectionMemberEntity.member_role,
+                )
+                .join(SectionEntity)
+                .where(SectionMemberEntity.user_id == user.id)
+                .order_by(SectionMemberEntity.id)
+            )
+            self._memberships[user.id] = [
+                CourseSiteMembership(*row)
+                for row in self._session.execute(membership_query)
+            ]
+        return self._memberships[user.id]
+
+    def site_memberships(self, user: User, site_id: int) -> list[CourseSiteMembership]:
+        """
+        Gets a user's memberships in the sections of a course site.
+
+        Returns:
+            list[CourseSiteMembership]
+        """
+        return [
+            membership
+            for membership in self.memberships(user)
+            if membership.course_site_id == site_id
+        ]
+
+    def site_section_ids(self, site_id: int) -> list[int] | None:
+        """
+        Gets the IDs of the sections of a course site.
+
+        Returns:
+            list[int] | None: The section IDs, or None if the course site does not exist.
+        """
+        if site_id not in self._site_sections:
+            section_query = (
+                select(CourseSiteEntity.id, SectionEntity.id)
+                .outerjoin(
+                    SectionEntity, SectionEntity.course_site_id == CourseSiteEntity.id
+                )
+                .where(CourseSiteEntity.id == site_id)
+            )
+            rows = self._session.execute(section_query).all()
+            self._site_sections[site_id] = (
+                [section_id for _, section_id in rows if section_id is not None]
+                if len(rows) > 0
+                else None
+            )
+        return self._site_sections[site_id]
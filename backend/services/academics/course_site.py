@@ -2,11 +2,13 @@
 APIs for working with course sites.
 """
 
-from datetime import datetime
-from itertools import groupby
+import heapq
+from datetime import date, datetime
+from itertools import groupby, islice
+from typing import Iterator, Sequence
 from fastapi import Depends
 from sqlalchemy import select, or_, func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from ...database import db_session
 from ...models.user import User
 from ...models.pagination import PaginationParams, Paginated
@@ -28,10 +30,26 @@ from ...models.office_hours.course_site import (
 from ...models.office_hours.course_site_details import CourseSiteDetails
 from ...models.academics.section_member import SectionMemberDraft
 from ...entities.academics.section_entity import SectionEntity
+from ...entities.academics.term_entity import TermEntity
+from ...models.office_hours.office_hours import Weekday
 from ...entities.office_hours import OfficeHoursEntity, CourseSiteEntity
+from ...entities.office_hours.office_hours_recurrence_pattern_entity import (
+    OfficeHoursRecurrencePatternEntity,
+)
 from ...entities.user_entity import UserEntity
 from ...entities.academics.section_member_entity import SectionMemberEntity
 from ..exceptions import CoursePermissionException, ResourceNotFoundException
+from .course_membership import CourseMembershipResolver, user_course_sites_cache
+from .section_labels import term_section_labels_cache
+from .hiring_rollup import hiring_rollup_cache
+from ..application_review import insert_missing_reviews
+from ..office_hours.occurrences import (
+    count_occurrence_dates,
+    get_exception_dates,
+    iter_occurrence_dates,
+    recurring_weekdays,
+    virtual_template_criteria,
+)
 
 __authors__ = ["Ajay Gandecha", "Kris Jordan"]
 __copyright__ = "Copyright 2024"
@@ -43,23 +61,48 @@ class CourseSiteService:
     Service that performs all of the actions on the `Section` table
     """
 
-    def __init__(self, session: Session = Depends(db_session)):
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        memberships: CourseMembershipResolver = Depends(),
+    ):
         """
         Initializes the database session.
         """
         self._session = session
+        self._memberships = memberships
 
-    def get_user_course_sites(self, user: User) -> list[TermOverview]:
+    def get_user_course_sites(
+        self, user: User, current_only: bool = False
+    ) -> list[TermOverview]:
         """
         Get the course sites for the current user.
 
+        Overviews are cached per user until the user's memberships change.
+
+        Args:
+            user (User): The user whose course sites to get.
+            current_only (bool): Whether to restrict to terms that have not ended.
+
         Returns:
             list[TermOverview]
         """
+        return user_course_sites_cache.get_or_compute(
+            (user.id, current_only),
+            lambda: self._load_user_course_sites(user, current_only),
+        )
+
+    def _load_user_course_sites(
+        self, user: User, current_only: bool
+    ) -> list[TermOverview]:
+        """
+        Loads the course sites of a user from the database, grouped by term.
+        """
         query = (
             select(SectionMemberEntity)
             .where(SectionMemberEntity.user_id == user.id)
             .join(SectionEntity)
+            .join(TermEntity)
             .options(
                 joinedload(SectionMemberEntity.section).joinedload(
                     SectionEntity.course_site
@@ -69,22 +112,33 @@ class CourseSiteService:
                     SectionEntity.course
                 ),
             )
+            .order_by(
+                TermEntity.start,
+                SectionEntity.course_site_id,
+                SectionEntity.course_id,
+                SectionEntity.id,
+            )
         )
+        if current_only:
+            query = query.where(TermEntity.end >= datetime.now())
+
         section_member_entities = self._session.scalars(query).all()
         return self._group_by_term(section_member_entities)
 
-    def _group_by_term(self, entities: list[SectionMemberEntity]) -> list[TermOverview]:
+    def _group_by_term(
+        self, entities: Sequence[SectionMemberEntity]
+    ) -> list[TermOverview]:
         """
         Group a list of SectionMemberEntity by term.
 
         Args:
-            entities (list[SectionMemberEntity]): The SectionMemberEntity to group.
+            entities (Sequence[SectionMemberEntity]): The SectionMemberEntity to group,
+                ordered by term start, course site, and course.
 
         Returns:
             list[TermOverview]: The grouped SectionMemberEntity.
         """
         terms = []
-        entities.sort(key=lambda x: x.section.term.start)
         for term, term_memberships in groupby(entities, lambda x: x.section.term):
 
             # Since the output `term_memberships` is an iterator, we cannot iterate over the list
@@ -189,10 +243,8 @@ class CourseSiteService:
                 getattr(UserEntity, pagination_params.order_by)
             )
 
-        # Create query off of the member query for just the members matching
-        # with the current user (used to determine permissions)
-        user_member_query = member_query.where(SectionMemberEntity.user_id == user.id)
-        user_members = self._session.scalars(user_member_query).all()
+        # Find the memberships of the current user (used to determine permissions)
+        user_members = self._memberships.site_memberships(user, site_id)
 
         # If the user is not a member of the looked up course, throw an error
         if len(user_members) == 0:
@@ -275,9 +327,10 @@ class CourseSiteService:
         event_query = self._create_oh_event_query(user, site_id)
 
         # Only load current events
+        now = datetime.today()
         event_query = event_query.where(
-            OfficeHoursEntity.start_time < datetime.today(),
-            datetime.today() < OfficeHoursEntity.end_time,
+            OfficeHoursEntity.start_time < now,
+            now < OfficeHoursEntity.end_time,
         )
 
         # Load office hours data
@@ -285,7 +338,7 @@ class CourseSiteService:
 
         return [
             self._to_oh_event_overview(event) for event in office_hour_event_entities
-        ]
+        ] + self._get_current_virtual_occurrences(site_id, now)
 
     def get_future_office_hour_events(
         self,
@@ -304,7 +357,8 @@ class CourseSiteService:
         event_query = self._create_oh_event_query(user, site_id)
 
         # Only load future events
-        event_query = event_query.where(datetime.today() < OfficeHoursEntity.start_time)
+        now = datetime.today()
+        event_query = event_query.where(now < OfficeHoursEntity.start_time)
 
         # Count the number of rows before applying pagination and filter
         count_query = select(func.count()).select_from(
@@ -315,24 +369,64 @@ class CourseSiteService:
         # Calculate offset and limit for pagination
         offset = pagination_params.page * pagination_params.page_size
         limit = pagination_params.page_size
-        event_query = (
-            event_query.offset(offset)
-            .limit(limit)
-            .order_by(OfficeHoursEntity.start_time)
-        )
 
-        # Load office hours data
-        office_hour_event_entities = self._session.scalars(event_query).unique().all()
-
-        # Create paginated representation of data and return
-        return Paginated(
-            items=[
+        # Occurrences of virtual recurrence patterns are not stored, so they are
+        # expanded and merged with the stored events, only as far as the page requested
+        templates = self._get_virtual_templates(site_id, now.date())
+        if len(templates) == 0:
+            event_query = (
+                event_query.offset(offset)
+                .limit(limit)
+                .order_by(OfficeHoursEntity.start_time)
+            )
+            office_hour_event_entities = (
+                self._session.scalars(event_query).unique().all()
+            )
+            items = [
                 self._to_oh_event_overview(event)
                 for event in office_hour_event_entities
-            ],
-            length=length,
-            params=pagination_params,
-        )
+            ]
+        else:
+            stored_dates = self._get_stored_occurrence_dates(templates, now.date())
+            length += sum(
+                self._count_future_virtual_occurrences(template, stored_dates, now)
+                for template in templates
+            )
+            event_query = event_query.limit(offset + limit).order_by(
+                OfficeHoursEntity.start_time
+            )
+            stored_events = (
+                self._to_oh_event_overview(event)
+                for event in self._session.scalars(event_query).unique()
+            )
+            # Each template's occurrences are in order, but templates are interleaved
+            virtual_events = heapq.merge(
+                *(
+                    (
+                        self._to_virtual_oh_event_overview(template, start_time)
+                        for start_time in self._iter_virtual_occurrences(
+                            template, stored_dates, now.date()
+                        )
+                        if now < start_time
+                    )
+                    for template in templates
+                ),
+                key=lambda event: event.start_time,
+            )
+            items = list(
+                islice(
+                    heapq.merge(
+                        stored_events,
+                        virtual_events,
+                        key=lambda event: event.start_time,
+                    ),
+                    offset,
+                    offset + limit,
+                )
+            )
+
+        # Create paginated representation of data and return
+        return Paginated(items=items, length=length, params=pagination_params)
 
     def get_past_office_hour_events(
         self,
@@ -444,6 +538,158 @@ class CourseSiteService:
             recurrence_pattern_id=oh_event.recurrence_pattern_id,
         )
 
+    def _to_virtual_oh_event_overview(
+        self, template: OfficeHoursEntity, start_time: datetime
+    ) -> OfficeHoursOverview:
+        """Converts an unstored occurrence of a virtual recurrence pattern to an overview.
+
+        The occurrence has no ID of its own. It is identified by its recurrence pattern
+        and date, which are used to store it before it is edited or receives tickets."""
+        overview = self._to_oh_event_overview(template)
+        return overview.model_copy(
+            update={
+                "id": None,
+                "occurrence_date": start_time.date(),
+                "start_time": start_time,
+                "end_time": start_time + (template.end_time - template.start_time),
+                "queued": 0,
+                "total_tickets": 0,
+                "virtual": True,
+            }
+        )
+
+    def _get_virtual_templates(
+        self, site_id: int, since: date | None = None
+    ) -> list[OfficeHoursEntity]:
+        """
+        Gets the first stored occurrence of each virtual recurrence pattern of a course
+        site, which later occurrences are expanded from.
+
+        Args:
+            site_id: The ID of the course site.
+            since: If given, only patterns that recur on or after this date are included.
+        """
+        template_query = (
+            select(OfficeHoursEntity)
+            .join(OfficeHoursEntity.recurrence_pattern)
+            .where(OfficeHoursEntity.course_site_id == site_id)
+            .where(OfficeHoursRecurrencePatternEntity.virtual)
+            .where(virtual_template_criteria())
+            .distinct(OfficeHoursEntity.recurrence_pattern_id)
+            .order_by(
+                OfficeHoursEntity.recurrence_pattern_id, OfficeHoursEntity.start_time
+            )
+            .options(
+                contains_eager(OfficeHoursEntity.recurrence_pattern),
+                joinedload(OfficeHoursEntity.room),
+            )
+        )
+        if since is not None:
+            template_query = template_query.where(
+                OfficeHoursRecurrencePatternEntity.end_date >= since
+            )
+        return list(self._session.scalars(template_query).unique().all())
+
+    def _get_stored_occurrence_dates(
+        self, templates: list[OfficeHoursEntity], since: date
+    ) -> set[tuple[int, date]]:
+        """
+        Gets the dates on or after `since` on which the templates' recurrence patterns
+        are not expanded, as `(recurrence_pattern_id, date)` pairs: the templates' own
+        dates, and those of occurrences that were stored or cancelled.
+        """
+        stored_dates = get_exception_dates(
+            self._session,
+            [template.recurrence_pattern_id for template in templates],
+            since,
+        )
+        stored_dates.update(
+            (template.recurrence_pattern_id, template.start_time.date())
+            for template in templates
+            if template.start_time.date() >= since
+        )
+        return stored_dates
+
+    def _iter_virtual_occurrences(
+        self,
+        template: OfficeHoursEntity,
+        stored_dates: set[tuple[int, date]],
+        since: date,
+        until: date | None = None,
+    ) -> Iterator[datetime]:
+        """
+        Lazily yields the start times of the unstored occurrences of a template's
+        recurrence pattern from `since` through `until` (or the pattern's end), in order.
+        """
+        pattern = template.recurrence_pattern
+        end = pattern.end_date if until is None else min(pattern.end_date, until)
+        for day in iter_occurrence_dates(
+            max(pattern.start_date, since), end, recurring_weekdays(pattern)
+        ):
+            if (pattern.id, day) not in stored_dates:
+                yield datetime.combine(day, template.start_time.time())
+
+    def _count_future_virtual_occurrences(
+        self,
+        template: OfficeHoursEntity,
+        stored_dates: set[tuple[int, date]],
+        now: datetime,
+    ) -> int:
+        """
+        Counts the unstored occurrences of a template's recurrence pattern that start
+        after `now` without expanding them.
+        """
+        pattern = template.recurrence_pattern
+        weekdays = recurring_weekdays(pattern)
+        first = max(pattern.start_date, now.date())
+        occurrence_count = count_occurrence_dates(first, pattern.end_date, weekdays)
+
+        # Exclude stored occurrences and a first occurrence that has already started
+        excluded = {
+            day
+            for pattern_id, day in stored_dates
+            if pattern_id == pattern.id
+            and first <= day <= pattern.end_date
+            and Weekday(day.weekday()) in weekdays
+        }
+        if (
+            first <= pattern.end_date
+            and Weekday(first.weekday()) in weekdays
+            and datetime.combine(first, template.start_time.time()) <= now
+        ):
+            excluded.add(first)
+        return occurrence_count - len(excluded)
+
+    def _get_current_virtual_occurrences(
+        self, site_id: int, now: datetime
+    ) -> list[OfficeHoursOverview]:
+        """
+        Gets the unstored occurrences of a course site's virtual recurrence patterns that
+        are in progress, without storing them.
+        """
+        templates = self._get_virtual_templates(site_id)
+        if len(templates) == 0:
+            return []
+
+        durations = {
+            template.id: template.end_time - template.start_time
+            for template in templates
+        }
+        stored_dates = self._get_stored_occurrence_dates(
+            templates, (now - max(durations.values())).date()
+        )
+        return [
+            self._to_virtual_oh_event_overview(template, start_time)
+            for template in templates
+            for start_time in self._iter_virtual_occurrences(
+                template,
+                stored_dates,
+                (now - durations[template.id]).date(),
+                now.date(),
+            )
+            if start_time < now < start_time + durations[template.id]
+        ]
+
     def create(self, user: User, new_site: NewCourseSite) -> CourseSite:
         """
         Creates a course site for an instructor with sections.
@@ -491,9 +737,16 @@ class CourseSiteService:
         # Update the sections to add to the course site.
         for section_entity in section_entities:
             section_entity.course_site_id = course_site_entity.id
+        self._session.flush()
+
+        # Put existing applications to the sections on the site's hiring board
+        insert_missing_reviews(self._session, course_site_entity.term_id)
 
         # Save changes
         self._session.commit()
+        user_course_sites_cache.clear()
+        term_section_labels_cache.invalidate(course_site_entity.term_id)
+        hiring_rollup_cache.invalidate(course_site_entity.term_id)
 
         # Return the model
         return course_site_entity.to_model()
@@ -657,8 +910,15 @@ class CourseSiteService:
                     if existing_entity.member_role != RosterRole.INSTRUCTOR:
                         existing_entity.member_role == RosterRole.UTA
 
+        # Put existing applications to newly added sections on the site's hiring board
+        self._session.flush()
+        insert_missing_reviews(self._session, course_site_entity.term_id)
+
         # Save all changes in one commit
         self._session.commit()
+        user_course_sites_cache.clear()
+        term_section_labels_cache.invalidate(course_site_entity.term_id)
+        hiring_rollup_cache.invalidate(course_site_entity.term_id)
 
         # Return updated site
         return course_site_entity.to_model()
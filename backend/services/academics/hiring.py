@@ -4,9 +4,28 @@ Service for hiring.
 
 from itertools import groupby
 from operator import attrgetter
+from typing import Iterator, Sequence
 from fastapi import Depends
-from sqlalchemy import String, func, or_, select, update
-from sqlalchemy.orm import Session, joinedload, with_polymorphic, selectinload
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    cast,
+    column,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.orm import (
+    Session,
+    contains_eager,
+    joinedload,
+    with_polymorphic,
+    selectinload,
+)
 
 from backend.models.pagination import Paginated, PaginationParams
 from ...database import db_session
@@ -15,8 +34,15 @@ from ...models.user import User
 from ...models.academics.section_member import RosterRole
 from ...entities import UserEntity
 from ...models.application import ApplicationUnderReview, ApplicationOverview
-from ...models.academics.hiring.conflict_check import ApplicationPriority, ConflictCheck
-from ...entities.academics import SectionEntity, TermEntity
+from ...models.academics.hiring.conflict_check import (
+    ApplicationPriority,
+    ConflictCheck,
+    ConflictCheckAssignment,
+    ConflictCheckCell,
+    ConflictCheckCourseSite,
+    ConflictCheckMatrix,
+)
+from ...entities.academics import CourseEntity, SectionEntity, TermEntity
 from ...entities.office_hours import CourseSiteEntity
 from ...entities.academics.section_member_entity import SectionMemberEntity
 from ...entities.application_entity import ApplicationEntity
@@ -27,7 +53,25 @@ from ...entities.section_application_table import section_application_table
 from ...entities.academics.hiring.hiring_level_entity import HiringLevelEntity
 from ...entities.academics.hiring.hiring_assignment_entity import HiringAssignmentEntity
 
-from ..exceptions import CoursePermissionException, ResourceNotFoundException
+from ..exceptions import (
+    CoursePermissionException,
+    ResourceNotFoundException,
+    StaleResourceException,
+)
+from ..export import stream_scalars, to_csv_chunks
+from .hiring_matching import HiringMatchingProblem, solve_hiring_matching
+from .section_labels import (
+    TermSectionLabels,
+    get_term_section_labels,
+    term_section_labels_cache,
+)
+from .hiring_rollup import (
+    apply_assignment_changes,
+    hiring_rollup_cache,
+    level_coverage,
+)
+from .course_membership import user_course_sites_cache
+from ..application_review import insert_missing_reviews
 from ...services import PermissionService
 from ...models.academics.hiring.application_review import (
     HiringStatus,
@@ -35,7 +79,9 @@ from ...models.academics.hiring.application_review import (
     ApplicationReviewOverview,
     ApplicationReviewStatus,
     ApplicationReviewCsvRow,
+    ApplicationReviewChange,
 )
+from ...models.academics.hiring.hiring_rollup import HiringLevelRollup, HiringRollup
 from ...models.academics.hiring.phd_application import PhDApplicationReview
 from ...models.academics.hiring.hiring_assignment import *
 from ...models.academics.hiring.hiring_level import *
@@ -66,6 +112,9 @@ class HiringService:
         Loads the applications and the current state of hiring for a course site,
         separated into columns.
 
+        Only applications with a review are included. Reviews are created when an
+        application is submitted or updated and when course sites are created.
+
         Returns:
             HiringStatus
         """
@@ -78,15 +127,12 @@ class HiringService:
                 subject, "hiring.get_status", f"course_site/{course_site_id}"
             )
 
-        # Step 2: Ensure all applications have an application_review entity.
-        self._create_missing_reviews(site_entity)
-
-        # Step 3: Load all reviews for the course site.
+        # Step 2: Load all reviews for the course site.
         review_models: list[ApplicationReviewOverview] = self._to_review_models(
             site_entity
         )
 
-        # Step 4: Return the hiring status model
+        # Step 3: Return the hiring status model
         return self._hiring_status_model(review_models)
 
     def update_status(
@@ -135,6 +181,7 @@ class HiringService:
                         "status": request.status,
                         "preference": request.preference,
                         "notes": request.notes,
+                        "version": persisted.version + 1,
                     }
                 )
 
@@ -146,9 +193,132 @@ class HiringService:
         # Reload the data and return the hiring status.
         return self.get_status(subject, course_site_id)
 
+    def update_status_changes(
+        self,
+        subject: User,
+        course_site_id: int,
+        changes: list[ApplicationReviewChange],
+    ) -> list[ApplicationReviewChange]:
+        """
+        Saves only the reviews that were moved or edited on a course site's hiring board.
+
+        Every change carries the version of the review it was made from. The changes are
+        saved with a single UPDATE and only if none of the reviews changed since, so that
+        co-instructors working on the same board do not overwrite each other.
+
+        Args:
+            subject: The user performing the action.
+            course_site_id: The course site the reviews belong to.
+            changes: The moved or edited reviews.
+
+        Returns:
+            list[ApplicationReviewChange]: The saved reviews, with their new versions.
+
+        Raises:
+            ResourceNotFoundException: If the course site does not exist.
+            PermissionException: If the subject does not have the required permission.
+            StaleResourceException: If any of the reviews changed since it was loaded,
+                or is not part of the course site. No changes are saved.
+        """
+        # Step 0: Load a Course Site
+        site_entity = self._load_course_site(course_site_id)
+
+        # Step 1: Ensure that a user can access a course site's hiring.
+        if not self._is_instructor(subject, site_entity):
+            self._permission.enforce(
+                subject, "hiring.get_status", f"course_site/{course_site_id}"
+            )
+
+        if len(changes) == 0:
+            return []
+
+        # Step 2: Update every review that is still at the version it was changed from.
+        review_table = ApplicationReviewEntity.__table__
+        change_values = values(
+            column("id", Integer),
+            column("status", review_table.c.status.type),
+            column("preference", Integer),
+            column("notes", String),
+            column("version", Integer),
+            name="changes",
+        ).data(
+            [
+                (
+                    change.id,
+                    change.status,
+                    change.preference,
+                    change.notes,
+                    change.version,
+                )
+                for change in changes
+            ]
+        )
+        update_statement = (
+            update(ApplicationReviewEntity)
+            .where(
+                ApplicationReviewEntity.id == change_values.c.id,
+                ApplicationReviewEntity.version == change_values.c.version,
+                ApplicationReviewEntity.course_site_id == course_site_id,
+            )
+            .values(
+                # Values rows are untyped, so the enum has to be cast explicitly
+                status=cast(change_values.c.status, review_table.c.status.type),
+                preference=change_values.c.preference,
+                notes=change_values.c.notes,
+                version=ApplicationReviewEntity.version + 1,
+            )
+            .returning(
+                ApplicationReviewEntity.id,
+                ApplicationReviewEntity.status,
+                ApplicationReviewEntity.preference,
+                ApplicationReviewEntity.notes,
+                ApplicationReviewEntity.version,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        saved = [
+            ApplicationReviewChange(
+                id=id,
+                status=status,
+                preference=preference,
+                notes=notes,
+                version=version,
+            )
+            for id, status, preference, notes, version in self._session.execute(
+                update_statement
+            )
+        ]
+
+        # Step 3: Save nothing unless every change applied.
+        if len(saved) != len({change.id for change in changes}):
+            self._session.rollback()
+            saved_ids = {review.id for review in saved}
+            stale_ids = sorted({change.id for change in changes} - saved_ids)
+            raise StaleResourceException(
+                f"Application reviews {stale_ids} changed since they were loaded."
+            )
+        self._session.commit()
+        return saved
+
     def create_missing_course_sites_for_term(self, subject: User, term_id: str) -> bool:
         """
-        Creates missing course sites for a given term.
+        Creates course sites for the sections of a term that do not have one yet.
+
+        Sections of the same course taught by the same instructors share a course site.
+        The sections are loaded with one query, all course sites are created with one
+        multi-row insert, and the sections are linked to them with one update, so the
+        whole term is set up in a few round trips. Running this again for a term whose
+        sections all have course sites makes no changes.
+
+        Args:
+            subject: The user performing the action.
+            term_id: The term to create course sites for.
+
+        Returns:
+            bool: True once every section of the term has a course site.
+
+        Raises:
+            PermissionException: If the subject does not have the required permission.
         """
         self._permission.enforce(
             subject,
@@ -156,46 +326,133 @@ class HiringService:
             f"course_sites/term:{term_id}",
         )
 
-        # Get a list of all sections that are not associated with course sites
-        section_query = select(SectionEntity).where(
-            SectionEntity.term_id == term_id, SectionEntity.course_site_id.is_(None)
+        # Get a list of all sections that are not associated with course sites, along
+        # with their instructors. The sections are locked so that concurrent runs do
+        # not create two course sites for the same section.
+        instructors = (
+            select(
+                SectionMemberEntity.section_id,
+                func.array_agg(SectionMemberEntity.user_id).label("user_ids"),
+            )
+            .where(SectionMemberEntity.member_role == RosterRole.INSTRUCTOR)
+            .group_by(SectionMemberEntity.section_id)
+            .subquery()
         )
-        joint: dict[tuple[str, str], list[SectionEntity]] = {}
-        for section in self._session.scalars(section_query).all():
-            instructors = [
-                section_member.user.full_name()
-                for section_member in section.members
-                if section_member.member_role == RosterRole.INSTRUCTOR
-            ]
-            key = (f"{section.course_id}", str(instructors))
-            if key not in joint:
-                joint[key] = []
-            joint[key].append(section)
+        section_query = (
+            select(
+                SectionEntity.id,
+                SectionEntity.course_id,
+                func.coalesce(
+                    func.nullif(SectionEntity.override_title, ""), CourseEntity.title
+                ),
+                instructors.c.user_ids,
+            )
+            .join(CourseEntity, SectionEntity.course_id == CourseEntity.id)
+            .outerjoin(instructors, instructors.c.section_id == SectionEntity.id)
+            .where(
+                SectionEntity.term_id == term_id, SectionEntity.course_site_id.is_(None)
+            )
+            .order_by(SectionEntity.id)
+            .with_for_update(of=SectionEntity)
+        )
+        titles: dict[tuple[str, tuple[int, ...]], str] = {}
+        joint: dict[tuple[str, tuple[int, ...]], list[int]] = {}
+        for section_id, course_id, title, user_ids in self._session.execute(
+            section_query
+        ):
+            key = (course_id, tuple(sorted(user_ids or [])))
+            titles.setdefault(key, title)
+            joint.setdefault(key, []).append(section_id)
+
+        if len(joint) == 0:
+            self._session.commit()
+            return True
 
         # Create a course site for each group of sections
-        for key, sections in joint.items():
-            course_site = CourseSiteEntity(
-                term_id=term_id,
-                title=sections[0].get_title(),
-            )
-            for section in sections:
-                section.course_site = course_site
-            self._session.add(course_site)
+        keys = list(joint.keys())
+        site_ids = self._session.scalars(
+            insert(CourseSiteEntity).returning(
+                CourseSiteEntity.id, sort_by_parameter_order=True
+            ),
+            [{"term_id": term_id, "title": titles[key]} for key in keys],
+        ).all()
+
+        # Link every section to its group's course site
+        section_sites = values(
+            column("section_id", Integer),
+            column("course_site_id", Integer),
+            name="section_sites",
+        ).data(
+            [
+                (section_id, site_id)
+                for key, site_id in zip(keys, site_ids)
+                for section_id in joint[key]
+            ]
+        )
+        self._session.execute(
+            update(SectionEntity)
+            .where(SectionEntity.id == section_sites.c.section_id)
+            .values(course_site_id=section_sites.c.course_site_id)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Put existing applications to the new course sites on their hiring boards
+        insert_missing_reviews(self._session, term_id)
 
         self._session.commit()
+        term_section_labels_cache.invalidate(term_id)
+        hiring_rollup_cache.invalidate(term_id)
+        user_course_sites_cache.clear()
         return True
 
+    def create_missing_reviews_for_term(self, subject: User, term_id: str) -> int:
+        """
+        Creates a not processed review for every application to a course site in a term
+        that does not have one yet.
+
+        Returns:
+            int: The number of reviews created.
+        """
+        self._permission.enforce(
+            subject,
+            "hiring.create_missing_reviews_for_term",
+            f"course_sites/term:{term_id}",
+        )
+        created = insert_missing_reviews(self._session, term_id)
+        self._session.commit()
+        return created
+
     def get_phd_applicants(
         self, subject: User, term_id: str
     ) -> list[PhDApplicationReview]:
+        """
+        Gets the graduate applicants of a term with their student and instructor
+        preferences, using a fixed number of queries regardless of the term's size.
+
+        Args:
+            subject: The user performing the action.
+            term_id: The term to get the applicants of.
+
+        Returns:
+            list[PhDApplicationReview]
+
+        Raises:
+            PermissionException: If the subject does not have the required permission.
+        """
         self._permission.enforce(
             subject, "hiring.get_phd_applicants", f"course_sites/term:{term_id}"
         )
 
-        query = select(ApplicationEntity).where(
-            ApplicationEntity.term_id == term_id,
-            ApplicationEntity.type == "gta",
-            ApplicationEntity.program_pursued.in_({"PhD", "PhD (ABD)", "MS", "BS/MS"}),
+        query = (
+            select(ApplicationEntity)
+            .where(
+                ApplicationEntity.term_id == term_id,
+                ApplicationEntity.type == "gta",
+                ApplicationEntity.program_pursued.in_(
+                    {"PhD", "PhD (ABD)", "MS", "BS/MS"}
+                ),
+            )
+            .options(joinedload(ApplicationEntity.user))
         )
         all = self._session.scalars(query).all()
 
@@ -214,37 +471,41 @@ class HiringService:
             )
             phd_applications[application.id] = phd_application
 
-        sections_query = select(SectionEntity).where(SectionEntity.term_id == term_id)
-        sections = {
-            section.id: section
-            for section in self._session.scalars(sections_query).all()
-        }
+        labels = get_term_section_labels(self._session, term_id)
 
         # Grab student preferences of sections
         application_ids = list(phd_applications.keys())
         section_application_query = (
-            select(section_application_table)
+            select(
+                section_application_table.c.application_id,
+                section_application_table.c.section_id,
+            )
             .where(section_application_table.c.application_id.in_(application_ids))
             .order_by(section_application_table.c.preference)
         )
-        for section_application in self._session.execute(section_application_query):
-            _, section_id, application_id = section_application
+        for application_id, section_id in self._session.execute(
+            section_application_query
+        ):
             phd_applications[application_id].student_preferences.append(
-                f"{sections[section_id].course_id}.{sections[section_id].number}"
+                labels.sections[section_id]
             )
 
         # Grab instructor preferences of applications
         instructor_review_query = (
-            select(ApplicationReviewEntity)
+            select(
+                ApplicationReviewEntity.application_id,
+                ApplicationReviewEntity.course_site_id,
+                ApplicationReviewEntity.preference,
+            )
             .where(ApplicationReviewEntity.application_id.in_(application_ids))
             .where(ApplicationReviewEntity.status == ApplicationReviewStatus.PREFERRED)
             .order_by(ApplicationReviewEntity.preference)
-            .options(joinedload(ApplicationReviewEntity.course_site))
         )
-        instructor_preferences = self._session.scalars(instructor_review_query).all()
-        for review in instructor_preferences:
-            phd_applications[review.application_id].instructor_preferences.append(
-                f"({review.preference}) {review.course_site.sections[0].course_id}.{review.course_site.sections[0].number}"
+        for application_id, course_site_id, preference in self._session.execute(
+            instructor_review_query
+        ):
+            phd_applications[application_id].instructor_preferences.append(
+                f"({preference}) {labels.course_sites[course_site_id]}"
             )
 
         return list(phd_applications.values())
@@ -298,73 +559,6 @@ class HiringService:
         )
         return self._session.scalars(membership_query).first() is not None
 
-    def _create_missing_reviews(self, site: CourseSiteEntity) -> None:
-        need_review: list[int] = self._select_application_ids_without_reviews(site)
-
-        preference: int = self._count_unprocessed(site)
-        if len(need_review) > 0:
-            for application_id in need_review:
-                review = ApplicationReviewEntity(
-                    application_id=application_id,
-                    course_site_id=site.id,
-                    status=ApplicationReviewStatus.NOT_PROCESSED,
-                    preference=preference,
-                    notes="",
-                )
-                preference += 1
-                self._session.add(review)
-            self._session.commit()
-
-    def _count_unprocessed(self, course_site: CourseSiteEntity) -> int:
-        """
-        Returns the maximum preference value for unprocessed applications.
-
-        Args:
-            course_site (CourseSiteEntity): The course site to check against.
-
-        Returns:
-            int: The maximum preference value for unprocessed applications.
-        """
-        count_unprocessed = (
-            select(func.count(ApplicationReviewEntity.preference))
-            .where(ApplicationReviewEntity.course_site_id == course_site.id)
-            .where(
-                ApplicationReviewEntity.status == ApplicationReviewStatus.NOT_PROCESSED
-            )
-        )
-        return self._session.scalar(count_unprocessed) or 1
-
-    def _select_application_ids_without_reviews(
-        self, course_site: CourseSiteEntity
-    ) -> list[int]:
-        """
-        Returns a list of application IDs that do not have a review for a given course site.
-
-        Args:
-            course_site (CourseSiteEntity): The course site to check against.
-
-        Returns:
-            list[int]: A list of application IDs that do not have a review for the course site.
-        """
-        application_ids = (
-            select(section_application_table.c.application_id)
-            .where(
-                section_application_table.c.section_id.in_(
-                    select(SectionEntity.id).where(
-                        SectionEntity.course_site_id == course_site.id
-                    )
-                )
-            )
-            .where(
-                section_application_table.c.application_id.notin_(
-                    select(ApplicationReviewEntity.application_id).where(
-                        ApplicationReviewEntity.course_site_id == course_site.id
-                    )
-                )
-            )
-        )
-        return list(self._session.scalars(application_ids).unique().all())
-
     def _load_application_reviews(
         self, course_site: CourseSiteEntity
     ) -> list[ApplicationReviewEntity]:
@@ -483,6 +677,7 @@ class HiringService:
                 status=review.status,
                 preference=review.preference,
                 notes=review.notes,
+                version=review.version,
                 applicant_course_ranking=applicant_preferences.get(
                     review.application_id, 999
                 ),
@@ -568,16 +763,9 @@ class HiringService:
     ) -> float:
         coverage: float = 0.0
         for assignment in assignments:
-            if assignment.hiring_level.classification in {
-                HiringLevelClassification.MS,
-                HiringLevelClassification.PHD,
-            }:
-                coverage += assignment.hiring_level.load
-            elif assignment.hiring_level.classification == HiringLevelClassification.UG:
-                coverage += assignment.hiring_level.load * 0.25
-            else:
-                # IOR
-                coverage += 0
+            coverage += level_coverage(
+                assignment.hiring_level.classification, assignment.hiring_level.load
+            )
 
         return (float(enrollment) / 60.0) - coverage
 
@@ -587,64 +775,185 @@ class HiringService:
         """Get the overview for hiring during a given term for the site admin."""
         # 1. Check for hiring permissions.
         self._permission.enforce(subject, "hiring.admin", "*")
-        # 2. Find the hiring information based on course sites for a given term
-        course_site_query = (
-            select(CourseSiteEntity)
-            .join(CourseSiteEntity.term)
-            .where(TermEntity.id == term_id)
+
+        # 2. Find the course sites for the given term
+        term_site_ids = select(CourseSiteEntity.id).where(
+            CourseSiteEntity.term_id == term_id
+        )
+        site_ids = self._session.scalars(
+            term_site_ids.order_by(CourseSiteEntity.id)
+        ).all()
+
+        # 3. Aggregate enrollment, cost, and coverage inputs per course site
+        enrollment_query = (
+            select(SectionEntity.course_site_id, func.sum(SectionEntity.enrolled))
+            .where(SectionEntity.course_site_id.in_(term_site_ids))
+            .group_by(SectionEntity.course_site_id)
+        )
+        total_enrollments: dict[int, int] = dict(
+            self._session.execute(enrollment_query).all()
+        )
+
+        assignment_totals_query = (
+            select(
+                HiringAssignmentEntity.course_site_id,
+                HiringLevelEntity.classification,
+                func.sum(HiringLevelEntity.load),
+                func.sum(HiringLevelEntity.salary),
+            )
+            .join(HiringAssignmentEntity.hiring_level)
+            .where(HiringAssignmentEntity.course_site_id.in_(term_site_ids))
+            .group_by(
+                HiringAssignmentEntity.course_site_id, HiringLevelEntity.classification
+            )
+        )
+        total_costs: dict[int, float] = {}
+        total_coverage: dict[int, float] = {}
+        for site_id, classification, load, salary in self._session.execute(
+            assignment_totals_query
+        ):
+            total_costs[site_id] = total_costs.get(site_id, 0.0) + salary
+            total_coverage[site_id] = total_coverage.get(site_id, 0.0) + level_coverage(
+                classification, load
+            )
+
+        # 4. Load sections from the term's shared labels, and instructors and
+        # assignments for all course sites in bulk
+        labels = get_term_section_labels(self._session, term_id)
+
+        instructor_query = (
+            select(SectionEntity.course_site_id, UserEntity)
+            .join(
+                SectionMemberEntity, SectionMemberEntity.section_id == SectionEntity.id
+            )
+            .join(SectionMemberEntity.user)
+            .where(
+                SectionEntity.course_site_id.in_(term_site_ids),
+                SectionMemberEntity.member_role == RosterRole.INSTRUCTOR,
+            )
+            .distinct()
+            .order_by(SectionEntity.course_site_id, UserEntity.id)
+        )
+        instructors: dict[int, list[PublicUser]] = {}
+        for site_id, user_entity in self._session.execute(instructor_query):
+            instructors.setdefault(site_id, []).append(user_entity.to_public_model())
+
+        assignment_query = (
+            select(HiringAssignmentEntity)
+            .where(HiringAssignmentEntity.course_site_id.in_(term_site_ids))
             .options(
-                joinedload(CourseSiteEntity.sections),
+                selectinload(HiringAssignmentEntity.user),
+                selectinload(HiringAssignmentEntity.hiring_level),
             )
         )
-        course_site_entities = self._session.scalars(course_site_query).unique().all()
+        assignments: dict[int, list[HiringAssignmentOverview]] = {}
+        for assignment_entity in self._session.scalars(assignment_query):
+            assignments.setdefault(assignment_entity.course_site_id, []).append(
+                assignment_entity.to_overview_model()
+            )
 
-        # 3. Assemble the overview models
+        # 5. Assemble the overview models
         hiring_course_site_overviews: list[HiringCourseSiteOverview] = []
-        for course_site_entity in course_site_entities:
-            # Find all of the data for a course site overview
-            section_entites = course_site_entity.sections
-            sections = [
-                section.to_catalog_identity_model() for section in section_entites
-            ]
-            instructors: list[PublicUser] = []
-            total_enrollment = 0
-            for section_entity in section_entites:
-                instructors += [
-                    staff.user.to_public_model()
-                    for staff in section_entity.staff
-                    if staff.member_role == RosterRole.INSTRUCTOR
-                ]
-                total_enrollment += section_entity.enrolled
-
-            assignments = sorted(
-                [
-                    assignment.to_overview_model()
-                    for assignment in course_site_entity.hiring_assignments
-                ],
-                key=lambda x: x.user.last_name,
-            )
-            total_cost = sum([assignment.level.salary for assignment in assignments])
-            coverage = self._calculate_coverage(
-                total_enrollment, course_site_entity.hiring_assignments
-            )
-
-            # Create overview with found data
-            course_site_overview = HiringCourseSiteOverview(
-                course_site_id=course_site_entity.id,
-                sections=sections,
-                instructors=list(set(instructors)),
-                total_enrollment=total_enrollment,
-                total_cost=total_cost,
-                coverage=coverage,
-                assignments=assignments,
+        for site_id in site_ids:
+            total_enrollment = total_enrollments.get(site_id) or 0
+            hiring_course_site_overviews.append(
+                HiringCourseSiteOverview(
+                    course_site_id=site_id,
+                    sections=labels.course_site_catalog_sections(site_id),
+                    instructors=instructors.get(site_id, []),
+                    total_enrollment=total_enrollment,
+                    total_cost=total_costs.get(site_id, 0.0),
+                    coverage=(float(total_enrollment) / 60.0)
+                    - total_coverage.get(site_id, 0.0),
+                    assignments=sorted(
+                        assignments.get(site_id, []),
+                        key=lambda assignment: assignment.user.last_name,
+                    ),
+                )
             )
 
-            # Add overview to the list
-            hiring_course_site_overviews.append(course_site_overview)
-
-        # 4. Return hiring adming overview object
+        # 6. Return hiring adming overview object
         return HiringAdminOverview(sites=hiring_course_site_overviews)
 
+    def get_hiring_rollup(self, subject: User, term_id: str) -> HiringRollup:
+        """
+        Gets the term-wide coverage, cost per hiring level, and number of assignments
+        per status, computing them only if they are not cached.
+
+        Args:
+            subject: The user performing the action.
+            term_id: The term to get the totals of.
+
+        Returns:
+            HiringRollup
+
+        Raises:
+            PermissionException: If the subject does not have the required permission.
+        """
+        self._permission.enforce(subject, "hiring.admin", "*")
+        return self._hiring_rollup(term_id)
+
+    def _hiring_rollup(self, term_id: str) -> HiringRollup:
+        """Gets the hiring totals of a term from the cache, loading them on a miss."""
+        return hiring_rollup_cache.get_or_compute(
+            term_id, lambda: self._load_hiring_rollup(term_id)
+        )
+
+    def _load_hiring_rollup(self, term_id: str) -> HiringRollup:
+        """Computes the hiring totals of a term with two aggregate queries."""
+        term_site_ids = select(CourseSiteEntity.id).where(
+            CourseSiteEntity.term_id == term_id
+        )
+        enrollment_query = select(func.sum(SectionEntity.enrolled)).where(
+            SectionEntity.course_site_id.in_(term_site_ids)
+        )
+        total_enrollment = self._session.scalar(enrollment_query) or 0
+
+        level_totals_query = (
+            select(
+                HiringLevelEntity.id,
+                HiringLevelEntity.title,
+                HiringLevelEntity.classification,
+                HiringLevelEntity.load,
+                HiringLevelEntity.salary,
+                HiringAssignmentEntity.status,
+                func.count(HiringAssignmentEntity.id),
+            )
+            .join(HiringAssignmentEntity.hiring_level)
+            .where(HiringAssignmentEntity.term_id == term_id)
+            .group_by(HiringLevelEntity.id, HiringAssignmentEntity.status)
+            .order_by(HiringLevelEntity.id)
+        )
+        levels: dict[int, HiringLevelRollup] = {}
+        status_counts = {status: 0 for status in HiringAssignmentStatus}
+        provided_coverage = 0.0
+        for (
+            level_id,
+            title,
+            classification,
+            load,
+            salary,
+            status,
+            count,
+        ) in self._session.execute(level_totals_query):
+            level = levels.setdefault(
+                level_id,
+                HiringLevelRollup(level_id=level_id, title=title, count=0, cost=0.0),
+            )
+            level.count += count
+            level.cost += salary * count
+            status_counts[status] += count
+            provided_coverage += level_coverage(classification, load) * count
+
+        return HiringRollup(
+            term_id=term_id,
+            total_enrollment=total_enrollment,
+            total_cost=sum(level.cost for level in levels.values()),
+            coverage=(float(total_enrollment) / 60.0) - provided_coverage,
+            levels=list(levels.values()),
+            status_counts=status_counts,
+        )
+
     def get_hiring_admin_course_overview(
         self, subject: User, course_site_id: str
     ) -> HiringAdminCourseOverview:
@@ -704,6 +1013,184 @@ class HiringService:
             instructor_preferences=instructor_preferences,
         )
 
+    def propose_hiring_assignments(
+        self, subject: User, term_id: str, budget: float | None = None
+    ) -> list[HiringAssignmentDraft]:
+        """
+        Proposes hiring assignments for every course site in a term at once.
+
+        Applicants are matched to course sites they ranked and whose instructors marked
+        them as preferred, until each course site's coverage need is met. Applicants who
+        already have an assignment in the term are not proposed again. Nothing is
+        saved: the proposals are returned as drafts for the hiring admin to review.
+
+        Args:
+            subject: The user making the request.
+            term_id: The term to propose assignments for.
+            budget: The most that all proposed assignments may cost in total, if limited.
+
+        Returns:
+            list[HiringAssignmentDraft]: Proposed assignments, by course site and then
+                instructor preference.
+        """
+        # 1. Check for hiring permissions.
+        self._permission.enforce(subject, "hiring.admin", "*")
+
+        # 2. Load the coverage each course site in the term still needs.
+        enrollment_query = (
+            select(CourseSiteEntity.id, func.sum(SectionEntity.enrolled))
+            .join(CourseSiteEntity.sections)
+            .where(CourseSiteEntity.term_id == term_id)
+            .group_by(CourseSiteEntity.id)
+            .order_by(CourseSiteEntity.id)
+        )
+        site_ids: list[int] = []
+        site_needs: list[float] = []
+        for site_id, enrollment in self._session.execute(enrollment_query):
+            site_ids.append(site_id)
+            site_needs.append(float(enrollment or 0) / 60.0)
+        site_index = {site_id: index for index, site_id in enumerate(site_ids)}
+
+        assigned_query = (
+            select(
+                HiringAssignmentEntity.course_site_id,
+                HiringAssignmentEntity.user_id,
+                HiringLevelEntity.classification,
+                HiringLevelEntity.load,
+            )
+            .join(HiringAssignmentEntity.hiring_level)
+            .where(HiringAssignmentEntity.term_id == term_id)
+        )
+        assigned_user_ids: set[int] = set()
+        for site_id, user_id, classification, load in self._session.execute(
+            assigned_query
+        ):
+            assigned_user_ids.add(user_id)
+            if site_id in site_index:
+                site_needs[site_index[site_id]] -= level_coverage(classification, load)
+
+        # 3. Load the applicants, each at the default hiring level for their program.
+        levels = _default_hiring_levels(
+            self._session.scalars(
+                select(HiringLevelEntity).where(HiringLevelEntity.is_active)
+            ).all()
+        )
+        application_query = (
+            select(
+                ApplicationEntity.id,
+                ApplicationEntity.user_id,
+                ApplicationEntity.type,
+                ApplicationEntity.program_pursued,
+            )
+            .where(ApplicationEntity.term_id == term_id)
+            .order_by(ApplicationEntity.id)
+        )
+        applicants: list[tuple[int, HiringLevelEntity]] = []
+        applicant_index: dict[int, int] = {}
+        for application_id, user_id, application_type, program in self._session.execute(
+            application_query
+        ):
+            level = levels.get(_applicant_classification(application_type, program))
+            if user_id in assigned_user_ids or level is None:
+                continue
+            # Applicants who applied more than once are considered once
+            assigned_user_ids.add(user_id)
+            applicant_index[application_id] = len(applicants)
+            applicants.append((user_id, level))
+
+        # 4. Load student preferences, ranking each course site by its best section.
+        student_priority = func.min(section_application_table.c.preference)
+        student_preference_query = (
+            select(
+                section_application_table.c.application_id,
+                SectionEntity.course_site_id,
+            )
+            .join(
+                SectionEntity,
+                section_application_table.c.section_id == SectionEntity.id,
+            )
+            .where(
+                SectionEntity.term_id == term_id,
+                SectionEntity.course_site_id.is_not(None),
+            )
+            .group_by(
+                section_application_table.c.application_id,
+                SectionEntity.course_site_id,
+            )
+            .order_by(section_application_table.c.application_id, student_priority)
+        )
+        applicant_choices: list[list[int]] = [[] for _ in applicants]
+        for application_id, site_id in self._session.execute(student_preference_query):
+            if application_id in applicant_index and site_id in site_index:
+                applicant_choices[applicant_index[application_id]].append(
+                    site_index[site_id]
+                )
+
+        # 5. Load instructor preferences.
+        instructor_preference_query = (
+            select(
+                ApplicationReviewEntity.id,
+                ApplicationReviewEntity.application_id,
+                ApplicationReviewEntity.course_site_id,
+                ApplicationReviewEntity.preference,
+            )
+            .join(ApplicationReviewEntity.application)
+            .where(
+                ApplicationEntity.term_id == term_id,
+                ApplicationReviewEntity.status == ApplicationReviewStatus.PREFERRED,
+            )
+        )
+        site_rankings: list[dict[int, int]] = [{} for _ in site_ids]
+        review_ids: dict[tuple[int, int], int] = {}
+        for review_id, application_id, site_id, preference in self._session.execute(
+            instructor_preference_query
+        ):
+            if application_id in applicant_index and site_id in site_index:
+                applicant = applicant_index[application_id]
+                site_rankings[site_index[site_id]][applicant] = preference
+                review_ids[(applicant, site_index[site_id])] = review_id
+
+        # 6. Match applicants to course sites.
+        problem = HiringMatchingProblem(
+            site_needs=site_needs,
+            applicant_coverage=[
+                level_coverage(level.classification, level.load)
+                for _, level in applicants
+            ],
+            applicant_costs=[level.salary for _, level in applicants],
+            applicant_choices=applicant_choices,
+            site_rankings=site_rankings,
+        )
+        matches = solve_hiring_matching(problem, budget)
+
+        # 7. Return the matches as draft assignments.
+        now = datetime.now()
+
+        def to_draft(site: int, rank: int, applicant: int) -> HiringAssignmentDraft:
+            user_id, level = applicants[applicant]
+            student_choice = applicant_choices[applicant].index(site) + 1
+            return HiringAssignmentDraft(
+                user_id=user_id,
+                term_id=term_id,
+                course_site_id=site_ids[site],
+                application_review_id=review_ids[(applicant, site)],
+                level=level.to_model(),
+                status=HiringAssignmentStatus.DRAFT,
+                position_number="",
+                epar="",
+                i9=False,
+                notes=f"Proposed: student choice {student_choice}, instructor preference {rank}.",
+                created=now,
+                modified=now,
+            )
+
+        proposals = sorted(
+            (site, site_rankings[site][applicant], applicant)
+            for applicant, site in enumerate(matches)
+            if site is not None
+        )
+        return [to_draft(*proposal) for proposal in proposals]
+
     def create_hiring_assignment(
         self, subject: User, assignment: HiringAssignmentDraft
     ) -> HiringAssignmentOverview:
@@ -714,6 +1201,10 @@ class HiringService:
         assignment_entity = HiringAssignmentEntity.from_draft_model(assignment)
         self._session.add(assignment_entity)
         self._session.commit()
+        apply_assignment_changes(
+            assignment_entity.term_id,
+            [(assignment_entity.hiring_level.to_model(), assignment_entity.status, 1)],
+        )
 
         return assignment_entity.to_overview_model()
 
@@ -729,6 +1220,8 @@ class HiringService:
             raise ResourceNotFoundException(
                 f"No hiring assignment with ID: {assignment.id}"
             )
+        previous_level = assignment_entity.hiring_level.to_model()
+        previous_status = assignment_entity.status
         # 3. Update the data and commit
         assert assignment.level.id is not None
         assignment_entity.hiring_level_id = assignment.level.id
@@ -740,6 +1233,17 @@ class HiringService:
         assignment_entity.modified = datetime.now()
 
         self._session.commit()
+        apply_assignment_changes(
+            assignment_entity.term_id,
+            [
+                (previous_level, previous_status, -1),
+                (
+                    assignment_entity.hiring_level.to_model(),
+                    assignment_entity.status,
+                    1,
+                ),
+            ],
+        )
 
         return assignment_entity.to_overview_model()
 
@@ -757,9 +1261,12 @@ class HiringService:
                 f"No hiring assignment with ID: {assignment_id}"
             )
         model = assignment_entity.to_overview_model()
+        term_id = assignment_entity.term_id
+        status = assignment_entity.status
         # 3. Delete and save
         self._session.delete(assignment_entity)
         self._session.commit()
+        apply_assignment_changes(term_id, [(model.level, status, -1)])
         return model
 
     def get_hiring_levels(self, subject: User) -> list[HiringLevel]:
@@ -801,6 +1308,7 @@ class HiringService:
         level_entity.is_active = level.is_active
 
         self._session.commit()
+        hiring_rollup_cache.clear()
 
         return level_entity.to_model()
 
@@ -867,24 +1375,37 @@ class HiringService:
         # 8. Execute queries
         length = self._session.scalar(count_query) or 0
         assignment_entities = self._session.scalars(assignment_query).unique().all()
+        labels = get_term_section_labels(self._session, term_id)
 
         # 9. Build and return response
         return Paginated(
             items=[
-                assignment.to_summary_overview_model()
+                assignment.to_summary_overview_model(
+                    course=_course_label(labels, assignment.course_site_id)
+                )
                 for assignment in assignment_entities
             ],
             length=length,
             params=pagination_params,
         )
 
-    def get_hiring_summary_for_csv(
-        self, subject: User, term_id: str
-    ) -> list[HiringAssignmentCsvRow]:
-        """Returns the hires to show on a summary page for a given term."""
-        # 1. Check for hiring permissions.
+    def get_hiring_summary_for_csv(self, subject: User, term_id: str) -> Iterator[str]:
+        """
+        Streams the committed and final hires of a term as CSV.
+
+        Args:
+            subject: The user performing the action.
+            term_id: The term to export the hires of.
+
+        Returns:
+            Iterator[str]: Chunks of the exported file.
+
+        Raises:
+            PermissionException: If the subject does not have the required permission.
+        """
+        # 1. Check for hiring permissions before the stream is consumed lazily.
         self._permission.enforce(subject, "hiring.summary", "*")
-        # 2. Build query
+        # 2. Build query, eagerly loading everything each row is built from
         assignment_query = (
             select(HiringAssignmentEntity)
             .join(HiringAssignmentEntity.user)
@@ -895,17 +1416,39 @@ class HiringService:
                 )
             )
             .order_by(UserEntity.last_name, UserEntity.first_name)
+            .options(
+                contains_eager(HiringAssignmentEntity.user),
+                joinedload(HiringAssignmentEntity.hiring_level),
+                joinedload(HiringAssignmentEntity.course_site)
+                .selectinload(CourseSiteEntity.sections)
+                .selectinload(SectionEntity.staff)
+                .joinedload(SectionMemberEntity.user),
+            )
         )
-        # 3. Return items
-        assignment_entities = self._session.scalars(assignment_query).all()
-        return [
-            assignment_entity.to_csv_row() for assignment_entity in assignment_entities
-        ]
+        # 3. Stream items
+        rows = (
+            assignment_entity.to_csv_row()
+            for assignment_entity in stream_scalars(self._session, assignment_query)
+        )
+        return to_csv_chunks(rows, list(HiringAssignmentCsvRow.model_fields))
 
     def get_course_site_hiring_status_csv(
         self, subject: User, course_site_id: int
-    ) -> list[ApplicationReviewCsvRow]:
-        """Retrieves the applications to a course for a CSV export."""
+    ) -> Iterator[str]:
+        """
+        Streams the applications to a course site as CSV.
+
+        Args:
+            subject: The user performing the action.
+            course_site_id: The course site to export the applications to.
+
+        Returns:
+            Iterator[str]: Chunks of the exported file.
+
+        Raises:
+            ResourceNotFoundException: If the course site does not exist.
+            PermissionException: If the subject does not have the required permission.
+        """
         # Step 0: Load a Course Site
         site_entity = self._load_course_site(course_site_id)
 
@@ -915,10 +1458,26 @@ class HiringService:
                 subject, "hiring.get_status", f"course_site/{course_site_id}"
             )
 
-        # Step 2: Convert all applicants to rows and return
-        return [
-            application.to_csv_row() for application in site_entity.application_reviews
-        ]
+        # Step 2: Stream all applicants as rows
+        review_query = (
+            select(ApplicationReviewEntity)
+            .where(ApplicationReviewEntity.course_site_id == course_site_id)
+            .order_by(ApplicationReviewEntity.id)
+            .options(
+                joinedload(ApplicationReviewEntity.application).joinedload(
+                    ApplicationEntity.user
+                ),
+                joinedload(ApplicationReviewEntity.application).selectinload(
+                    ApplicationEntity.preferred_sections
+                ),
+            )
+        )
+        labels = get_term_section_labels(self._session, site_entity.term_id)
+        rows = (
+            review.to_csv_row(labels.catalog_sections)
+            for review in stream_scalars(self._session, review_query)
+        )
+        return to_csv_chunks(rows, list(ApplicationReviewCsvRow.model_fields))
 
     def get_hiring_assignments_for_course_site(
         self, subject: User, course_site_id: int, pagination_params: PaginationParams
@@ -979,8 +1538,21 @@ class HiringService:
 
     def get_assignment_summary_for_instructors_csv(
         self, subject: User, course_site_id: int
-    ) -> list[HiringAssignmentSummaryCsvRow]:
-        """Returns the hires to show for a course site as a CSV."""
+    ) -> Iterator[str]:
+        """
+        Streams the committed and final hires of a course site as CSV.
+
+        Args:
+            subject: The user performing the action.
+            course_site_id: The course site to export the hires of.
+
+        Returns:
+            Iterator[str]: Chunks of the exported file.
+
+        Raises:
+            ResourceNotFoundException: If the course site does not exist.
+            PermissionException: If the subject does not have the required permission.
+        """
         # 1. Check for hiring permissions.
         course_site = self._load_course_site(course_site_id)
         if not self._is_instructor(subject, course_site):
@@ -991,20 +1563,26 @@ class HiringService:
         # 2. Build query
         assignments_query = (
             select(HiringAssignmentEntity)
+            .join(HiringAssignmentEntity.user)
             .where(HiringAssignmentEntity.course_site_id == course_site_id)
             .where(
                 HiringAssignmentEntity.status.in_(
                     [HiringAssignmentStatus.COMMIT, HiringAssignmentStatus.FINAL]
                 )
             )
+            .order_by(UserEntity.last_name, UserEntity.first_name)
+            .options(
+                contains_eager(HiringAssignmentEntity.user),
+                joinedload(HiringAssignmentEntity.hiring_level),
+            )
         )
 
-        # 3. Return items
-        assignment_entities = self._session.scalars(assignments_query).all()
-        return [
+        # 3. Stream items
+        rows = (
             assignment_entity.to_summary_csv_row()
-            for assignment_entity in assignment_entities
-        ]
+            for assignment_entity in stream_scalars(self._session, assignments_query)
+        )
+        return to_csv_chunks(rows, list(HiringAssignmentSummaryCsvRow.model_fields))
 
     def conflict_check(
         self, subject: User, application_id: int
@@ -1082,3 +1660,141 @@ class HiringService:
             ],
             priorities=priorities,
         )
+
+    def conflict_check_matrix(self, subject: User, term_id: str) -> ConflictCheckMatrix:
+        """
+        Computes the conflict checks of every application in a term at once.
+
+        Student and instructor priorities of every application and course site are
+        found with one grouped query, and existing assignments with one more.
+
+        Args:
+            subject: The user performing the action.
+            term_id: The term to check the applications of.
+
+        Returns:
+            ConflictCheckMatrix
+
+        Raises:
+            PermissionException: If the subject does not have the required permission.
+        """
+        self._permission.enforce(subject, "hiring.conflict_check", "*")
+
+        student_priority = func.min(section_application_table.c.preference)
+        instructor_priority = func.min(ApplicationReviewEntity.preference)
+        priority_query = (
+            select(
+                ApplicationReviewEntity.application_id,
+                ApplicationReviewEntity.course_site_id,
+                student_priority,
+                instructor_priority,
+            )
+            .join(
+                ApplicationEntity,
+                ApplicationReviewEntity.application_id == ApplicationEntity.id,
+            )
+            .join(
+                SectionEntity,
+                SectionEntity.course_site_id == ApplicationReviewEntity.course_site_id,
+            )
+            .join(
+                section_application_table,
+                and_(
+                    section_application_table.c.section_id == SectionEntity.id,
+                    section_application_table.c.application_id
+                    == ApplicationReviewEntity.application_id,
+                ),
+            )
+            .where(
+                ApplicationEntity.term_id == term_id,
+                ApplicationReviewEntity.status == ApplicationReviewStatus.PREFERRED,
+            )
+            .group_by(
+                ApplicationReviewEntity.application_id,
+                ApplicationReviewEntity.course_site_id,
+            )
+            .order_by(ApplicationReviewEntity.application_id, student_priority)
+        )
+        cells = [
+            ConflictCheckCell(
+                application_id=application_id,
+                course_site_id=course_site_id,
+                student_priority=student_pri,
+                instructor_priority=instructor_pri,
+            )
+            for application_id, course_site_id, student_pri, instructor_pri in (
+                self._session.execute(priority_query)
+            )
+        ]
+
+        assignment_query = (
+            select(
+                HiringAssignmentEntity.id,
+                ApplicationReviewEntity.application_id,
+                HiringAssignmentEntity.course_site_id,
+                HiringLevelEntity.title,
+                HiringAssignmentEntity.status,
+            )
+            .join(
+                ApplicationReviewEntity,
+                HiringAssignmentEntity.application_review_id
+                == ApplicationReviewEntity.id,
+            )
+            .join(HiringAssignmentEntity.hiring_level)
+            .where(HiringAssignmentEntity.term_id == term_id)
+            .order_by(ApplicationReviewEntity.application_id, HiringAssignmentEntity.id)
+        )
+        assignments = [
+            ConflictCheckAssignment(
+                id=id,
+                application_id=application_id,
+                course_site_id=course_site_id,
+                level_title=level_title,
+                status=status,
+            )
+            for id, application_id, course_site_id, level_title, status in (
+                self._session.execute(assignment_query)
+            )
+        ]
+
+        course_site_ids = {cell.course_site_id for cell in cells} | {
+            assignment.course_site_id for assignment in assignments
+        }
+        course_site_query = (
+            select(CourseSiteEntity.id, CourseSiteEntity.title)
+            .where(CourseSiteEntity.id.in_(course_site_ids))
+            .order_by(CourseSiteEntity.id)
+        )
+        course_sites = [
+            ConflictCheckCourseSite(id=id, title=title)
+            for id, title in self._session.execute(course_site_query)
+        ]
+
+        return ConflictCheckMatrix(
+            term_id=term_id,
+            course_sites=course_sites,
+            cells=cells,
+            assignments=assignments,
+        )
+
+
+def _applicant_classification(
+    application_type: str | None, program_pursued: str | None
+) -> HiringLevelClassification:
+    """Classification of the hiring level an applicant would be hired at."""
+    if application_type != "gta":
+        return HiringLevelClassification.UG
+    if program_pursued in {"PhD", "PhD (ABD)"}:
+        return HiringLevelClassification.PHD
+    return HiringLevelClassification.MS
+
+
+def _default_hiring_levels(
+    levels: Sequence[HiringLevelEntity],
+) -> dict[HiringLevelClassification, HiringLevelEntity]:
+    """Picks the level proposed assignments use for each classification: the one with
+    the largest load, and then the lowest salary."""
+    defaults: dict[HiringLevelClassification, HiringLevelEntity] = {}
+    for level in sorted(levels, key=lambda level: (-level.load, level.salary)):
+        defaults.setdefault(level.classification, level)
+    return defaults
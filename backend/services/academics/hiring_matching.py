@@ -0,0 +1,119 @@
+"""
+Solver that proposes hiring assignments for a whole term at once.
+
+Applicants and course sites are numbered from zero and the solver works on plain lists
+indexed by those numbers, so that `HiringService` can load a term's preferences with a
+few queries and the matching itself runs in memory.
+
+Assignments are proposed with applicant-proposing deferred acceptance (Gale-Shapley):
+each applicant applies to the course sites they ranked in order, and each course site
+holds the applicants its instructors ranked best until its coverage need is met. The
+result is stable, so no applicant and course site would both rather be matched to each
+other than to their proposed assignments.
+"""
+
+from bisect import insort
+from collections import deque
+from dataclasses import dataclass
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@dataclass
+class HiringMatchingProblem:
+    """Inputs to the matching solver, indexed by applicant and course site number."""
+
+    site_needs: list[float]
+    """Coverage each course site still needs, in the units of `_calculate_coverage`."""
+
+    applicant_coverage: list[float]
+    """Coverage each applicant provides to the course site they are assigned to."""
+
+    applicant_costs: list[float]
+    """Salary of each applicant's hiring level."""
+
+    applicant_choices: list[list[int]]
+    """Course sites each applicant applied to, most preferred first."""
+
+    site_rankings: list[dict[int, int]]
+    """Instructor ranking of each applicant a course site prefers, lower is better.
+    Applicants missing from a course site's ranking are not assigned to it."""
+
+
+def solve_hiring_matching(
+    problem: HiringMatchingProblem, budget: float | None = None
+) -> list[int | None]:
+    """
+    Proposes a course site for each applicant.
+
+    Args:
+        problem: The preferences, coverage, and costs to match.
+        budget: The most that all proposed assignments may cost in total, if limited.
+            Over budget, the assignments ranked worst by their course sites are dropped,
+            most expensive first.
+
+    Returns:
+        list[int | None]: The course site proposed for each applicant, or None.
+    """
+    rankings = problem.site_rankings
+    next_choice = [0] * len(problem.applicant_choices)
+    held: list[list[tuple[int, int]]] = [[] for _ in problem.site_needs]
+
+    # Applicants who provide no coverage would never fill a course site
+    proposing = deque(
+        applicant
+        for applicant, coverage in enumerate(problem.applicant_coverage)
+        if coverage > 0
+    )
+    while len(proposing) > 0:
+        applicant = proposing.popleft()
+        choices = problem.applicant_choices[applicant]
+
+        # Apply to the next course site that ranked the applicant
+        while next_choice[applicant] < len(choices):
+            site = choices[next_choice[applicant]]
+            next_choice[applicant] += 1
+            if applicant in rankings[site]:
+                break
+        else:
+            continue
+
+        # The course site keeps its best ranked applicants until its need is covered,
+        # and rejects the rest, who go on to apply to their next choice.
+        insort(held[site], (rankings[site][applicant], applicant))
+        covered = 0.0
+        for position, (_, held_applicant) in enumerate(held[site]):
+            if covered >= problem.site_needs[site]:
+                proposing.extend(rejected for _, rejected in held[site][position:])
+                del held[site][position:]
+                break
+            covered += problem.applicant_coverage[held_applicant]
+
+    assignments: list[int | None] = [None] * len(problem.applicant_choices)
+    for site, site_held in enumerate(held):
+        for _, applicant in site_held:
+            assignments[applicant] = site
+
+    if budget is not None:
+        total_cost = sum(
+            problem.applicant_costs[applicant]
+            for applicant, site in enumerate(assignments)
+            if site is not None
+        )
+        drop_order = sorted(
+            (
+                (rank, problem.applicant_costs[applicant], applicant)
+                for site, site_held in enumerate(held)
+                for rank, applicant in site_held
+            ),
+            reverse=True,
+        )
+        for _, cost, applicant in drop_order:
+            if total_cost <= budget:
+                break
+            assignments[applicant] = None
+            total_cost -= cost
+
+    return assignments
@@ -0,0 +1,80 @@
+"""
+Process-wide cache of the term-wide hiring totals shown on the hiring budget dashboard.
+"""
+
+from datetime import timedelta
+
+from ...models.academics.hiring.hiring_assignment import HiringAssignmentStatus
+from ...models.academics.hiring.hiring_level import (
+    HiringLevel,
+    HiringLevelClassification,
+)
+from ...models.academics.hiring.hiring_rollup import HiringLevelRollup, HiringRollup
+from ..cache import ServiceCache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+hiring_rollup_cache: ServiceCache[str, HiringRollup] = ServiceCache(
+    ttl=timedelta(minutes=5)
+)
+"""Hiring totals of a term, keyed by term ID. Updated in place when the term's hiring
+assignments change, and invalidated whenever the hiring levels, enrollments, or course
+sites they depend on change."""
+
+
+def level_coverage(classification: HiringLevelClassification, load: float) -> float:
+    """Coverage an assignment at a hiring level provides to a course site."""
+    if classification in {HiringLevelClassification.MS, HiringLevelClassification.PHD}:
+        return load
+    elif classification == HiringLevelClassification.UG:
+        return load * 0.25
+    else:
+        # IOR
+        return 0.0
+
+
+def apply_assignment_changes(
+    term_id: str, changes: list[tuple[HiringLevel, HiringAssignmentStatus, int]]
+) -> None:
+    """
+    Applies added (a change of 1) and removed (a change of -1) hiring assignments,
+    given by their level and status, to the cached hiring totals of their term, if
+    they are cached.
+    """
+
+    def apply(rollup: HiringRollup) -> HiringRollup:
+        rollup = rollup.model_copy(deep=True)
+        for level, status, change in changes:
+            _apply_assignment_change(rollup, level, status, change)
+        return rollup
+
+    hiring_rollup_cache.update(term_id, apply)
+
+
+def _apply_assignment_change(
+    rollup: HiringRollup,
+    level: HiringLevel,
+    status: HiringAssignmentStatus,
+    change: int,
+) -> None:
+    """Adds an assignment to, or removes one from, hiring totals in place."""
+    assert level.id is not None
+    level_rollup = next(
+        (entry for entry in rollup.levels if entry.level_id == level.id), None
+    )
+    if level_rollup is None:
+        level_rollup = HiringLevelRollup(
+            level_id=level.id, title=level.title, count=0, cost=0.0
+        )
+        rollup.levels.append(level_rollup)
+        rollup.levels.sort(key=lambda entry: entry.level_id)
+    level_rollup.count += change
+    level_rollup.cost += level.salary * change
+    if level_rollup.count <= 0:
+        rollup.levels.remove(level_rollup)
+
+    rollup.status_counts[status] += change
+    rollup.total_cost = sum(entry.cost for entry in rollup.levels)
+    rollup.coverage -= level_coverage(level.classification, level.load) * change
@@ -23,6 +23,10 @@ from ...entities.academics import SectionRoomEntity
 from ..permission import PermissionService
 
 from ...services.academics.section_member import SectionMemberService
+from ...services.academics.course_membership import user_course_sites_cache
+from ...services.academics.section_labels import term_section_labels_cache
+from ...services.academics.hiring_rollup import hiring_rollup_cache
+from ...services.application import eligible_sections_cache
 
 from ...services.exceptions import (
     ResourceNotFoundException,
@@ -148,6 +152,9 @@ class SectionService:
         self._session.add(section_entity)
 
         self._session.commit()
+        term_section_labels_cache.invalidate(section_entity.term_id)
+        hiring_rollup_cache.invalidate(section_entity.term_id)
+        eligible_sections_cache.invalidate(section_entity.term_id)
 
         # Find added object
         added_section = section_entity.to_details_model()
@@ -248,6 +255,10 @@ class SectionService:
 
         # Commit changes
         self._session.commit()
+        user_course_sites_cache.clear()
+        term_section_labels_cache.clear()
+        hiring_rollup_cache.clear()
+        eligible_sections_cache.clear()
 
         # Return edited object
         return section_entity.to_details_model()
@@ -275,6 +286,10 @@ class SectionService:
         # Delete and commit changes
         self._session.delete(section_entity)
         self._session.commit()
+        user_course_sites_cache.clear()
+        term_section_labels_cache.clear()
+        hiring_rollup_cache.clear()
+        eligible_sections_cache.clear()
 
     def update_enrollment_totals(self, subject: User):
         """
@@ -357,6 +372,7 @@ class SectionService:
 
                 # Save changes
                 self._session.commit()
+                hiring_rollup_cache.invalidate(AVAILABLE_TERMS[term])
             except:
                 raise CourseDataScrapingException(
                     f"Error reading COMP data from UNC's database for term: {term}"
@@ -0,0 +1,115 @@
+"""
+Process-wide cache of the short labels that hiring views show for the sections and
+course sites of a term, such as `comp110.001`, along with each section's catalog
+identity.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...entities.academics.course_entity import CourseEntity
+from ...entities.academics.section_entity import SectionEntity
+from ...models.academics.section import CatalogSectionIdentity
+from ..cache import ServiceCache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@dataclass(frozen=True)
+class TermSectionLabels:
+    """Labels of the sections of a term and of the course sites they belong to."""
+
+    sections: dict[int, str]
+    """Label of each section, keyed by section ID."""
+
+    course_sites: dict[int, str]
+    """Label of the first section of each course site, keyed by course site ID."""
+
+    catalog_sections: dict[int, CatalogSectionIdentity]
+    """Catalog identity of each section, keyed by section ID."""
+
+    course_site_sections: dict[int, list[int]]
+    """IDs of the sections of each course site in ID order, keyed by course site ID."""
+
+    def course_site_catalog_sections(
+        self, course_site_id: int
+    ) -> list[CatalogSectionIdentity]:
+        """Gets the catalog identities of the sections of a course site."""
+        return [
+            self.catalog_sections[section_id]
+            for section_id in self.course_site_sections.get(course_site_id, [])
+        ]
+
+
+term_section_labels_cache: ServiceCache[str, TermSectionLabels] = ServiceCache(
+    ttl=timedelta(minutes=5)
+)
+"""Section and course site labels of a term, keyed by term ID. Cleared whenever
+sections or course sites change."""
+
+
+def get_term_section_labels(session: Session, term_id: str) -> TermSectionLabels:
+    """
+    Gets the section and course site labels of a term, loading them on a cache miss.
+
+    Returns:
+        TermSectionLabels
+    """
+    return term_section_labels_cache.get_or_compute(
+        term_id, lambda: _load_term_section_labels(session, term_id)
+    )
+
+
+def _load_term_section_labels(session: Session, term_id: str) -> TermSectionLabels:
+    """Loads the labels of a term's sections with a single query."""
+    section_query = (
+        select(
+            SectionEntity.id,
+            SectionEntity.course_site_id,
+            SectionEntity.course_id,
+            SectionEntity.number,
+            SectionEntity.override_title,
+            CourseEntity.subject_code,
+            CourseEntity.number,
+            CourseEntity.title,
+        )
+        .join(SectionEntity.course)
+        .where(SectionEntity.term_id == term_id)
+        .order_by(SectionEntity.id)
+    )
+    sections: dict[int, str] = {}
+    course_sites: dict[int, str] = {}
+    catalog_sections: dict[int, CatalogSectionIdentity] = {}
+    course_site_sections: dict[int, list[int]] = {}
+    for (
+        section_id,
+        course_site_id,
+        course_id,
+        number,
+        override_title,
+        subject_code,
+        course_number,
+        course_title,
+    ) in session.execute(section_query):
+        label = f"{course_id}.{number}"
+        sections[section_id] = label
+        catalog_sections[section_id] = CatalogSectionIdentity(
+            id=section_id,
+            subject_code=subject_code,
+            course_number=course_number,
+            section_number=number,
+            title=override_title if len(override_title) > 0 else course_title,
+        )
+        if course_site_id is not None:
+            course_sites.setdefault(course_site_id, label)
+            course_site_sections.setdefault(course_site_id, []).append(section_id)
+    return TermSectionLabels(
+        sections=sections,
+        course_sites=course_sites,
+        catalog_sections=catalog_sections,
+        course_site_sections=course_site_sections,
+    )
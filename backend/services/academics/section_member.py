@@ -3,10 +3,12 @@ The Section Member Service allows the API to manipulate section member data in t
 """
 
 from io import StringIO
+from typing import Iterator
 import csv
 
 from fastapi import Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from pydantic import BaseModel
@@ -25,6 +27,7 @@ from ...models import User
 from ...entities.academics import SectionEntity
 from ...entities import UserEntity
 from ..permission import PermissionService
+from .course_membership import user_course_sites_cache
 
 from ..exceptions import ResourceNotFoundException, CoursePermissionException
 
@@ -92,6 +95,7 @@ class SectionMemberService:
 
         self._session.add(section_membership)
         self._session.commit()
+        user_course_sites_cache.clear()
 
         return section_membership.to_details_model()
 
@@ -147,6 +151,7 @@ class SectionMemberService:
 
             self._session.add(section_membership)
             self._session.commit()
+            user_course_sites_cache.clear()
 
             section_memberships.append(section_membership)
 
@@ -155,9 +160,27 @@ class SectionMemberService:
             for section_membership in section_memberships
         ]
 
-    def import_users_from_csv(self, subject: User, section_id: int, csv_data: str):
+    def import_users_from_csv(
+        self, subject: User, section_id: int, csv_data: str
+    ) -> "UploadResponse":
         """
-        Creates section members for a course section based on an inputted CSV file.
+        Syncs the student roster of a course section with a Canvas roster CSV file.
+
+        Students in the CSV without a user profile have one created, students not on
+        the roster are added to it, and students on the roster but not in the CSV are
+        removed from it. All changes are made in a single transaction.
+
+        Args:
+            subject (User): The instructor importing the roster.
+            section_id (int): ID of the section whose roster to sync.
+            csv_data (str): Contents of the Canvas roster CSV file.
+
+        Returns:
+            UploadResponse: The number of students in the CSV and the changes made.
+
+        Raises:
+            CoursePermissionException: If the user is not an instructor of the section.
+            HTTPException: If the CSV is not formatted correctly.
         """
         # Get the user membership of the course
         membership_query = select(SectionMemberEntity).where(
@@ -175,127 +198,142 @@ class SectionMemberService:
                 "Cannot create students for a course you are not an instructor of."
             )
 
-        # Read the csv data
-        file = StringIO(csv_data)
-        reader = csv.DictReader(file)
-
-        # Parse each row
-        students: list[StudentMemberJson] = []
-
-        unique_sections = set()
-
-        try:
-            for row in reader:
-                if (
-                    reader.line_num != 2
-                    and row["Student"] != "Student, Test"
-                    and len(row["Student"]) > 0
-                ):
-
-                    # Ensure that the uploaded CSV only contains one section
-                    unique_sections.add(row["Section"])
-                    if len(unique_sections) > 1:
-                        raise HTTPException(
-                            status_code=422, detail="CSV includes multiple sections."
-                        )
-
-                    name = row["Student"]
-                    pid = int(row["SIS User ID"])
-                    onyen = row["SIS Login ID"]
-                    students.append(StudentMemberJson(name=name, pid=pid, onyen=onyen))
-        except:
-            raise HTTPException(
-                status_code=422, detail="CSV is not formatted correctly."
-            )
+        # Read the students of the CSV, keyed by PID
+        students = {student.pid: student for student in _read_roster_csv(csv_data)}
+        student_pids = students.keys()
 
-        student_pids = [student.pid for student in students]
-
-        # There are three cases:
-        #  Case 1: Student is already on the roster - we do not need to make any changes.
-        #  Case 2: Students are not on the roster, but user profiles exist - just add a SectionMemberEntity.
-        #  Case 3: User is not in the system - create a user and a relationship.
-        #  Case 4: Student is already on the roster, but not in the CSV.
-
-        # Case 1: Determine students that are already on the roster
-        existing_roster_members_query = (
-            select(SectionMemberEntity)
-            .join(UserEntity)
+        # Load the current roster of the section, keyed by PID
+        roster_query = (
+            select(UserEntity.pid, UserEntity.onyen, SectionMemberEntity.id)
+            .select_from(SectionMemberEntity)
+            .join(SectionMemberEntity.user)
             .where(SectionMemberEntity.section_id == section_id)
         )
-        existing_roster_member_entities = self._session.scalars(
-            existing_roster_members_query
-        ).all()
-        existing_roster_member_pids = [
-            member.user.pid for member in existing_roster_member_entities
-        ]
-
-        # Case 2: Determine students that are not on the roster, but that exist in the database.
-        existing_users_query = select(UserEntity).where(
-            UserEntity.pid.in_(student_pids)
+        student_roster_query = roster_query.where(
+            SectionMemberEntity.member_role == RosterRole.STUDENT
         )
-        existing_user_entities = self._session.scalars(existing_users_query).all()
-        existing_users_pids = [member.pid for member in existing_user_entities]
-        for user in existing_user_entities:
-            if user.pid not in existing_roster_member_pids:
-                draft = SectionMemberDraft(user_id=user.id, section_id=section_id)
-                section_membership = SectionMemberEntity.from_draft_model(draft)
-                self._session.add(section_membership)
-
-        # Case 3: Find remaining students that do not exist
-        nonexisting_students = [
-            student for student in students if student.pid not in existing_users_pids
-        ]
-        new_student_entities = []
-
-        for student in nonexisting_students:
-            name_segments = student.name.split(",")
-            last_name = name_segments[0].strip() if len(name_segments) > 0 else ""
-            first_name = name_segments[1].strip() if len(name_segments) > 1 else ""
-            new_student = User(
-                pid=student.pid,
-                onyen=student.onyen,
-                first_name=first_name,
-                last_name=last_name,
-                email=f"{student.onyen}@email.unc.edu",
+        roster_pids = {pid for pid, _, _ in self._session.execute(roster_query)}
+        removed = {
+            pid: (onyen, member_id)
+            for pid, onyen, member_id in self._session.execute(student_roster_query)
+            if pid not in student_pids
+        }
+
+        # Create user profiles for students who do not have one yet
+        user_ids = dict(
+            self._session.execute(
+                select(UserEntity.pid, UserEntity.id).where(
+                    UserEntity.pid.in_(list(student_pids))
+                )
+            ).all()
+        )
+        new_pids = student_pids - user_ids.keys()
+        if len(new_pids) > 0:
+            new_users_query = (
+                insert(UserEntity)
+                .values([_to_user_values(students[pid]) for pid in new_pids])
+                .on_conflict_do_nothing(index_elements=[UserEntity.pid])
+                .returning(UserEntity.pid, UserEntity.id)
+            )
+            created_ids = dict(self._session.execute(new_users_query).all())
+            user_ids |= created_ids
+        else:
+            created_ids = {}
+
+        # Add students who are not on the roster yet
+        added_pids = student_pids - roster_pids
+        if len(added_pids) > 0:
+            self._session.execute(
+                insert(SectionMemberEntity)
+                .values(
+                    [
+                        {
+                            "user_id": user_ids[pid],
+                            "section_id": section_id,
+                            "member_role": RosterRole.STUDENT,
+                        }
+                        for pid in added_pids
+                        if pid in user_ids
+                    ]
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[
+                        SectionMemberEntity.user_id,
+                        SectionMemberEntity.section_id,
+                    ]
+                )
             )
-            new_student_entity = UserEntity.from_model(new_student)
-            new_student_entities.append(new_student_entity)
-            self._session.add(new_student_entity)
-
-        # Commit to save new students
-        self._session.commit()
 
-        # Finish Case 3, adding memberships for new members
-        for new_student in new_student_entities:
-            draft = SectionMemberDraft(user_id=new_student.id, section_id=section_id)
-            section_membership = SectionMemberEntity.from_draft_model(draft)
-            self._session.add(section_membership)
+        # Remove students who are on the roster but not in the CSV
+        if len(removed) > 0:
+            self._session.execute(
+                delete(SectionMemberEntity).where(
+                    SectionMemberEntity.id.in_(
+                        [member_id for _, member_id in removed.values()]
+                    )
+                )
+            )
 
-        # Commit changes
         self._session.commit()
+        user_course_sites_cache.clear()
 
-        # Case 4: Remove students not in the CSV file that are still on the roster.
-        students_to_remove_query = (
-            select(SectionMemberEntity)
-            .join(UserEntity)
-            .where(
-                UserEntity.pid.not_in(student_pids),
-                UserEntity.pid.in_(existing_roster_member_pids),
-            )
-            .where(
-                SectionMemberEntity.section_id == section_id,
-                SectionMemberEntity.member_role == RosterRole.STUDENT,
-            )
+        return UploadResponse(
+            uploaded=len(students),
+            created=sorted(students[pid].onyen for pid in created_ids),
+            added=sorted(students[pid].onyen for pid in added_pids),
+            removed=sorted(onyen for onyen, _ in removed.values()),
         )
-        students_to_remove = self._session.scalars(students_to_remove_query).all()
-        for student in students_to_remove:
-            self._session.delete(student)
 
-        # Commit changes a final time
-        self._session.commit()
 
-        # Return number added
-        return UploadResponse(uploaded=len(student_pids))
+def _read_roster_csv(csv_data: str) -> Iterator["StudentMemberJson"]:
+    """
+    Reads the students of a Canvas roster CSV file, one row at a time.
+
+    Raises:
+        HTTPException: If the CSV is not formatted correctly or has multiple sections.
+    """
+    reader = csv.DictReader(StringIO(csv_data))
+    section = None
+    try:
+        for row in reader:
+            # Skip the "Points Possible" row, Canvas's test student, and blank rows
+            if (
+                reader.line_num == 2
+                or row["Student"] == "Student, Test"
+                or len(row["Student"]) == 0
+            ):
+                continue
+
+            # Ensure that the uploaded CSV only contains one section
+            if section is not None and row["Section"] != section:
+                raise HTTPException(
+                    status_code=422, detail="CSV includes multiple sections."
+                )
+            section = row["Section"]
+
+            yield StudentMemberJson(
+                name=row["Student"],
+                pid=int(row["SIS User ID"]),
+                onyen=row["SIS Login ID"],
+            )
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=422, detail="CSV is not formatted correctly.")
+
+
+def _to_user_values(student: "StudentMemberJson") -> dict:
+    """
+    Converts a student from a roster CSV into the column values of a new user.
+    """
+    name_segments = student.name.split(",")
+    return {
+        "pid": student.pid,
+        "onyen": student.onyen,
+        "first_name": name_segments[1].strip() if len(name_segments) > 1 else "",
+        "last_name": name_segments[0].strip(),
+        "email": f"{student.onyen}@email.unc.edu",
+    }
 
 
 class CSVModel(BaseModel):
@@ -310,3 +348,6 @@ class StudentMemberJson(BaseModel):
 
 class UploadResponse(BaseModel):
     uploaded: int
+    created: list[str] = []
+    added: list[str] = []
+    removed: list[str] = []
@@ -3,7 +3,8 @@
 from typing import List
 from fastapi import Depends
 from sqlalchemy import update, delete, select, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from pydantic import TypeAdapter
 from typing import Dict
 from backend.entities import section_application_table
 from backend.entities.application_entity import ApplicationEntity
@@ -30,14 +31,24 @@ from backend.services.exceptions import (
 )
 
 from .permission import PermissionService
+from .application_review import insert_missing_application_reviews
+from .cache import ServiceCache
 
 from ..database import db_session
-from datetime import datetime
+from datetime import datetime, timedelta
 
 __authors__ = ["Ajay Gandecha", "Abdulaziz Al-Shayef", "Ben Goulet"]
 __copyright__ = "Copyright 2024"
 __license__ = "MIT"
 
+eligible_sections_cache: ServiceCache[
+    str, tuple[list[CatalogSectionIdentity], bytes]
+] = ServiceCache(ttl=timedelta(minutes=5))
+"""Sections applicants can apply to and their JSON, keyed by the application term's ID.
+Cleared whenever sections or courses change."""
+
+_catalog_section_identities = TypeAdapter(list[CatalogSectionIdentity])
+
 
 class ApplicationService:
     """ApplicationService is the access layer to TA applications."""
@@ -108,6 +119,10 @@ class ApplicationService:
             )
             self._session.commit()  # This is an issue due to the table not being an entity.
 
+        # Put the application on the hiring boards of the course sites it prefers
+        insert_missing_application_reviews(self._session, application_entity.id)
+        self._session.commit()
+
         # Return the added data
         return application_entity.to_model()
 
@@ -173,6 +188,10 @@ class ApplicationService:
             )
             self._session.commit()  # This is an issue due to the table not being an entity.
 
+        # Put the application on the hiring boards of newly preferred course sites
+        insert_missing_application_reviews(self._session, application_entity.id)
+        self._session.commit()
+
         # Return the modified data
         return application_entity.to_model()
 
@@ -204,16 +223,50 @@ class ApplicationService:
         """
         Returns the eligible sections for the current active application term.
         """
-        term_query = select(TermEntity).where(
-            TermEntity.applications_open <= datetime.now(),
-            datetime.now() <= TermEntity.applications_close,
+        sections, _ = self._get_eligible_sections()
+        return sections
+
+    def eligible_sections_json(self) -> bytes:
+        """
+        Returns the pre-serialized JSON of the eligible sections for the current active
+        application term.
+        """
+        _, sections_json = self._get_eligible_sections()
+        return sections_json
+
+    def _get_eligible_sections(self) -> tuple[list[CatalogSectionIdentity], bytes]:
+        """Retrieves the cached eligible sections of the active application term, along
+        with their JSON.
+
+        The sections are cached process-wide per term and are invalidated when sections
+        or courses change."""
+        term_query = (
+            select(TermEntity.id)
+            .where(
+                TermEntity.applications_open <= datetime.now(),
+                datetime.now() <= TermEntity.applications_close,
+            )
+            .order_by(TermEntity.start)
         )
-        term_entities = self._session.scalars(term_query).all()
-        return (
-            [
-                section.to_catalog_identity_model()
-                for section in term_entities[0].course_sections
-            ]
-            if len(term_entities) > 0
-            else []
+        term_id = self._session.scalars(term_query).first()
+        if term_id is None:
+            return [], b"[]"
+
+        def compute() -> tuple[list[CatalogSectionIdentity], bytes]:
+            sections = self._compute_eligible_sections(term_id)
+            return sections, _catalog_section_identities.dump_json(sections)
+
+        return eligible_sections_cache.get_or_compute(term_id, compute)
+
+    def _compute_eligible_sections(self, term_id: str) -> list[CatalogSectionIdentity]:
+        """Loads the sections of a term with their courses in a single query."""
+        section_query = (
+            select(SectionEntity)
+            .where(SectionEntity.term_id == term_id)
+            .order_by(SectionEntity.course_id + SectionEntity.number)
+            .options(joinedload(SectionEntity.course))
         )
+        return [
+            section.to_catalog_identity_model()
+            for section in self._session.scalars(section_query)
+        ]
@@ -0,0 +1,112 @@
+"""
+Creates the not processed reviews that put applications on instructors' hiring boards.
+
+Hiring pages only show applications that have a review for the course site, so reviews
+are created when an application is submitted or updated, and for a whole term when its
+course sites are set up.
+"""
+
+from sqlalchemy import ColumnElement, exists, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from ..entities.academics import SectionEntity
+from ..entities.academics.hiring.application_review_entity import (
+    ApplicationReviewEntity,
+)
+from ..entities.section_application_table import section_application_table
+from ..models.academics.hiring.application_review import ApplicationReviewStatus
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def insert_missing_reviews(session: Session, term_id: str) -> int:
+    """
+    Inserts a not processed review for every application to a course site in a term that
+    does not have one yet, in a single statement. Does not commit.
+
+    Returns:
+        int: The number of reviews inserted.
+    """
+    return _insert_missing_reviews(session, SectionEntity.term_id == term_id)
+
+
+def insert_missing_application_reviews(session: Session, application_id: int) -> int:
+    """
+    Inserts a not processed review for every course site an application prefers a
+    section of that does not have one yet. Does not commit.
+
+    Returns:
+        int: The number of reviews inserted.
+    """
+    return _insert_missing_reviews(
+        session, section_application_table.c.application_id == application_id
+    )
+
+
+def _insert_missing_reviews(session: Session, criteria: ColumnElement[bool]) -> int:
+    """
+    Inserts the missing not processed reviews of the section preferences matching
+    `criteria` with a single INSERT ... SELECT.
+
+    New reviews are ranked after a course site's existing not processed reviews, in the
+    order the applications were submitted.
+    """
+    site_id = SectionEntity.course_site_id
+    missing = (
+        select(section_application_table.c.application_id, site_id)
+        .join(SectionEntity, section_application_table.c.section_id == SectionEntity.id)
+        .where(criteria, site_id.is_not(None))
+        .where(
+            ~exists().where(
+                ApplicationReviewEntity.application_id
+                == section_application_table.c.application_id,
+                ApplicationReviewEntity.course_site_id == site_id,
+            )
+        )
+        .distinct()
+        .subquery()
+    )
+    unprocessed = (
+        select(
+            ApplicationReviewEntity.course_site_id,
+            func.count().label("unprocessed"),
+        )
+        .where(ApplicationReviewEntity.status == ApplicationReviewStatus.NOT_PROCESSED)
+        .group_by(ApplicationReviewEntity.course_site_id)
+        .subquery()
+    )
+    preference = (
+        func.coalesce(func.nullif(unprocessed.c.unprocessed, 0), 1)
+        + func.row_number().over(
+            partition_by=missing.c.course_site_id, order_by=missing.c.application_id
+        )
+        - 1
+    )
+    reviews = select(
+        missing.c.application_id,
+        missing.c.course_site_id,
+        literal(
+            ApplicationReviewStatus.NOT_PROCESSED, ApplicationReviewEntity.status.type
+        ),
+        preference,
+        literal(""),
+    ).select_from(
+        missing.outerjoin(
+            unprocessed, unprocessed.c.course_site_id == missing.c.course_site_id
+        )
+    )
+    result = session.execute(
+        insert(ApplicationReviewEntity).from_select(
+            [
+                ApplicationReviewEntity.application_id,
+                ApplicationReviewEntity.course_site_id,
+                ApplicationReviewEntity.status,
+                ApplicationReviewEntity.preference,
+                ApplicationReviewEntity.notes,
+            ],
+            reviews,
+        )
+    )
+    return result.rowcount
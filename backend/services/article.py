@@ -4,8 +4,8 @@ The Article Service allows the API to manipulate article data in the database.
 
 from fastapi import Depends
 from sqlalchemy import select, func, delete
-from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy.orm import Session, joinedload, selectinload
+from datetime import datetime, timedelta
 
 from ..database import db_session
 from .exceptions import ResourceNotFoundException
@@ -13,6 +13,8 @@ from .exceptions import ResourceNotFoundException
 from ..services.event import EventService
 from ..services.permission import PermissionService
 from ..services.coworking import PolicyService, OperatingHoursService
+from ..services.coworking.operating_hours import upcoming_schedule_cache
+from .cache import ServiceCache
 
 from ..entities import (
     ArticleEntity,
@@ -30,13 +32,20 @@ from ..models.articles import (
     ArticleOverview,
     ArticleDraft,
 )
-from ..models.coworking import TimeRange
+from ..models.coworking import OperatingHours, ReservationOverview
+from ..models.event import EventOverview
 from ..models.pagination import Paginated, PaginationParams
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2024"
 __license__ = "MIT"
 
+_welcome_overview_cache: ServiceCache[
+    tuple[timedelta, tuple[int, ...]], tuple[WelcomeOverview, bytes]
+] = ServiceCache(ttl=timedelta(minutes=5), depends_on=[upcoming_schedule_cache])
+"""Welcome overview without user-specific data and its JSON, keyed by operating hours
+window and the IDs of the upcoming operating hours it shows."""
+
 
 class ArticleService:
     """Service that performs all of the actions on the `article` table"""
@@ -47,33 +56,83 @@ class ArticleService:
         permission_svc: PermissionService = Depends(),
         policies_svc: PolicyService = Depends(),
         operating_hours_svc: OperatingHoursService = Depends(),
+        event_svc: EventService = Depends(),
     ):
         """Initializes the session"""
         self._session = session
         self._permission_svc = permission_svc
         self._policies_svc = policies_svc
         self._operating_hours_svc = operating_hours_svc
+        self._event_svc = event_svc
 
     def get_welcome_overview(self, subject: User | None) -> WelcomeOverview:
         """Retrieves the welcome overview."""
+        # The announcement, news, and operating hours are the same for every visitor.
+        welcome_overview, _ = self._get_public_welcome_overview(subject)
+        if subject is None:
+            return welcome_overview
+
+        # Add the parts of the overview that are specific to the user.
+        return welcome_overview.model_copy(
+            update={
+                "upcoming_reservations": self._get_upcoming_reservations(subject),
+                "registered_events": self._get_registered_events(subject),
+            }
+        )
+
+    def get_welcome_overview_json_unauthenticated(self) -> bytes:
+        """Retrieves the pre-serialized JSON of the welcome overview for an unauthenticated user."""
+        _, welcome_overview_json = self._get_public_welcome_overview(None)
+        return welcome_overview_json
+
+    def _get_public_welcome_overview(
+        self, subject: User | None
+    ) -> tuple[WelcomeOverview, bytes]:
+        """Retrieves the cached welcome overview without user-specific data, along with its JSON.
+
+        The overview is cached process-wide per operating hours window and is invalidated
+        when articles or operating hours change. The upcoming operating hours are read
+        for the current time on every call and are part of the cache key, so a cached
+        overview never shows hours that have since closed."""
+        window = self._policies_svc.reservation_window(subject)
+        operating_hours = self._operating_hours_svc.upcoming_schedule(window)
+        key = (window, tuple(hours.id for hours in operating_hours))
+
+        def compute() -> tuple[WelcomeOverview, bytes]:
+            welcome_overview = self._compute_public_welcome_overview(operating_hours)
+            return welcome_overview, welcome_overview.model_dump_json().encode()
+
+        return _welcome_overview_cache.get_or_compute(key, compute)
+
+    def _compute_public_welcome_overview(
+        self, operating_hours: list[OperatingHours]
+    ) -> WelcomeOverview:
+        """Computes the welcome overview without user-specific data."""
         # First, retrieve the latest announcement.
         announcement_query = (
             select(ArticleEntity)
+            .options(
+                selectinload(ArticleEntity.authors),
+                selectinload(ArticleEntity.organization),
+            )
             .where(ArticleEntity.is_announcement)
             .where(ArticleEntity.state == ArticleState.PUBLISHED)
             .order_by(ArticleEntity.published.desc())
+            .limit(1)
         )
-        announcement_entity = self._session.scalars(announcement_query).all()
+        announcement_entity = self._session.scalars(announcement_query).one_or_none()
         announcement = (
-            announcement_entity[0].to_overview_model()
-            if len(announcement_entity) > 0
-            else None
+            announcement_entity.to_overview_model() if announcement_entity else None
         )
 
         # Next, retrieve the latest news.
         # For now, this will load a maximum of 10 articles.
         news_query = (
             select(ArticleEntity)
+            .options(
+                selectinload(ArticleEntity.authors),
+                selectinload(ArticleEntity.organization),
+            )
             .where(ArticleEntity.state == ArticleState.PUBLISHED)
             .where(ArticleEntity.is_announcement == False)
             .order_by(ArticleEntity.published.desc())
@@ -82,60 +141,49 @@ class ArticleService:
         news_entities = self._session.scalars(news_query).all()
         news = [article.to_overview_model() for article in news_entities]
 
-        # Load operating hours
-        now = datetime.now()
-        operating_hours = self._operating_hours_svc.schedule(
-            TimeRange(
-                start=now, end=now + self._policies_svc.reservation_window(subject)
-            )
-        )
-
-        # Load future reservations for a given user.
-        # For now, this will load a maximum of 3 future reservations.
-        future_reservations = []
-        if subject:
-            future_reservations_query = (
-                select(ReservationEntity)
-                .join(ReservationEntity.users)
-                .where(UserEntity.id == subject.id)
-                .where(ReservationEntity.start > datetime.now())
-            )
-            future_reservations_entities = self._session.scalars(
-                future_reservations_query
-            ).all()
-            future_reservations = [
-                reservation.to_overview_model()
-                for reservation in future_reservations_entities
-            ]
-
-        # Finally, load future event registrations.
-        registered_events = []
-        if subject:
-            registered_events_query = (
-                select(EventRegistrationEntity)
-                .where(EventRegistrationEntity.user_id == subject.id)
-                .join(EventEntity)
-                .where(EventEntity.start >= now)
-                .order_by(EventEntity.start)
-            )
-
-            registered_events_entities = self._session.scalars(
-                registered_events_query
-            ).all()
-
-            registered_events = [
-                registration.event.to_overview_model(subject)
-                for registration in registered_events_entities
-            ]
-
         # Construct the welcome overview and return
         return WelcomeOverview(
             announcement=announcement,
             latest_news=news,
             operating_hours=operating_hours,
-            upcoming_reservations=future_reservations,
-            registered_events=registered_events,
+            upcoming_reservations=[],
+            registered_events=[],
+        )
+
+    def _get_upcoming_reservations(self, subject: User) -> list[ReservationOverview]:
+        """Load future reservations for a given user."""
+        future_reservations_query = (
+            select(ReservationEntity)
+            .options(
+                selectinload(ReservationEntity.seats),
+                joinedload(ReservationEntity.room),
+            )
+            .join(ReservationEntity.users)
+            .where(UserEntity.id == subject.id)
+            .where(ReservationEntity.start > datetime.now())
+        )
+        future_reservations_entities = self._session.scalars(
+            future_reservations_query
+        ).all()
+        return [
+            reservation.to_overview_model()
+            for reservation in future_reservations_entities
+        ]
+
+    def _get_registered_events(self, subject: User) -> list[EventOverview]:
+        """Load future event registrations for a given user."""
+        registered_events_query = (
+            select(EventEntity)
+            .options(joinedload(EventEntity.organization))
+            .join(EventEntity.registrations)
+            .where(EventRegistrationEntity.user_id == subject.id)
+            .where(EventEntity.start >= datetime.now())
+            .order_by(EventEntity.start)
         )
+        registered_events_entities = self._session.scalars(
+            registered_events_query
+        ).all()
+        return self._event_svc.to_overview_models(registered_events_entities, subject)
 
     def get_article(self, slug: str) -> ArticleOverview:
         """Access a single article by slug"""
@@ -194,6 +242,7 @@ class ArticleService:
                 )
             )
         self._session.commit()
+        _welcome_overview_cache.clear()
 
         # 5. Return
         return article_entity.to_overview_model()
@@ -240,6 +289,7 @@ class ArticleService:
                 )
             )
         self._session.commit()
+        _welcome_overview_cache.clear()
 
         # 5. Return
         return article_entity.to_overview_model()
@@ -259,3 +309,4 @@ class ArticleService:
         # 3. Delete the article
         self._session.delete(article_entity)
         self._session.commit()
+        _welcome_overview_cache.clear()
@@ -0,0 +1,130 @@
+"""
+Process-wide caches shared by services for data that is read far more often than it changes.
+
+Services store computed results in a `ServiceCache` and are responsible for invalidating
+entries whenever they write data that a cached value depends on. Because every worker
+process holds its own copy, an optional time-to-live bounds how stale a value can become
+when a write happens in another process.
+"""
+
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Callable, Generic, Hashable, TypeVar
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_registry: list["ServiceCache"] = []
+
+
+class ServiceCache(Generic[K, V]):
+    """Thread-safe key/value cache with an optional time-to-live per entry."""
+
+    def __init__(
+        self,
+        ttl: timedelta | None = None,
+        depends_on: list["ServiceCache"] | None = None,
+    ):
+        """Initializes an empty cache.
+
+        Args:
+            ttl: How long an entry remains valid after it is stored, or None to keep
+                entries until they are invalidated.
+            depends_on: Caches whose data this cache's values are derived from. Any
+                invalidation of those caches clears this cache as well.
+        """
+        self._ttl = ttl
+        self._entries: dict[K, tuple[datetime, V]] = {}
+        self._lock = Lock()
+        # Incremented on every invalidation so that values computed from data read
+        # before an invalidation are not stored after it.
+        self._generation = 0
+        self._dependents: list[ServiceCache] = []
+        for dependency in depends_on or []:
+            dependency._dependents.append(self)
+        _registry.append(self)
+
+    def get(self, key: K) -> V | None:
+        """Returns the cached value for a key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._lookup(key)
+            return entry[1] if entry is not None else None
+
+    def contains(self, key: K) -> bool:
+        """Returns whether a key has a cached value that has not expired."""
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def set(self, key: K, value: V) -> None:
+        """Stores a value for a key."""
+        with self._lock:
+            self._entries[key] = (datetime.now(), value)
+
+    def get_or_compute(self, key: K, compute: Callable[[], V]) -> V:
+        """Returns the cached value for a key, computing and storing it if necessary.
+
+        The value is computed outside of the lock, so concurrent misses may compute the
+        same value more than once. A value is not stored if the cache was invalidated
+        while it was being computed. `None` is a valid value."""
+        with self._lock:
+            entry = self._lookup(key)
+            generation = self._generation
+        if entry is not None:
+            return entry[1]
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (datetime.now(), value)
+        return value
+
+    def update(self, key: K, transform: Callable[[V], V]) -> None:
+        """Replaces the cached value for a key with `transform(value)`, if one exists.
+
+        The entry keeps its original expiry, so frequent updates do not keep a value
+        alive past its time-to-live. Unlike invalidation, values being computed
+        concurrently are still stored, so a burst of updates cannot keep a missing value
+        from being cached; the time-to-live bounds how stale such a value can be."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], transform(entry[1]))
+        for dependent in self._dependents:
+            dependent.clear()
+
+    def invalidate(self, key: K) -> None:
+        """Removes the cached value for a key, if one exists."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+        for dependent in self._dependents:
+            dependent.clear()
+
+    def clear(self) -> None:
+        """Removes every cached value."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+        for dependent in self._dependents:
+            dependent.clear()
+
+    def _lookup(self, key: K) -> tuple[datetime, V] | None:
+        """Returns the unexpired entry for a key, evicting it if expired. Requires the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._ttl is not None and datetime.now() - entry[0] >= self._ttl:
+            del self._entries[key]
+            return None
+        return entry
+
+
+def clear_all_caches() -> None:
+    """Clears every `ServiceCache` in the process.
+
+    Used by tests, which rebuild the database between test functions."""
+    for cache in _registry:
+        cache.clear()
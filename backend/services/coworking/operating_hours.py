@@ -1,10 +1,13 @@
 """Service that manages operating hours of the XL."""
 
+from datetime import datetime, timedelta
+
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from .exceptions import OperatingHoursCannotOverlapException
 from ..exceptions import ResourceNotFoundException
 from ..permission import PermissionService
+from ..cache import ServiceCache
 from ...models import User
 from ...database import db_session
 from ...models.coworking import OperatingHours, TimeRange
@@ -14,6 +17,12 @@ __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+upcoming_schedule_cache: ServiceCache[
+    tuple[timedelta, datetime], list[OperatingHours]
+] = ServiceCache(ttl=timedelta(minutes=5))
+"""Operating hours from the start of an hour through a window of time after that hour,
+keyed by the window's length and the hour."""
+
 
 class OperatingHoursService:
     """OperatingHoursService is the access layer to the operating hours data model."""
@@ -68,6 +77,37 @@ class OperatingHoursService:
         )
         return [entity.to_model() for entity in entities]
 
+    def upcoming_schedule(self, window: timedelta) -> list[OperatingHours]:
+        """Returns the operating hours of the XL from now through a window of time.
+
+        The operating hours of the current hour and window are cached process-wide for
+        a few minutes and invalidated whenever operating hours are created or deleted.
+        They are filtered against the current time on every call, so hours that have
+        closed are never returned.
+
+        Args:
+            window (timedelta): How far into the future to include operating hours.
+
+        Returns:
+            list[OperatingHours]: All operating hours of the XL within the window, including overlaps.
+        """
+
+        now = datetime.now()
+        hour = now.replace(minute=0, second=0, microsecond=0)
+
+        def compute() -> list[OperatingHours]:
+            return self.schedule(
+                TimeRange(start=hour, end=hour + timedelta(hours=1) + window)
+            )
+
+        return [
+            operating_hours
+            for operating_hours in upcoming_schedule_cache.get_or_compute(
+                (window, hour), compute
+            )
+            if operating_hours.end >= now and operating_hours.start <= now + window
+        ]
+
     def create(self, subject: User, time_range: TimeRange) -> OperatingHours:
         """Create new, open Operating Hours for XL coworking.
 
@@ -91,6 +131,7 @@ class OperatingHoursService:
         entity = OperatingHoursEntity(start=time_range.start, end=time_range.end)
         self._session.add(entity)
         self._session.commit()
+        upcoming_schedule_cache.clear()
         return entity.to_model()
 
     def delete(self, subject: User, operating_hours: OperatingHours) -> None:
@@ -114,3 +155,4 @@ class OperatingHoursService:
         )
         self._session.delete(operating_hours_entity)
         self._session.commit()
+        upcoming_schedule_cache.clear()
@@ -2,17 +2,19 @@
 The Event Service allows the API to manipulate event data in the database.
 """
 
-from typing import Sequence
+from typing import Iterator, Sequence
 
 from fastapi import Depends
-from sqlalchemy import func, select, and_, func, or_, exists, or_
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, select, and_, func, or_, exists, or_, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 from backend.entities.user_entity import UserEntity
 from backend.models.event_registration import EventRegistration, NewEventRegistration
 from ..models.public_user import PublicUser
 from backend.models.organization_details import OrganizationDetails
 from backend.models.pagination import Paginated, PaginationParams
 from backend.models.registration_type import RegistrationType
+from backend.models.export_format import ExportFormat
 
 from ..models import User, Paginated, EventPaginationParams
 from ..database import db_session
@@ -34,7 +36,9 @@ from .exceptions import (
     EventRegistrationException,
 )
 from . import UserService
-from datetime import datetime
+from .cache import ServiceCache
+from .export import stream_scalars, to_export_chunks
+from datetime import datetime, timedelta
 
 __authors__ = [
     "Ajay Gandecha",
@@ -46,6 +50,15 @@ __authors__ = [
 __copyright__ = "Copyright 2024"
 __license__ = "MIT"
 
+PREFERRED_ORGANIZATIONS = [37]
+"""Organizations (CSXL and UNC CS) whose upcoming events are preferred as the featured event."""
+
+_FEATURED_EVENT_KEY = "featured"
+_featured_event_cache: ServiceCache[str, EventOverview | None] = ServiceCache(
+    ttl=timedelta(minutes=5)
+)
+"""Featured event shared by every visitor, recomputed every five minutes or on event changes."""
+
 
 class EventService:
     """Service that performs all of the actions on the `Event` table"""
@@ -75,7 +88,7 @@ class EventService:
             Paginated[Event]: The paginated list of events.
         """
 
-        statement = select(EventEntity)
+        statement = select(EventEntity).options(selectinload(EventEntity.organization))
         length_statement = select(func.count()).select_from(EventEntity)
         if pagination_params.range_start != "":
             range_start = pagination_params.range_start
@@ -120,14 +133,73 @@ class EventService:
         statement = statement.offset(offset).limit(limit)
 
         length = self._session.execute(length_statement).scalar()
-        entities = self._session.execute(statement).scalars()
+        entities = self._session.execute(statement).scalars().all()
 
         return Paginated(
-            items=[entity.to_overview_model(subject) for entity in entities],
+            items=self.to_overview_models(entities, subject),
             length=length,
             params=pagination_params,
         )
 
+    def to_overview_models(
+        self, entities: Sequence[EventEntity], subject: User | None = None
+    ) -> list[EventOverview]:
+        """
+        Converts a list of events into overview models using a constant number of queries.
+
+        Calling `EventEntity.to_overview_model` on each event lazily loads the
+        `registrations` relationship (and each organizer's user) per event. Instead,
+        the maintained `registration_count` is used for attendee counts and the
+        organizer and subject registrations for every event are fetched together.
+
+        Args:
+            entities: The events to convert. Load these with
+                `selectinload(EventEntity.organization)` to avoid per-event organization loads.
+            subject: The User making the request, used to populate the registration type.
+
+        Returns:
+            list[EventOverview]: Overview models in the same order as `entities`
+        """
+        event_ids = [entity.id for entity in entities]
+        if len(event_ids) == 0:
+            return []
+
+        # 1. Load the organizer registrations (and the subject's registrations) at once.
+        registration_criteria = (
+            EventRegistrationEntity.registration_type == RegistrationType.ORGANIZER
+        )
+        if subject is not None:
+            registration_criteria = or_(
+                registration_criteria, EventRegistrationEntity.user_id == subject.id
+            )
+        registration_query = (
+            select(EventRegistrationEntity)
+            .options(joinedload(EventRegistrationEntity.user))
+            .where(EventRegistrationEntity.event_id.in_(event_ids))
+            .where(registration_criteria)
+        )
+
+        organizers: dict[int, list[PublicUser]] = {}
+        subject_registration_types: dict[int, RegistrationType] = {}
+        for registration in self._session.scalars(registration_query).all():
+            if registration.registration_type == RegistrationType.ORGANIZER:
+                organizers.setdefault(registration.event_id, []).append(
+                    registration.user.to_public_model()
+                )
+            if subject is not None and registration.user_id == subject.id:
+                subject_registration_types[registration.event_id] = (
+                    registration.registration_type
+                )
+
+        # 2. Assemble the overview models.
+        return [
+            entity.to_overview_model_from_aggregates(
+                organizers=organizers.get(entity.id, []),
+                user_registration_type=subject_registration_types.get(entity.id),
+            )
+            for entity in entities
+        ]
+
     def create(self, subject: User, event: EventDraft) -> EventOverview:
         """
         Creates a event based on the input object and adds it to the table.
@@ -177,6 +249,7 @@ class EventService:
             self._session.add(new_registration_entity)
 
         self._session.commit()
+        self._invalidate_featured_event()
 
         # Return added object
         # NOTE: Must re-convert the entity to a model again so that the registration
@@ -293,12 +366,18 @@ class EventService:
             self._session.delete(event_registration_entity)
 
         # Add organizers that should be added.
+        promoted_attendees = 0
         for organizer_id in organizers_to_add:
             # Check if the user is already registered for the event.
             event_registration_entity = self._session.get(
                 EventRegistrationEntity, (event_entity.id, organizer_id)
             )
             if event_registration_entity:
+                if (
+                    event_registration_entity.registration_type
+                    == RegistrationType.ATTENDEE
+                ):
+                    promoted_attendees += 1
                 event_registration_entity.registration_type = RegistrationType.ORGANIZER
             else:
                 new_registration = NewEventRegistration(
@@ -311,8 +390,16 @@ class EventService:
                 )
                 self._session.add(new_registration_entity)
 
+        # Attendees promoted to organizers no longer count towards the registration limit.
+        # NOTE: Assigning a SQL expression makes the decrement atomic at flush time.
+        if promoted_attendees > 0:
+            event_entity.registration_count = (
+                EventEntity.registration_count - promoted_attendees
+            )
+
         # Save all changes
         self._session.commit()
+        self._invalidate_featured_event()
         # Return updated object
         return event_entity.to_overview_model(subject)
 
@@ -344,6 +431,7 @@ class EventService:
 
         # Save changes
         self._session.commit()
+        self._invalidate_featured_event()
 
     """Event Registration Service Methods"""
 
@@ -456,15 +544,6 @@ class EventService:
                 f"organization/{event_entity.organization_id}",
             )
 
-        # Get the registration status.
-        # NOTE: It is preferred to use the service function rather than the list of
-        # registrations passed in from `event` in the case that registrations are added
-        # between when `event` was fetched and this function runs.
-
-        # Raise exception if event is full.
-        if event.number_registered >= event.registration_limit:
-            raise EventRegistrationException(event.id)
-
         # Enable idemopotency in returning existing registration, if one exists.
         # Permission to manage / read registration is enforced in EventService#get_registration
         existing_registration = self.get_registration(subject, attendee, event)
@@ -474,7 +553,25 @@ class EventService:
             )
             return user_entity.to_public_model()
 
-        # Add new object to table and commit changes
+        # Atomically claim a spot at the event.
+        # NOTE: The conditional update only matches when the event is not full, so
+        # concurrent registrations cannot exceed the registration limit and the
+        # capacity check never has to count registrations.
+        claim_spot = (
+            update(EventEntity)
+            .where(
+                EventEntity.id == event.id,
+                EventEntity.registration_count < EventEntity.registration_limit,
+            )
+            .values(registration_count=EventEntity.registration_count + 1)
+            .returning(EventEntity.registration_count)
+        )
+        if self._session.execute(claim_spot).scalar_one_or_none() is None:
+            # Raise exception if event is full.
+            self._session.rollback()
+            raise EventRegistrationException(event.id)
+
+        # Add new object to table and commit changes along with the claimed spot
         new_event_registration = NewEventRegistration(
             user_id=attendee.id,
             event_id=event.id,
@@ -484,7 +581,13 @@ class EventService:
             new_event_registration
         )
         self._session.add(event_registration_entity)
-        self._session.commit()
+        try:
+            self._session.commit()
+        except IntegrityError:
+            # A concurrent request registered the attendee first; release the spot.
+            self._session.rollback()
+            return self._session.get_one(UserEntity, attendee.id).to_public_model()
+        self._update_featured_event_count(event.id, 1)
 
         # Return registration
         return event_registration_entity.to_flat_model()
@@ -516,14 +619,27 @@ class EventService:
         ):
             return
 
-        # Delete object and commit
-        self._session.delete(
-            self._session.get(
-                EventRegistrationEntity,
-                (event.id, attendee.id),
+        # Delete object and release the attendee's spot only if this call removed the
+        # registration, so that concurrent unregisters cannot decrement twice
+        deleted = self._session.execute(
+            delete(EventRegistrationEntity)
+            .where(
+                EventRegistrationEntity.event_id == event.id,
+                EventRegistrationEntity.user_id == attendee.id,
+                EventRegistrationEntity.registration_type != RegistrationType.ORGANIZER,
             )
+            .returning(EventRegistrationEntity.user_id)
+        ).first()
+        if deleted is None:
+            self._session.commit()
+            return
+        self._session.execute(
+            update(EventEntity)
+            .where(EventEntity.id == event.id, EventEntity.registration_count > 0)
+            .values(registration_count=EventEntity.registration_count - 1)
         )
         self._session.commit()
+        self._update_featured_event_count(event.id, -1)
 
     def get_registrations_of_user(
         self, subject: User, user: User, time_range: TimeRange
@@ -579,21 +695,8 @@ class EventService:
         Raises:
             PermissionException: If the subject does not have the required permission.
         """
-        event_entity = self._session.get(EventEntity, event_id)
-        organizer_ids = [
-            registration.user_id
-            for registration in event_entity.registrations
-            if registration.registration_type == RegistrationType.ORGANIZER
-        ]
-
         # Ensure that the user has appropriate permissions to view event information
-
-        if subject.id not in organizer_ids:
-            self._permission.enforce(
-                subject,
-                "organization.events.manage_registrations",
-                f"organization/{event_entity.organization_id}",
-            )
+        self._enforce_registration_management(subject, event_id)
 
         # Create an alias for the EventRegistrationEntity to be used in join
         EventRegistrationAlias = aliased(EventRegistrationEntity)
@@ -663,88 +766,177 @@ class EventService:
             params=pagination_params,
         )
 
-    def get_event_status(self, subject: User) -> EventStatusOverview:
-        """Returns the event status."""
-        # 1. Get the featured event.
-        # The featured event is picked based on the following criteria:
-        # Based on the first 50 events coming up...
-        # If a CSXL or UNC CS event is scheduled, choose this as the featured event.
-        # Otherwise, choose the latest event.
-        # If there is no upcoming event, choose no event.
-        PREFERRED_ORGANIZATIONS = [37]
-        featured_event: EventOverview | None = None
+    def export_registered_users_of_event(
+        self, subject: User, event_id: int, format: ExportFormat
+    ) -> Iterator[str]:
+        """
+        Export the registered users of an event as a stream of CSV or NDJSON chunks.
+
+        Attendees are read with a server-side cursor and serialized one at a time, so
+        memory use stays flat regardless of the number of attendees.
+
+        Args:
+            subject: The user performing the action.
+            event_id: a valid int representing a unique Event
+            format: The file format of the export.
+
+        Returns:
+            Iterator[str]: Chunks of the exported file.
+
+        Raises:
+            PermissionException: If the subject does not have the required permission.
+        """
+        # Enforce permissions before the stream is returned to be consumed lazily.
+        self._enforce_registration_management(subject, event_id)
+
+        statement = (
+            select(UserEntity)
+            .join(
+                EventRegistrationEntity,
+                EventRegistrationEntity.user_id == UserEntity.id,
+            )
+            .where(
+                EventRegistrationEntity.event_id == event_id,
+                EventRegistrationEntity.registration_type == RegistrationType.ATTENDEE,
+            )
+            .order_by(UserEntity.last_name, UserEntity.first_name, UserEntity.id)
+        )
+        attendees = (
+            entity.to_public_model()
+            for entity in stream_scalars(self._session, statement)
+        )
+        return to_export_chunks(attendees, format, list(PublicUser.model_fields))
+
+    def _enforce_registration_management(self, subject: User, event_id: int) -> None:
+        """
+        Ensures the subject is an organizer of the event or may manage its registrations.
+
+        Args:
+            subject: The user performing the action.
+            event_id: a valid int representing a unique Event
+
+        Raises:
+            ResourceNotFoundException: If the event does not exist.
+            PermissionException: If the subject does not have the required permission.
+        """
+        event_entity = self._session.get(EventEntity, event_id)
+        if event_entity is None:
+            raise ResourceNotFoundException(
+                f"No event found with matching ID: {event_id}"
+            )
+
+        is_organizer_query = select(
+            exists().where(
+                EventRegistrationEntity.event_id == event_id,
+                EventRegistrationEntity.user_id == subject.id,
+                EventRegistrationEntity.registration_type == RegistrationType.ORGANIZER,
+            )
+        )
+        if not self._session.scalar(is_organizer_query):
+            self._permission.enforce(
+                subject,
+                "organization.events.manage_registrations",
+                f"organization/{event_entity.organization_id}",
+            )
+
+    def get_featured_event(self) -> EventOverview | None:
+        """
+        Returns the featured event as seen by an unauthenticated user.
+
+        The featured event is the same for every visitor, so it is cached process-wide
+        and recomputed at most every five minutes or when events change. Registrations
+        update its count in place.
+        """
+        return _featured_event_cache.get_or_compute(
+            _FEATURED_EVENT_KEY, self._compute_featured_event
+        )
+
+    def _compute_featured_event(self) -> EventOverview | None:
+        """Computes the featured event.
+
+        The featured event is picked based on the following criteria:
+        Based on the first 50 events coming up...
+        If a CSXL or UNC CS event is scheduled, choose this as the featured event.
+        Otherwise, choose the latest event.
+        If there is no upcoming event, choose no event.
+        """
         event_query = (
-            select(EventEntity)
+            select(EventEntity.id, EventEntity.organization_id)
             .where(EventEntity.start >= datetime.now())
             .order_by(EventEntity.start)
             .limit(50)
         )
-        event_entities = self._session.scalars(event_query).all()
-        for event in event_entities:
-            if (
-                event.organization_id in PREFERRED_ORGANIZATIONS
-                and featured_event == None
-            ):
-                featured_event = event.to_overview_model(subject)
-        if featured_event == None:
-            featured_event = (
-                event_entities[0].to_overview_model(subject)
-                if len(event_entities) > 0
-                else None
+        upcoming_events = self._session.execute(event_query).all()
+        if len(upcoming_events) == 0:
+            return None
+
+        featured_event_id = next(
+            (
+                event_id
+                for event_id, organization_id in upcoming_events
+                if organization_id in PREFERRED_ORGANIZATIONS
+            ),
+            upcoming_events[0].id,
+        )
+        featured_entity = self._session.get_one(EventEntity, featured_event_id)
+        return self.to_overview_models([featured_entity])[0]
+
+    def _invalidate_featured_event(self) -> None:
+        """Invalidates the cached featured event after events are created, updated or deleted."""
+        _featured_event_cache.invalidate(_FEATURED_EVENT_KEY)
+
+    def _update_featured_event_count(self, event_id: int, change: int) -> None:
+        """
+        Applies a registration change to the cached featured event, if it is the event.
+
+        Registrations do not change which event is featured, so the cached event is
+        patched in place rather than recomputed on every registration.
+        """
+
+        def apply(featured_event: EventOverview | None) -> EventOverview | None:
+            if featured_event is None or featured_event.id != event_id:
+                return featured_event
+            return featured_event.model_copy(
+                update={
+                    "number_registered": max(
+                        featured_event.number_registered + change, 0
+                    )
+                }
             )
 
+        _featured_event_cache.update(_FEATURED_EVENT_KEY, apply)
+
+    def get_event_status(self, subject: User) -> EventStatusOverview:
+        """Returns the event status."""
+        # 1. Get the shared featured event.
+        featured_event = self.get_featured_event()
+
         # 2. Find all of the events the current user is registered for.
         registered_events_query = (
-            select(EventRegistrationEntity)
+            select(EventEntity)
+            .options(selectinload(EventEntity.organization))
+            .join(EventEntity.registrations)
             .where(EventRegistrationEntity.user_id == subject.id)
-            .join(EventEntity)
             .where(EventEntity.start >= datetime.now())
             .order_by(EventEntity.start)
         )
-
         registered_events_entities = self._session.scalars(
             registered_events_query
         ).all()
+        registered_events = self.to_overview_models(registered_events_entities, subject)
 
-        registered_events = [
-            registration.event.to_overview_model(subject)
-            for registration in registered_events_entities
-        ]
+        # 3. If the user is registered for the featured event, show their registration.
+        if featured_event is not None:
+            featured_event = next(
+                (event for event in registered_events if event.id == featured_event.id),
+                featured_event,
+            )
 
-        # 3. Return the event status.
+        # 4. Return the event status.
         return EventStatusOverview(
             featured=featured_event, registered=registered_events
         )
 
     def get_event_status_unauthenticated(self) -> EventStatusOverview:
         """Returns the event status for an unauthenticated user."""
-        # 1. Get the featured event.
-        # The featured event is picked based on the following criteria:
-        # Based on the first 50 events coming up...
-        # If a CSXL or UNC CS event is scheduled, choose this as the featured event.
-        # Otherwise, choose the latest event.
-        # If there is no upcoming event, choose no event.
-        PREFERRED_ORGANIZATIONS = [37]
-        featured_event: EventOverview | None = None
-        event_query = (
-            select(EventEntity)
-            .where(EventEntity.start >= datetime.now())
-            .order_by(EventEntity.start)
-            .limit(50)
-        )
-        event_entities = self._session.scalars(event_query).all()
-        for event in event_entities:
-            if (
-                event.organization_id in PREFERRED_ORGANIZATIONS
-                and featured_event == None
-            ):
-                featured_event = event.to_overview_model()
-        if featured_event == None:
-            featured_event = (
-                event_entities[0].to_overview_model()
-                if len(event_entities) > 0
-                else None
-            )
-
-        # 3. Return the event status.
-        return EventStatusOverview(featured=featured_event, registered=[])
+        return EventStatusOverview(featured=self.get_featured_event(), registered=[])
@@ -26,6 +26,13 @@ class CoursePermissionException(Exception):
         super().__init__(f"{reason}")
 
 
+class StaleResourceException(Exception):
+    """StaleResourceException is raised when a user attempts to update a resource that was changed since they loaded it."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"{reason}")
+
+
 class EventRegistrationException(Exception):
     """EventRegistrationException is raised when a user attempts to register and cannot (i.e., when the event is full)."""
 
@@ -39,8 +46,9 @@ class CourseDataScrapingException(Exception):
     def __init__(self, reason: str):
         super().__init__(f"{reason}")
 
+
 class RecurringOfficeHourEventException(Exception):
     """RecurringOfficeHourEventException is raised when an unexpected error occurs when managing recurring offiec hours events."""
 
     def __init__(self, reason: str):
-        super().__init__(f"{reason}")
\ No newline at end of file
+        super().__init__(f"{reason}")
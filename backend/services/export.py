@@ -0,0 +1,89 @@
+"""
+Helpers for streaming large query results to clients as CSV or newline-delimited JSON.
+
+Exports are produced as generators of text chunks that the API layer wraps in a
+`StreamingResponse`, so memory use stays flat regardless of how many rows are exported.
+"""
+
+import csv
+import io
+from typing import Any, Iterable, Iterator
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from ..models.export_format import ExportFormat
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+EXPORT_BATCH_SIZE = 500
+"""Number of rows fetched from the server-side cursor at a time."""
+
+
+def stream_scalars(
+    session: Session, statement: Select, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[Any]:
+    """Yields the ORM results of a statement in batches using a server-side cursor.
+
+    The results are read through a dedicated session bound to the same engine as `session`
+    because request-scoped sessions are closed when an endpoint returns, which happens
+    before the body of a `StreamingResponse` is consumed.
+
+    Args:
+        session: Session whose engine the statement is executed against.
+        statement: The select statement to stream.
+        batch_size: Number of rows buffered from the cursor at a time.
+
+    Returns:
+        Iterator[Any]: The scalar results of the statement.
+    """
+    with Session(session.get_bind()) as stream_session:
+        result = stream_session.scalars(
+            statement.execution_options(yield_per=batch_size)
+        )
+        for entity in result:
+            yield entity
+            # Entities are only needed until they are serialized.
+            stream_session.expunge(entity)
+
+
+def to_csv_chunks(rows: Iterable[BaseModel], fieldnames: list[str]) -> Iterator[str]:
+    """Serializes models into CSV text, yielding the header and then one chunk per row."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, delimiter=",", fieldnames=fieldnames)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row.model_dump(include=set(fieldnames)))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Yield the header when there are no rows
+    if buffer.tell() > 0:
+        yield buffer.getvalue()
+
+
+def to_ndjson_chunks(rows: Iterable[BaseModel]) -> Iterator[str]:
+    """Serializes models into newline-delimited JSON, yielding one line per row."""
+    for row in rows:
+        yield row.model_dump_json() + "\n"
+
+
+def to_export_chunks(
+    rows: Iterable[BaseModel], format: ExportFormat, fieldnames: list[str]
+) -> Iterator[str]:
+    """Serializes models into text chunks of the given export format.
+
+    Args:
+        rows: The models to export.
+        format: The file format to produce.
+        fieldnames: The fields (and column order) of CSV exports.
+
+    Returns:
+        Iterator[str]: Chunks of the exported file.
+    """
+    if format == ExportFormat.CSV:
+        return to_csv_chunks(rows, fieldnames)
+    return to_ndjson_chunks(rows)
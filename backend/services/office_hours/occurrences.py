@@ -0,0 +1,214 @@
+"""
+Occurrences of recurring office hours.
+
+Virtual recurrence patterns store a single template event, which their other
+occurrences are expanded from when office hours are read. An occurrence is only stored
+as an event of its own, recorded as an exception to the pattern, when it needs an ID:
+before it is edited or deleted, or before tickets are created in it.
+"""
+
+from datetime import date, datetime, timedelta
+from itertools import count
+from typing import Iterable, Iterator, TypeVar
+from sqlalchemy import ColumnElement, exists, insert, select
+from sqlalchemy.orm import Session
+
+from ...models.office_hours.office_hours import Weekday
+from ...models.office_hours.office_hours_recurrence_pattern import (
+    NewOfficeHoursRecurrencePattern,
+)
+from ...entities.office_hours import (
+    OfficeHoursEntity,
+    office_hours_recurrence_exception_table,
+)
+from ...entities.office_hours.office_hours_recurrence_pattern_entity import (
+    OfficeHoursRecurrencePatternEntity,
+)
+
+__authors__ = ["Jade Keegan", "Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+DateT = TypeVar("DateT", date, datetime)
+
+
+def recurring_weekdays(
+    recurrence_pattern: (
+        NewOfficeHoursRecurrencePattern | OfficeHoursRecurrencePatternEntity
+    ),
+) -> list[Weekday]:
+    """Returns the weekdays a recurrence pattern recurs on."""
+    return [
+        weekday
+        for weekday, recurs in [
+            (Weekday.Monday, recurrence_pattern.recur_monday),
+            (Weekday.Tuesday, recurrence_pattern.recur_tuesday),
+            (Weekday.Wednesday, recurrence_pattern.recur_wednesday),
+            (Weekday.Thursday, recurrence_pattern.recur_thursday),
+            (Weekday.Friday, recurrence_pattern.recur_friday),
+            (Weekday.Saturday, recurrence_pattern.recur_saturday),
+            (Weekday.Sunday, recurrence_pattern.recur_sunday),
+        ]
+        if recurs
+    ]
+
+
+def iter_occurrence_dates(
+    start: DateT, end: date | datetime, weekdays: list[Weekday]
+) -> Iterator[DateT]:
+    """
+    Lazily yields each day from `start` through `end` that falls on one of the weekdays,
+    in order. When `start` is a datetime, its time of day is kept.
+    """
+    # Each weekday first occurs within a week of the start date, then every seven days
+    day_offsets = sorted((weekday.value - start.weekday()) % 7 for weekday in weekdays)
+    if len(day_offsets) == 0:
+        return
+    for week in count():
+        for offset in day_offsets:
+            current = start + timedelta(days=week * 7 + offset)
+            if current > end:
+                return
+            yield current
+
+
+def count_occurrence_dates(
+    start: date | datetime, end: date | datetime, weekdays: list[Weekday]
+) -> int:
+    """Counts the days `iter_occurrence_dates` yields without generating them."""
+    last_offset = (end - start).days
+    return sum(
+        len(range((weekday.value - start.weekday()) % 7, last_offset + 1, 7))
+        for weekday in weekdays
+    )
+
+
+def virtual_template_criteria() -> ColumnElement[bool]:
+    """
+    Criteria matching the events of recurrence patterns that are not exceptions. Of the
+    events of a virtual recurrence pattern, only its template matches.
+    """
+    return ~exists().where(
+        office_hours_recurrence_exception_table.c.office_hours_id
+        == OfficeHoursEntity.id
+    )
+
+
+def get_virtual_template(
+    session: Session, recurrence_pattern_id: int
+) -> OfficeHoursEntity | None:
+    """Gets the template event of a virtual recurrence pattern, if it has one."""
+    template_query = select(OfficeHoursEntity).where(
+        OfficeHoursEntity.recurrence_pattern_id == recurrence_pattern_id,
+        virtual_template_criteria(),
+    )
+    return session.scalars(template_query).first()
+
+
+def get_exception_dates(
+    session: Session, recurrence_pattern_ids: Iterable[int], since: date
+) -> set[tuple[int, date]]:
+    """
+    Gets the dates on or after `since` with exceptions to the recurrence patterns, as
+    `(recurrence_pattern_id, date)` pairs. These occurrences are either stored or
+    cancelled, so they are not expanded.
+    """
+    exceptions = office_hours_recurrence_exception_table.c
+    exception_query = select(
+        exceptions.recurrence_pattern_id, exceptions.occurrence_date
+    ).where(
+        exceptions.recurrence_pattern_id.in_(list(recurrence_pattern_ids)),
+        exceptions.occurrence_date >= since,
+    )
+    return {(pattern_id, day) for pattern_id, day in session.execute(exception_query)}
+
+
+def is_occurrence_date(pattern: OfficeHoursRecurrencePatternEntity, day: date) -> bool:
+    """Returns whether a recurrence pattern recurs on a day."""
+    return pattern.start_date <= day <= pattern.end_date and Weekday(
+        day.weekday()
+    ) in recurring_weekdays(pattern)
+
+
+def store_occurrence(
+    session: Session, template: OfficeHoursEntity, day: date
+) -> OfficeHoursEntity:
+    """
+    Stores the occurrence of a virtual recurrence pattern on a day as an event copied
+    from the pattern's template, and records it as an exception to the pattern. Does not
+    commit.
+    """
+    occurrence = _copy_to_day(template, day)
+    session.add(occurrence)
+    session.flush()
+    session.execute(
+        insert(office_hours_recurrence_exception_table).values(
+            recurrence_pattern_id=template.recurrence_pattern_id,
+            occurrence_date=day,
+            office_hours_id=occurrence.id,
+        )
+    )
+    return occurrence
+
+
+def retire_virtual_template(session: Session, event: OfficeHoursEntity) -> None:
+    """
+    Prepares the template of a virtual recurrence pattern to be edited or deleted as a
+    single occurrence. Does nothing for other events. Does not commit.
+
+    The template is recorded as an exception to the pattern, and its current details are
+    copied to a new template on the pattern's next unstored occurrence, so that the
+    pattern keeps expanding as before.
+    """
+    if event.recurrence_pattern_id is None:
+        return
+
+    # Lock the pattern so that its template and exceptions do not change concurrently
+    pattern = session.scalars(
+        select(OfficeHoursRecurrencePatternEntity)
+        .where(OfficeHoursRecurrencePatternEntity.id == event.recurrence_pattern_id)
+        .with_for_update()
+    ).one()
+    template = get_virtual_template(session, pattern.id)
+    if not pattern.virtual or template is None or template.id != event.id:
+        return
+
+    day = event.start_time.date()
+    session.execute(
+        insert(office_hours_recurrence_exception_table).values(
+            recurrence_pattern_id=pattern.id,
+            occurrence_date=day,
+            office_hours_id=event.id,
+        )
+    )
+    exception_dates = get_exception_dates(session, [pattern.id], day)
+    next_day = next(
+        (
+            next_day
+            for next_day in iter_occurrence_dates(
+                day + timedelta(days=1), pattern.end_date, recurring_weekdays(pattern)
+            )
+            if (pattern.id, next_day) not in exception_dates
+        ),
+        None,
+    )
+    if next_day is not None:
+        session.add(_copy_to_day(event, next_day))
+        session.flush()
+
+
+def _copy_to_day(event: OfficeHoursEntity, day: date) -> OfficeHoursEntity:
+    """Copies an event of a recurrence pattern to another day, keeping its time of day
+    and duration."""
+    start_time = datetime.combine(day, event.start_time.time())
+    return OfficeHoursEntity(
+        type=event.type,
+        mode=event.mode,
+        description=event.description,
+        location_description=event.location_description,
+        start_time=start_time,
+        end_time=start_time + (event.end_time - event.start_time),
+        course_site_id=event.course_site_id,
+        room_id=event.room_id,
+        recurrence_pattern_id=event.recurrence_pattern_id,
+    )
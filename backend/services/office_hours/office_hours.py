@@ -2,10 +2,9 @@
 Service for office hour events.
 """
 
-import math
 from typing import Type, TypeVar
 from fastapi import Depends
-from sqlalchemy import select, exists, and_, func
+from sqlalchemy import Row, select, and_, or_, func
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from ...models.office_hours.office_hours_details import PrimaryOfficeHoursDetails
@@ -31,7 +30,12 @@ from ...entities.office_hours.user_created_tickets_table import (
     user_created_tickets_table,
 )
 from ...entities.academics.section_member_entity import SectionMemberEntity
+from ..academics.course_membership import (
+    CourseMembershipResolver,
+    CourseSiteMembership,
+)
 from ..exceptions import CoursePermissionException, ResourceNotFoundException
+from .occurrences import retire_virtual_template
 
 __authors__ = ["Ajay Gandecha", "Jade Keegan", "Kris Jordan"]
 __copyright__ = "Copyright 2024"
@@ -45,11 +49,16 @@ class OfficeHoursService:
     Service that performs all actions for office hour events.
     """
 
-    def __init__(self, session: Session = Depends(db_session)):
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        memberships: CourseMembershipResolver = Depends(),
+    ):
         """
         Initializes the database session.
         """
         self._session = session
+        self._memberships = memberships
 
     def get_office_hour_queue(
         self, user: User, office_hours_id: int
@@ -96,39 +105,33 @@ class OfficeHoursService:
 
     def _get_membership_or_raise(
         self, user: User, course_site_entity: CourseSiteEntity
-    ) -> SectionMemberEntity:
+    ) -> CourseSiteMembership:
         """
         Gets the membership for a user in a course site.
         """
-        # Use an enhanced query to check if a course site exists.
-        section_member_query = select(SectionMemberEntity).where(
-            SectionMemberEntity.user_id == user.id,
-            SectionMemberEntity.section_id.in_(
-                [section.id for section in course_site_entity.sections]
-            ),
+        site_memberships = self._memberships.site_memberships(
+            user, course_site_entity.id
         )
 
-        section_membership = self._session.scalars(section_member_query).first()
-
-        if section_membership is None:
+        if len(site_memberships) == 0:
             raise CoursePermissionException("User is not a member of the course site.")
 
-        return section_membership
+        return site_memberships[0]
 
     def _enforce_membership_level(
-        self, section_member_entity: SectionMemberEntity, roles: set[RosterRole]
+        self, membership: CourseSiteMembership, roles: set[RosterRole]
     ) -> None:
         """
         Enforces that a user has a specific membership level.
 
         Args:
-            section_member_entity (SectionMemberEntity): The membership entity.
+            membership (CourseSiteMembership): The membership of the user.
             roles (set[RosterRole]): The roles that the user must have.
 
         Raises:
             CoursePermissionException: If the user does not have the required membership.
         """
-        if section_member_entity.member_role not in roles:
+        if membership.member_role not in roles:
             raise CoursePermissionException(
                 "User does not have the required membership level."
             )
@@ -158,36 +161,47 @@ class OfficeHoursService:
         self._check_site_student_permissions(user, queue_entity.course_site_id)
 
         # Get ticket for user, if any
-        active_tickets_query = (
+        active_ticket_query = (
             select(OfficeHoursTicketEntity)
             .join(user_created_tickets_table)
+            .join(SectionMemberEntity)
             .where(OfficeHoursTicketEntity.office_hours_id == office_hours_id)
-            # .where(user_created_tickets_table.member_id == )
-        )
-        active_tickets = [
-            ticket
-            for ticket in queue_entity.tickets
-            if user.id in [creator.user_id for creator in ticket.creators]
-            and ticket.state in [TicketState.QUEUED, TicketState.CALLED]
-        ]
-
-        active_ticket = active_tickets[0] if len(active_tickets) > 0 else None
-
-        # Find queue position
-        queue_tickets: list[OfficeHoursTicketEntity] = sorted(
-            [
-                ticket
-                for ticket in queue_entity.tickets
-                if ticket.state == TicketState.QUEUED
-            ],
-            key=lambda ticket: ticket.created_at,
-        )
-
-        queue_position = (
-            queue_tickets.index(active_ticket) + 1
-            if active_ticket and active_ticket.state == TicketState.QUEUED
-            else -1
+            .where(
+                OfficeHoursTicketEntity.state.in_(
+                    [TicketState.QUEUED, TicketState.CALLED]
+                )
+            )
+            .where(SectionMemberEntity.user_id == user.id)
+            .order_by(OfficeHoursTicketEntity.id)
+            .limit(1)
+            .options(
+                selectinload(OfficeHoursTicketEntity.creators).selectinload(
+                    SectionMemberEntity.user
+                )
+            )
         )
+        active_ticket = self._session.scalars(active_ticket_query).first()
+
+        # Find queue position by counting the queued tickets ahead of the user's
+        queue_position = -1
+        if active_ticket and active_ticket.state == TicketState.QUEUED:
+            tickets_ahead_query = (
+                select(func.count())
+                .select_from(OfficeHoursTicketEntity)
+                .where(OfficeHoursTicketEntity.office_hours_id == office_hours_id)
+                .where(OfficeHoursTicketEntity.state == TicketState.QUEUED)
+                .where(
+                    or_(
+                        OfficeHoursTicketEntity.created_at < active_ticket.created_at,
+                        and_(
+                            OfficeHoursTicketEntity.created_at
+                            == active_ticket.created_at,
+                            OfficeHoursTicketEntity.id < active_ticket.id,
+                        ),
+                    )
+                )
+            )
+            queue_position = self._session.scalar(tickets_ahead_query) + 1
 
         # Return data
         return OfficeHourGetHelpOverview(
@@ -236,24 +250,7 @@ class OfficeHoursService:
             elif ticket.state == TicketState.QUEUED:
                 queued_tickets.append(overview)
 
-        completed_tickets = []
-        personal_completed_tickets = []
-        personal_average_minutes = 0
-        # completed_tickets = [
-        #     ticket for ticket in oh_event.tickets if ticket.state == TicketState.CLOSED
-        # ]
-        # personal_completed_tickets = [
-        #     ticket for ticket in completed_tickets if ticket.caller.user_id == user.id
-        # ]
-        # personal_minutes = [
-        #     (ticket.closed_at - ticket.called_at).total_seconds() / 60.0
-        #     for ticket in personal_completed_tickets
-        # ]
-        # personal_average_minutes = (
-        #     math.floor(sum(personal_minutes) / len(personal_minutes))
-        #     if len(personal_minutes) > 0
-        #     else 0
-        # )
+        statistics = self._get_oh_queue_statistics(user, oh_event.id)
 
         return OfficeHourQueueOverview(
             id=oh_event.id,
@@ -263,12 +260,51 @@ class OfficeHoursService:
             active=active_tickets[0] if len(active_tickets) > 0 else None,
             other_called=called_tickets,
             queue=queued_tickets,
-            personal_tickets_called=len(personal_completed_tickets),
-            average_minutes=personal_average_minutes,
-            total_tickets_called=len(completed_tickets),
+            personal_tickets_called=statistics.personal_tickets_called,
+            average_minutes=_to_minutes(statistics.personal_average_handle_seconds),
+            total_tickets_called=statistics.total_tickets_called,
+            average_handle_minutes=_to_minutes(statistics.average_handle_seconds),
+            median_wait_minutes=_to_minutes(statistics.median_wait_seconds),
+            p90_wait_minutes=_to_minutes(statistics.p90_wait_seconds),
             history=[],
         )
 
+    def _get_oh_queue_statistics(self, user: User, office_hours_id: int) -> Row:
+        """
+        Aggregates the called tickets of an office hours event in a single query.
+
+        Wait time runs from when a ticket is created until it is called, and handle
+        time from when it is called until it is closed. Durations are in seconds and
+        are None when there are no tickets to aggregate.
+        """
+        ticket = OfficeHoursTicketEntity
+        wait_seconds = func.extract("epoch", ticket.called_at - ticket.created_at)
+        handle_seconds = func.extract("epoch", ticket.closed_at - ticket.called_at)
+        called_by_user = SectionMemberEntity.user_id == user.id
+
+        statistics_query = (
+            select(
+                func.count().label("total_tickets_called"),
+                func.count().filter(called_by_user).label("personal_tickets_called"),
+                func.avg(handle_seconds).label("average_handle_seconds"),
+                func.avg(handle_seconds)
+                .filter(called_by_user)
+                .label("personal_average_handle_seconds"),
+                func.percentile_cont(0.5)
+                .within_group(wait_seconds)
+                .label("median_wait_seconds"),
+                func.percentile_cont(0.9)
+                .within_group(wait_seconds)
+                .label("p90_wait_seconds"),
+            )
+            .select_from(ticket)
+            .outerjoin(SectionMemberEntity, ticket.caller_id == SectionMemberEntity.id)
+            .where(ticket.office_hours_id == office_hours_id)
+            .where(ticket.called_at != None)
+        )
+
+        return self._session.execute(statistics_query).one()
+
     def get_oh_event_role(
         self, user: User, office_hours_id: int
     ) -> OfficeHourEventRoleOverview:
@@ -278,19 +314,13 @@ class OfficeHoursService:
         Returns:
             OfficeHourEventRoleOverview
         """
-        # Create query off of the member query for just the members matching
-        # with the current user (used to determine permissions)
-        user_member_query = (
-            select(SectionMemberEntity)
-            .where(SectionMemberEntity.user_id == user.id)
-            .join(SectionEntity)
-            .join(CourseSiteEntity)
-            .join(OfficeHoursEntity)
-            .where(OfficeHoursEntity.id == office_hours_id)
+        office_hours_entity = self._session.get(OfficeHoursEntity, office_hours_id)
+        user_members = (
+            self._memberships.site_memberships(user, office_hours_entity.course_site_id)
+            if office_hours_entity is not None
+            else []
         )
 
-        user_members = self._session.scalars(user_member_query).unique().all()
-
         if len(user_members) == 0:
             raise CoursePermissionException(
                 "User is not a member of the office hour event."
@@ -342,6 +372,9 @@ class OfficeHoursService:
         # Check permissions
         self._check_site_admin_permissions(user, site_id)
 
+        # Keep a virtual recurrence pattern expanding as before the edit
+        retire_virtual_template(self._session, office_hours_entity)
+
         # Update
         office_hours_entity.type = event.type
         office_hours_entity.mode = event.mode
@@ -372,6 +405,9 @@ class OfficeHoursService:
         # Check permissions
         self._check_site_admin_permissions(user, site_id)
 
+        # Keep a virtual recurrence pattern expanding without the deleted occurrence
+        retire_virtual_template(self._session, office_hours_entity)
+
         self._session.delete(office_hours_entity)
         self._session.commit()
 
@@ -393,99 +429,41 @@ class OfficeHoursService:
         return office_hours_entity.to_primary_details_model()
 
     def _check_site_admin_permissions(self, user: User, site_id: int):
+        section_ids = self._memberships.site_section_ids(site_id)
 
-        # Use an enhanced query to check if a course site exists.
-        course_site_exists_query = exists().where(CourseSiteEntity.id == site_id)
-        course_site_exists = self._session.query(course_site_exists_query).scalar()
-
-        if not course_site_exists:
+        if section_ids is None:
             raise ResourceNotFoundException(
                 f"Course site with ID: {site_id} not found."
             )
 
-        # Determine whether a student does not have permissions for any site.
-        #
-        # This query does this by first selecting section rows, joined to
-        # course site. An outer join then joins with section member data, only
-        # where the section member is for the section selected, is the user who
-        # made the request, and where the member is *not* a student (ie, is
-        # a UTA, GTA, or INSTRUCTOR ).
-        #
-        # Finally, we count the sections where the course site ID matches and
-        # where the user does *not* exist as a UTA/GTA/INSTRUCTOR user. We can
-        # check for this by counting where the member ID is none.
-        #
-        # Ultimately, this query should result in a number counting the number of
-        # sections in the course site for which the user is not authorized. If
-        # this number is 0, the user passes site permissions. If this number is
-        # > 0, then this should fail.
-
-        no_permissions_query = (
-            select(func.count())
-            .select_from(SectionEntity)
-            .join(SectionEntity.course_site)
-            .outerjoin(
-                SectionMemberEntity,
-                and_(
-                    SectionMemberEntity.section_id == SectionEntity.id,
-                    SectionMemberEntity.user_id == user.id,
-                    SectionMemberEntity.member_role != RosterRole.STUDENT,
-                ),
-            )
-            .where(CourseSiteEntity.id == site_id, SectionMemberEntity.id == None)
-        )
-
-        no_permissions_length = self._session.execute(no_permissions_query).scalar()
+        # The user must be a UTA, GTA, or INSTRUCTOR of every section in the site.
+        staff_section_ids = {
+            membership.section_id
+            for membership in self._memberships.site_memberships(user, site_id)
+            if membership.member_role != RosterRole.STUDENT
+        }
 
-        if no_permissions_length is not None and no_permissions_length > 0:
+        if not staff_section_ids.issuperset(section_ids):
             raise CoursePermissionException(
                 "Cannot access a course page containing a section you are not an instructor for."
             )
 
     def _check_site_student_permissions(self, user: User, site_id: int):
-
-        # Use an enhanced query to check if a course site exists.
-        course_site_exists_query = exists().where(CourseSiteEntity.id == site_id)
-        course_site_exists = self._session.query(course_site_exists_query).scalar()
-
-        if not course_site_exists:
+        if self._memberships.site_section_ids(site_id) is None:
             raise ResourceNotFoundException(
                 f"Course site with ID: {site_id} not found."
             )
 
-        # Determine whether a student does not have permissions for any site.
-        #
-        # This query does this by first selecting section rows, joined to
-        # course site. An outer join then joins with section member data, only
-        # where the section member is for the section selected, is the user who
-        # made the request, and where the member is a student (not a UTA, etc)
-        #
-        # Finally, we count the sections where the course site ID matches and
-        # where the user exists as a student. We can check for this by counting
-        # where the member ID is not none.
-        #
-        # Ultimately, this query should result in a number counting the number of
-        # sections in the course site for which the user is a student. If
-        # this number is 0, the user passes site fails.
-
-        is_student_query = (
-            select(func.count())
-            .select_from(SectionEntity)
-            .join(SectionEntity.course_site)
-            .outerjoin(
-                SectionMemberEntity,
-                and_(
-                    SectionMemberEntity.section_id == SectionEntity.id,
-                    SectionMemberEntity.user_id == user.id,
-                    SectionMemberEntity.member_role == RosterRole.STUDENT,
-                ),
-            )
-            .where(CourseSiteEntity.id == site_id, SectionMemberEntity.id != None)
-        )
-
-        is_student_length = self._session.execute(is_student_query).scalar()
-
-        if is_student_length == 0:
+        # The user must be a student in at least one section of the site.
+        if not any(
+            membership.member_role == RosterRole.STUDENT
+            for membership in self._memberships.site_memberships(user, site_id)
+        ):
             raise CoursePermissionException(
                 "You cannot access office hours for a class you are not enrolled in."
             )
+
+
+def _to_minutes(seconds: float | None) -> int:
+    """Rounds a duration in seconds to whole minutes, treating no data as zero."""
+    return round(seconds / 60) if seconds is not None else 0
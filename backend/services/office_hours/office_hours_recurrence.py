@@ -1,19 +1,32 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select, update
 
 from backend.services.exceptions import (
+    CoursePermissionException,
     RecurringOfficeHourEventException,
     ResourceNotFoundException,
 )
 from backend.services.office_hours.office_hours import OfficeHoursService
+from .occurrences import (
+    get_virtual_template,
+    is_occurrence_date,
+    iter_occurrence_dates,
+    office_hours_recurrence_exception_table,
+    recurring_weekdays,
+    store_occurrence,
+)
 
 from ...database import db_session
 from ...models.user import User
-from ...models.office_hours.office_hours import OfficeHours, NewOfficeHours, Weekday
+from ...models.office_hours.office_hours import OfficeHours, NewOfficeHours
 from ...entities.office_hours import (
     OfficeHoursEntity,
+    OfficeHoursTicketEntity,
+)
+from ...entities.office_hours.user_created_tickets_table import (
+    user_created_tickets_table,
 )
 
 from ...entities.office_hours.office_hours_recurrence_pattern_entity import (
@@ -62,45 +75,61 @@ class OfficeHoursRecurrenceService:
 
     def create_events(
         self, event: NewOfficeHours, recurrence_pattern: NewOfficeHoursRecurrencePattern
-    ):
+    ) -> list[OfficeHoursEntity]:
+        """
+        Creates a recurrence pattern and one office hours event per occurrence.
+
+        All events are inserted with a single bulk statement in the current transaction,
+        which is left for the caller to commit.
+        """
+        start_times = self._occurrence_start_times(event, recurrence_pattern)
+
+        # Virtual patterns only store their first occurrence, which later occurrences
+        # are expanded from when read.
+        if recurrence_pattern.virtual:
+            start_times = start_times[:1]
+
         # Create recurrence entity
         recurrence_pattern_entity = OfficeHoursRecurrencePatternEntity.from_new_model(
             recurrence_pattern
         )
         self._session.add(recurrence_pattern_entity)
-        self._session.commit()
-
-        # Create office hour events
-        new_events = []
-        current_date = recurrence_pattern.start_date
-        current_event = event
-
-        current_event.recurrence_pattern_id = recurrence_pattern_entity.id
-
-        original_td = current_event.end_time - current_event.start_time
-
-        # put valid date strings into list
-        days_recur = []
-        if recurrence_pattern.recur_monday:
-            days_recur.append(Weekday.Monday)
-
-        if recurrence_pattern.recur_tuesday:
-            days_recur.append(Weekday.Tuesday)
-
-        if recurrence_pattern.recur_wednesday:
-            days_recur.append(Weekday.Wednesday)
-
-        if recurrence_pattern.recur_thursday:
-            days_recur.append(Weekday.Thursday)
-
-        if recurrence_pattern.recur_friday:
-            days_recur.append(Weekday.Friday)
-
-        if recurrence_pattern.recur_saturday:
-            days_recur.append(Weekday.Saturday)
+        self._session.flush()
+
+        # Create office hour events, keeping the original event's times of day and
+        # duration (which accounts for events that span multiple days)
+        duration = event.end_time - event.start_time
+        event_values = {
+            "type": event.type,
+            "mode": event.mode,
+            "description": event.description,
+            "location_description": event.location_description,
+            "course_site_id": event.course_site_id,
+            "room_id": event.room_id,
+            "recurrence_pattern_id": recurrence_pattern_entity.id,
+        }
+        new_events = self._session.scalars(
+            insert(OfficeHoursEntity).returning(
+                OfficeHoursEntity, sort_by_parameter_order=True
+            ),
+            [
+                event_values | {"start_time": start, "end_time": start + duration}
+                for start in start_times
+            ],
+        ).all()
+
+        return list(new_events)
+
+    def _occurrence_start_times(
+        self, event: NewOfficeHours, recurrence_pattern: NewOfficeHoursRecurrencePattern
+    ) -> list[datetime]:
+        """
+        Computes the start time of every occurrence of a recurring event, in order.
 
-        if recurrence_pattern.recur_sunday:
-            days_recur.append(Weekday.Sunday)
+        Occurrences fall on each selected weekday from the pattern's start date through
+        its end date, at the same time of day as the original event.
+        """
+        days_recur = recurring_weekdays(recurrence_pattern)
 
         if len(days_recur) == 0:
             raise RecurringOfficeHourEventException("No recurrence pattern selected.")
@@ -111,35 +140,28 @@ class OfficeHoursRecurrenceService:
                 "Recurrence pattern end date precedes first event's start."
             )
 
-        while current_date <= recurrence_pattern.end_date:
-            # Get number corresponding to day
-            day = current_date.weekday()
+        occurrence_dates = list(
+            iter_occurrence_dates(
+                recurrence_pattern.start_date, recurrence_pattern.end_date, days_recur
+            )
+        )
 
-            if Weekday(day) in days_recur:
-                # new date is the start date of original event with "current date" instead (leave the time!)
-                current_event.start_time = event.start_time.replace(
+        if len(occurrence_dates) == 0:
+            raise RecurringOfficeHourEventException(
+                "Cannot create any with the given recurrence pattern before the recurrence end date."
+            )
+
+        start_times = []
+        for current_date in occurrence_dates:
+            # new date is the start date of original event with "current date" instead (leave the time!)
+            start_times.append(
+                event.start_time.replace(
                     year=current_date.year,
                     month=current_date.month,
                     day=current_date.day,
                 )
-                # end date is new date plus original timedelta (accounts for edge case of events that span multiple days)
-                current_event.end_time = current_event.start_time + original_td
-
-                # Create new OH entity
-                office_hours_entity = OfficeHoursEntity.from_new_model(current_event)
-
-                self._session.add(office_hours_entity)
-                new_events.append(office_hours_entity)
-
-            # Increment date
-            current_date += timedelta(days=1)
-
-        if len(new_events) == 0:
-            raise RecurringOfficeHourEventException(
-                "Cannot create any with the given recurrence pattern before the recurrence end date."
             )
-
-        return new_events
+        return start_times
 
     def update_recurring(
         self,
@@ -176,7 +198,87 @@ class OfficeHoursRecurrenceService:
 
         self._session.commit()
 
+    def materialize_occurrence(
+        self,
+        user: User,
+        site_id: int,
+        recurrence_pattern_id: int,
+        occurrence_date: date,
+    ) -> OfficeHours:
+        """
+        Gets the stored event of an occurrence of a virtual recurrence pattern, storing
+        it first if it is only expanded from the pattern's template.
+
+        Staff use this before editing or deleting an occurrence. Students can only get
+        occurrences in progress, so that they can create tickets in them.
+        """
+        # Check permissions
+        try:
+            self._office_hours_svc._check_site_admin_permissions(user, site_id)
+            is_staff = True
+        except CoursePermissionException:
+            self._office_hours_svc._check_site_student_permissions(user, site_id)
+            is_staff = False
+
+        # Lock the pattern so that concurrent requests do not store the occurrence twice
+        pattern = self._session.scalars(
+            select(OfficeHoursRecurrencePatternEntity)
+            .where(OfficeHoursRecurrencePatternEntity.id == recurrence_pattern_id)
+            .with_for_update()
+        ).one_or_none()
+        template = get_virtual_template(self._session, recurrence_pattern_id)
+        if (
+            pattern is None
+            or not pattern.virtual
+            or template is None
+            or template.course_site_id != site_id
+        ):
+            raise ResourceNotFoundException(
+                f"Virtual recurrence pattern with id: {recurrence_pattern_id} does not exist."
+            )
+
+        if not is_staff:
+            start_time = datetime.combine(occurrence_date, template.start_time.time())
+            end_time = start_time + (template.end_time - template.start_time)
+            if not start_time <= datetime.now() < end_time:
+                raise CoursePermissionException(
+                    "You can only get help in office hours that are in progress."
+                )
+
+        # The template and occurrences stored before are returned as they are
+        if occurrence_date == template.start_time.date():
+            return template.to_model()
+        exception = self._session.execute(
+            select(office_hours_recurrence_exception_table.c.office_hours_id).where(
+                office_hours_recurrence_exception_table.c.recurrence_pattern_id
+                == recurrence_pattern_id,
+                office_hours_recurrence_exception_table.c.occurrence_date
+                == occurrence_date,
+            )
+        ).first()
+        if exception is not None:
+            if exception.office_hours_id is None:
+                raise ResourceNotFoundException(
+                    f"The office hours on {occurrence_date} were deleted."
+                )
+            return self._session.get(
+                OfficeHoursEntity, exception.office_hours_id
+            ).to_model()
+
+        if not is_occurrence_date(pattern, occurrence_date):
+            raise ResourceNotFoundException(
+                f"Recurrence pattern with id: {recurrence_pattern_id} does not recur on {occurrence_date}."
+            )
+
+        occurrence = store_occurrence(self._session, template, occurrence_date)
+        self._session.commit()
+        return occurrence.to_model()
+
     def delete_events(self, event_id: int):
+        """
+        Deletes an event and the future events in its recurrence pattern, along with
+        their tickets, using set-based statements in the current transaction.
+        """
         # Find existing event
         office_hours_entity = self._session.get(OfficeHoursEntity, event_id)
 
@@ -191,8 +293,8 @@ class OfficeHoursRecurrenceService:
             if (office_hours_entity.start_time.date() > date.today())
             else date.today()
         )
-        future_events_query = (
-            select(OfficeHoursEntity)
+        future_event_ids = (
+            select(OfficeHoursEntity.id)
             .where(
                 OfficeHoursEntity.recurrence_pattern_id
                 == office_hours_entity.recurrence_pattern_id
@@ -200,9 +302,37 @@ class OfficeHoursRecurrenceService:
             .where(OfficeHoursEntity.start_time >= start_date)
         )
 
-        future_event_entities = (
-            self._session.scalars(future_events_query).unique().all()
+        # Stop expanding a virtual pattern before the first deleted occurrence
+        self._session.execute(
+            update(OfficeHoursRecurrencePatternEntity)
+            .where(
+                OfficeHoursRecurrencePatternEntity.id
+                == office_hours_entity.recurrence_pattern_id
+            )
+            .where(OfficeHoursRecurrencePatternEntity.virtual)
+            .values(
+                end_date=func.least(
+                    OfficeHoursRecurrencePatternEntity.end_date,
+                    start_date - timedelta(days=1),
+                )
+            )
+        )
+
+        future_ticket_ids = select(OfficeHoursTicketEntity.id).where(
+            OfficeHoursTicketEntity.office_hours_id.in_(future_event_ids)
         )
 
-        for entity in future_event_entities:
-            self._session.delete(entity)
+        # Delete the events' tickets first, as the ORM cascade would have
+        self._session.execute(
+            delete(user_created_tickets_table).where(
+                user_created_tickets_table.c.ticket_id.in_(future_ticket_ids)
+            )
+        )
+        self._session.execute(
+            delete(OfficeHoursTicketEntity).where(
+                OfficeHoursTicketEntity.office_hours_id.in_(future_event_ids)
+            )
+        )
+        self._session.execute(
+            delete(OfficeHoursEntity).where(OfficeHoursEntity.id.in_(future_event_ids))
+        )
@@ -0,0 +1,90 @@
+"""
+Publish/subscribe channel for live office hours queue changes.
+
+`OfficeHourTicketService` publishes an event whenever it commits a change to a ticket,
+and WebSocket connections subscribe by office hours ID to forward those events to
+clients. Services run in FastAPI's threadpool while sockets run on the event loop, so
+events are handed to each subscriber's loop with `call_soon_threadsafe`.
+
+Subscriptions are held in process memory: only sockets connected to the same worker
+as the request that changed a ticket receive its event.
+"""
+
+import asyncio
+from threading import Lock
+
+from ...models.office_hours.queue_event import OfficeHoursQueueEvent
+
+__authors__ = ["Ajay Gandecha"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class QueueSubscription:
+    """Receives the events published for one office hours queue."""
+
+    def __init__(self, office_hours_id: int, loop: asyncio.AbstractEventLoop):
+        self.office_hours_id = office_hours_id
+        self._loop = loop
+        self._events: asyncio.Queue[OfficeHoursQueueEvent] = asyncio.Queue()
+
+    async def get(self) -> OfficeHoursQueueEvent:
+        """Waits for and returns the next event published to the queue."""
+        return await self._events.get()
+
+    def _deliver(self, event: OfficeHoursQueueEvent) -> None:
+        """Hands an event to the subscriber's event loop from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._events.put_nowait, event)
+        except RuntimeError:
+            # The subscriber's event loop has already been closed.
+            ...
+
+
+class QueueBroadcaster:
+    """Fans out office hours queue events to subscriptions keyed by office hours ID."""
+
+    def __init__(self):
+        self._subscriptions: dict[int, set[QueueSubscription]] = {}
+        self._lock = Lock()
+
+    def subscribe(self, office_hours_id: int) -> QueueSubscription:
+        """Subscribes to an office hours queue. Must be called from a running event loop.
+
+        Args:
+            office_hours_id: The ID of the office hours event whose queue to follow.
+
+        Returns:
+            QueueSubscription: Subscription to await events on. Pass it to
+                `unsubscribe` once the client disconnects.
+        """
+        subscription = QueueSubscription(office_hours_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(office_hours_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: QueueSubscription) -> None:
+        """Stops delivering events to a subscription."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.office_hours_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if len(subscriptions) == 0:
+                del self._subscriptions[subscription.office_hours_id]
+
+    def subscriber_count(self, office_hours_id: int) -> int:
+        """Returns the number of subscriptions to an office hours queue."""
+        with self._lock:
+            return len(self._subscriptions.get(office_hours_id, ()))
+
+    def publish(self, event: OfficeHoursQueueEvent) -> None:
+        """Delivers an event to every subscription of its office hours queue."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(event.office_hours_id, ()))
+        for subscription in subscriptions:
+            subscription._deliver(event)
+
+
+queue_broadcaster = QueueBroadcaster()
+"""Process-wide broadcaster shared by the ticket service and the WebSocket API."""
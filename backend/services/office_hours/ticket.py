@@ -2,9 +2,11 @@
 APIs for academics for office hour tickets.
 """
 
+import logging
 from datetime import datetime
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import exists, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from ...database import db_session
 from ...models.user import User
@@ -17,6 +19,7 @@ from ...models.office_hours.ticket import (
     NewOfficeHoursTicket,
     OfficeHoursTicket,
 )
+from ...models.office_hours.queue_event import OfficeHoursQueueEvent, QueueEventType
 
 from ...entities.academics.section_entity import SectionEntity
 from ...entities.office_hours import (
@@ -27,11 +30,14 @@ from ...entities.office_hours import (
 from ...entities.academics.section_member_entity import SectionMemberEntity
 from ..exceptions import CoursePermissionException, ResourceNotFoundException
 from ...entities.office_hours import user_created_tickets_table
+from .queue_broadcaster import queue_broadcaster
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2024"
 __license__ = "MIT"
 
+logger = logging.getLogger(__name__)
+
 
 class OfficeHourTicketService:
     """
@@ -58,6 +64,38 @@ class OfficeHourTicketService:
             caller=(ticket.caller.user.to_public_model() if ticket.caller else None),
         )
 
+    def _mark_dequeued(self, ticket: OfficeHoursTicketEntity) -> None:
+        """
+        Marks a ticket that has left the queue as no longer queued for its creators,
+        allowing them to create another ticket.
+        """
+        self._session.execute(
+            update(user_created_tickets_table)
+            .where(user_created_tickets_table.c.ticket_id == ticket.id)
+            .values(queued=False)
+        )
+
+    def _publish(
+        self, event_type: QueueEventType, ticket: OfficeHoursTicketEntity
+    ) -> OfficeHourTicketOverview:
+        """
+        Publishes a committed change to a ticket to subscribers of its queue.
+
+        Returns:
+            OfficeHourTicketOverview: The overview of the changed ticket.
+        """
+        overview = self._to_oh_ticket_overview(ticket)
+        queue_broadcaster.publish(
+            OfficeHoursQueueEvent(
+                office_hours_id=ticket.office_hours_id,
+                type=event_type,
+                ticket_id=ticket.id,
+                ticket_created_at=ticket.created_at,
+                ticket=overview,
+            )
+        )
+        return overview
+
     def call_ticket(self, user: User, ticket_id: int) -> OfficeHourTicketOverview:
         """
         Calls a ticket in an office hour queue.
@@ -104,12 +142,13 @@ class OfficeHourTicketService:
         ticket_entity.caller_id = user_members[0].id
         ticket_entity.called_at = datetime.now()
         ticket_entity.state = TicketState.CALLED
+        self._mark_dequeued(ticket_entity)
 
         # Save changes
         self._session.commit()
 
-        # Return the changed ticket
-        return self._to_oh_ticket_overview(ticket_entity)
+        # Notify subscribers and return the changed ticket
+        return self._publish(QueueEventType.CALLED, ticket_entity)
 
     def cancel_ticket(self, user: User, ticket_id: int) -> OfficeHourTicketOverview:
         """
@@ -149,12 +188,13 @@ class OfficeHourTicketService:
 
         # Cancel the ticket
         ticket_entity.state = TicketState.CANCELED
+        self._mark_dequeued(ticket_entity)
 
         # Save changes
         self._session.commit()
 
-        # Return the changed ticket
-        return self._to_oh_ticket_overview(ticket_entity)
+        # Notify subscribers and return the changed ticket
+        return self._publish(QueueEventType.CANCELED, ticket_entity)
 
     def close_ticket(self, user: User, ticket_id: int) -> OfficeHourTicketOverview:
         """
@@ -202,8 +242,8 @@ class OfficeHourTicketService:
         # Save changes
         self._session.commit()
 
-        # Return the changed ticket
-        return self._to_oh_ticket_overview(ticket_entity)
+        # Notify subscribers and return the changed ticket
+        return self._publish(QueueEventType.CLOSED, ticket_entity)
 
     def create_ticket(
         self, user: User, ticket: NewOfficeHoursTicket
@@ -226,26 +266,30 @@ class OfficeHourTicketService:
         creator_ids = [user.id]
         # TODO: Reimplement group tickets
         # list(set([creator.id for creator in oh_ticket_draft.creators] + [user.id]))
-        print(f"[DEBUG] User attempting to submit ticket: {user.id}")
-        print(f"[DEBUG] Ticket request: {ticket}")
 
-        # Create query off of the member query for just the members matching
-        # with the current user (used to determine permissions)
-        user_member_query = (
-            select(SectionMemberEntity)
-            .where(SectionMemberEntity.user_id.in_(creator_ids))
+        # Find the creators' memberships in the course of the office hours event, and
+        # whether each already has a ticket in its queue, with a single query
+        has_queued_ticket = (
+            exists()
+            .where(user_created_tickets_table.c.member_id == SectionMemberEntity.id)
+            .where(user_created_tickets_table.c.ticket_id == OfficeHoursTicketEntity.id)
+            .where(OfficeHoursTicketEntity.office_hours_id == ticket.office_hours_id)
+            .where(OfficeHoursTicketEntity.state == TicketState.QUEUED)
+        )
+        eligibility_query = (
+            select(
+                SectionMemberEntity.id,
+                SectionMemberEntity.user_id,
+                SectionMemberEntity.member_role,
+                has_queued_ticket.label("has_queued_ticket"),
+            )
             .join(SectionEntity)
             .join(CourseSiteEntity)
             .join(OfficeHoursEntity)
+            .where(SectionMemberEntity.user_id.in_(creator_ids))
             .where(OfficeHoursEntity.id == ticket.office_hours_id)
         )
-        print(
-            f"[DEBUG] Office hour belongs to course_site_id: {ticket.office_hours_id}"
-        )
-        user_members = self._session.scalars(user_member_query).unique().all()
-        print(
-            f"[DEBUG] Section members found for user {user.id}: {[member.section_id for member in user_members]}"
-        )
+        user_members = self._session.execute(eligibility_query).all()
 
         user_member_ids = [user_member.user_id for user_member in user_members]
 
@@ -257,49 +301,50 @@ class OfficeHourTicketService:
 
         for user_member in user_members:
             # If the user is not a member of the looked up course, throw an error
-            if not user_member or user_member.member_role != RosterRole.STUDENT:
+            if user_member.member_role != RosterRole.STUDENT:
                 raise CoursePermissionException(
                     "Not allowed to create a ticket if you are not a student."
                 )
 
         # Check if the user already has a ticket in a queue
-        queued_query = (
-            select(OfficeHoursTicketEntity)
-            .join(OfficeHoursEntity)
-            .join(user_created_tickets_table)
-            .join(SectionMemberEntity)
-            .where(OfficeHoursEntity.id == ticket.office_hours_id)
-            .where(OfficeHoursTicketEntity.state == TicketState.QUEUED)
-            .where(SectionMemberEntity.user_id == user.id)
-        )
-        queued_tickets_entities = self._session.scalars(queued_query).all()
-
-        if len(queued_tickets_entities) > 0:
+        if any(user_member.has_queued_ticket for user_member in user_members):
             raise CoursePermissionException(
                 "You cannot create multiple tickets at once."
             )
 
-        # Create entity
+        # Create the ticket and associate it with its creators in one transaction. The
+        # unique index on queued creators rejects a concurrent duplicate submission.
         oh_ticket_entity = OfficeHoursTicketEntity.from_new_model(ticket)
-
-        # Add new object to table and commit changes
         self._session.add(oh_ticket_entity)
-
-        # Commit so can get ticket id
-        self._session.commit()
-
-        # Now, Associate ticket with Creators
-        for section_member_entity in user_members:
+        try:
+            self._session.flush()
             self._session.execute(
-                user_created_tickets_table.insert().values(
+                user_created_tickets_table.insert(),
+                [
                     {
                         "ticket_id": oh_ticket_entity.id,
-                        "member_id": section_member_entity.id,
+                        "member_id": user_member.id,
+                        "office_hours_id": ticket.office_hours_id,
+                        "queued": True,
                     }
-                )
+                    for user_member in user_members
+                ],
+            )
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            raise CoursePermissionException(
+                "You cannot create multiple tickets at once."
             )
 
-        self._session.commit()
+        logger.info(
+            "Office hours ticket created",
+            extra={
+                "ticket_id": oh_ticket_entity.id,
+                "office_hours_id": ticket.office_hours_id,
+                "user_id": user.id,
+            },
+        )
 
-        # Return details model
-        return self._to_oh_ticket_overview(oh_ticket_entity)
+        # Notify subscribers and return details model
+        return self._publish(QueueEventType.CREATED, oh_ticket_entity)
@@ -3,14 +3,18 @@
 The User Service provides access to the User model and its associated database operations.
 """
 
+from typing import Iterator
+
 from fastapi import Depends
 from sqlalchemy import select, or_, func, cast, String
 from sqlalchemy.orm import Session
 from ..database import db_session
 from ..models import User, UserDetails, Paginated, PaginationParams, PublicUser
+from ..models.export_format import ExportFormat
 from ..entities import UserEntity
 from .exceptions import ResourceNotFoundException
 from .permission import PermissionService
+from .export import stream_scalars, to_export_chunks
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -159,12 +163,7 @@ class UserService:
         statement = select(UserEntity)
         length_statement = select(func.count()).select_from(UserEntity)
         if pagination_params.filter != "":
-            query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-                UserEntity.onyen.ilike(f"%{query}%"),
-            )
+            criteria = self._list_criteria(pagination_params.filter)
             statement = statement.where(criteria)
             length_statement = length_statement.where(criteria)
 
@@ -187,6 +186,43 @@ class UserService:
             params=pagination_params,
         )
 
+    def export(self, subject: User, filter: str, format: ExportFormat) -> Iterator[str]:
+        """Export Users as a stream of CSV or NDJSON chunks.
+
+        The subject must have the 'user.list' permission on the 'user/' resource. Users are
+        read with a server-side cursor, so memory use stays flat regardless of the number
+        of users.
+
+        Args:
+            subject: The user performing the action.
+            filter: Query matched against first name, last name and onyen, or "" for all users.
+            format: The file format of the export.
+
+        Returns:
+            Iterator[str]: Chunks of the exported file.
+
+        Raises:
+            PermissionException: If the subject does not have the required permission.
+        """
+        self._permission.enforce(subject, "user.list", "user/")
+
+        statement = select(UserEntity).order_by(UserEntity.id)
+        if filter != "":
+            statement = statement.where(self._list_criteria(filter))
+
+        users = (
+            entity.to_model() for entity in stream_scalars(self._session, statement)
+        )
+        return to_export_chunks(users, format, list(User.model_fields))
+
+    def _list_criteria(self, query: str):
+        """Criteria matching users whose first name, last name or onyen contains a query."""
+        return or_(
+            UserEntity.first_name.ilike(f"%{query}%"),
+            UserEntity.last_name.ilike(f"%{query}%"),
+            UserEntity.onyen.ilike(f"%{query}%"),
+        )
+
     def create(self, subject: User, user: User) -> User:
         """Create a User.
 
@@ -0,0 +1,73 @@
+"""Tests for the structured logging pipeline."""
+
+import json
+import logging
+from queue import SimpleQueue
+
+from ..logger import (
+    JsonFormatter,
+    RequestIdFilter,
+    _StructuredQueueHandler,
+    parse_levels,
+    request_id,
+)
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def _log_through_queue(logger_name: str, *args, **kwargs) -> dict:
+    """Logs a record through the queue handler and returns it formatted as JSON."""
+    queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    handler = _StructuredQueueHandler(queue)
+    handler.addFilter(RequestIdFilter())
+    logger = logging.getLogger(logger_name)
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    try:
+        logger.info(*args, **kwargs)
+    finally:
+        logger.removeHandler(handler)
+    return json.loads(JsonFormatter().format(queue.get_nowait()))
+
+
+def test_json_includes_message_and_extra_fields():
+    """Ensures records are formatted as JSON with their extra fields."""
+    entry = _log_through_queue(
+        "backend.test.logger", "Ticket %s created", 7, extra={"office_hours_id": 3}
+    )
+    assert entry["message"] == "Ticket 7 created"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "backend.test.logger"
+    assert entry["office_hours_id"] == 3
+    assert "args" not in entry
+
+
+def test_json_includes_request_id():
+    """Ensures records are tagged with the ID of the request they were logged during."""
+    token = request_id.set("abc123")
+    try:
+        entry = _log_through_queue("backend.test.logger", "Handling request")
+    finally:
+        request_id.reset(token)
+    assert entry["request_id"] == "abc123"
+    assert _log_through_queue("backend.test.logger", "Idle")["request_id"] is None
+
+
+def test_json_includes_exception():
+    """Ensures exceptions are formatted before records cross to the listener thread."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        entry = _log_through_queue("backend.test.logger", "Failed", exc_info=True)
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_parse_levels():
+    """Ensures per-module levels are parsed from their environment variable format."""
+    assert parse_levels("") == {}
+    assert parse_levels("backend.api.chat=debug, sqlalchemy=WARNING") == {
+        "backend.api.chat": "DEBUG",
+        "sqlalchemy": "WARNING",
+    }
@@ -0,0 +1,71 @@
+"""Tests for the Course Membership Resolver."""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from ....models.roster_role import RosterRole
+from ....services.academics.course_membership import CourseMembershipResolver
+
+# Import the setup_teardown fixture explicitly to load entities in database
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .term_data import fake_data_fixture as insert_order_1
+from .course_data import fake_data_fixture as insert_order_2
+from .section_data import fake_data_fixture as insert_order_3
+from ..room_data import fake_data_fixture as insert_order_4
+from ..office_hours.office_hours_data import fake_data_fixture as insert_order_5
+
+# Import the fake model data in a namespace for test assertions
+from .. import user_data
+from ..academics import section_data
+from ..office_hours import office_hours_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def resolver(session: Session):
+    """CourseMembershipResolver fixture."""
+    return CourseMembershipResolver(session)
+
+
+def test_site_memberships(resolver: CourseMembershipResolver):
+    """Ensures a user's memberships are resolved with their course site and role."""
+    memberships = resolver.site_memberships(
+        user_data.student, office_hours_data.comp_110_site.id
+    )
+    assert len(memberships) == 1
+    assert memberships[0].section_id == section_data.comp_110_001_current_term.id
+    assert memberships[0].member_role == RosterRole.STUDENT
+
+
+def test_site_memberships_not_member(resolver: CourseMembershipResolver):
+    """Ensures users have no memberships in course sites they are not part of."""
+    assert (
+        resolver.site_memberships(user_data.root, office_hours_data.comp_110_site.id)
+        == []
+    )
+
+
+def test_memberships_loaded_once(resolver: CourseMembershipResolver):
+    """Ensures a user's memberships are queried once and then answered from memory."""
+    memberships = resolver.memberships(user_data.instructor)
+    assert resolver.memberships(user_data.instructor) is memberships
+    assert len(
+        resolver.site_memberships(
+            user_data.instructor, office_hours_data.comp_301_site.id
+        )
+    ) == len(office_hours_data.comp_301_sections[0])
+
+
+def test_site_section_ids(resolver: CourseMembershipResolver):
+    """Ensures the sections of a course site are resolved."""
+    assert set(resolver.site_section_ids(office_hours_data.comp_110_site.id)) == {
+        section.id for section in office_hours_data.comp_110_sections[0]
+    }
+
+
+def test_site_section_ids_not_found(resolver: CourseMembershipResolver):
+    """Ensures course sites that do not exist have no section IDs."""
+    assert resolver.site_section_ids(404) is None
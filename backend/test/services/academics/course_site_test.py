@@ -1,6 +1,9 @@
 """Tests for Course Site Service."""
 
 import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from ....models.pagination import PaginationParams, Paginated
 from ....models.academics.my_courses import (
@@ -10,11 +13,22 @@ from ....models.academics.my_courses import (
     CourseSiteOverview,
 )
 from ....models.office_hours.course_site import CourseSite, UpdatedCourseSite
+from ....models.roster_role import RosterRole
+from ....entities.academics.term_entity import TermEntity
+from ....entities.academics.section_member_entity import SectionMemberEntity
+from ....entities.office_hours import OfficeHoursEntity
 from ....services.academics.course_site import CourseSiteService
+from ....services.academics.hiring import HiringService
+from ....services.application import ApplicationService
+from ....services.academics.section_member import SectionMemberService
+from ....services.office_hours import OfficeHoursRecurrenceService, OfficeHoursService
 from ....services.exceptions import CoursePermissionException, ResourceNotFoundException
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
-from .fixtures import course_site_svc
+from .fixtures import course_site_svc, section_member_svc, permission_svc
+from ..office_hours.fixtures import oh_svc, oh_recurrence_svc
+from ..fixtures import application_svc
+from .hiring.fixtures import hiring_svc
 
 # Import the setup_teardown fixture explicitly to load entities in database
 from ..core_data import setup_insert_data_fixture as insert_order_0
@@ -23,11 +37,13 @@ from .course_data import fake_data_fixture as insert_order_2
 from .section_data import fake_data_fixture as insert_order_3
 from ..room_data import fake_data_fixture as insert_order_4
 from ..office_hours.office_hours_data import fake_data_fixture as insert_order_5
+from .hiring.hiring_data import fake_data_fixture as insert_order_6
 
 # Import the fake model data in a namespace for test assertions
 from .. import user_data
 from ..academics import term_data, section_data
 from ..office_hours import office_hours_data
+from .hiring import hiring_data
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2024"
@@ -44,6 +60,56 @@ def test_get_user_course_sites(course_site_svc: CourseSiteService):
     assert len(term_overview[-1].sites) == 2
 
 
+def test_get_user_course_sites_current_only(
+    course_site_svc: CourseSiteService, session: Session
+):
+    """Ensures that term overviews can be restricted to terms that have not ended."""
+    term_entity = session.get(TermEntity, term_data.current_term.id)
+    term_entity.end = datetime.now() + timedelta(days=30)
+    session.commit()
+
+    term_overview = course_site_svc.get_user_course_sites(
+        user_data.instructor, current_only=True
+    )
+    assert len(term_overview) == 1
+    assert term_overview[0].id == term_data.current_term.id
+    assert len(term_overview[0].sites) == 2
+
+
+def test_get_user_course_sites_cached_until_roster_change(
+    course_site_svc: CourseSiteService,
+    section_member_svc: SectionMemberService,
+    session: Session,
+):
+    """Ensures that term overviews are cached until section memberships change."""
+    term_overview = course_site_svc.get_user_course_sites(user_data.root)
+    assert term_overview[-1].sites == []
+
+    # Changes made outside of the services are not seen until the cache is cleared
+    session.add(
+        SectionMemberEntity(
+            user_id=user_data.root.id,
+            section_id=section_data.comp_301_001_current_term.id,
+            member_role=RosterRole.STUDENT,
+        )
+    )
+    session.commit()
+    term_overview = course_site_svc.get_user_course_sites(user_data.root)
+    assert term_overview[-1].sites == []
+
+    section_member_svc.add_section_member(
+        user_data.root,
+        section_data.comp_110_001_current_term.id,
+        user_data.root.id,
+        RosterRole.STUDENT,
+    )
+    term_overview = course_site_svc.get_user_course_sites(user_data.root)
+    assert {site.id for site in term_overview[-1].sites} == {
+        office_hours_data.comp_110_site.id,
+        office_hours_data.comp_301_site.id,
+    }
+
+
 def test_get_course_site_roster(course_site_svc: CourseSiteService):
     """Ensures that instructors can access their course rosters."""
     pagination_params = PaginationParams()
@@ -125,6 +191,316 @@ def test_get_future_office_hour_events(course_site_svc: CourseSiteService):
     assert office_hours.items[0].id == office_hours_data.comp_110_future_office_hours.id
 
 
+def _get_all_future_office_hour_events(
+    course_site_svc: CourseSiteService,
+) -> Paginated[OfficeHoursOverview]:
+    """Gets every future office hour event of the COMP 110 site in a single page."""
+    return course_site_svc.get_future_office_hour_events(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        PaginationParams(page_size=100),
+    )
+
+
+def test_get_future_office_hour_events_virtual(
+    course_site_svc: CourseSiteService, oh_recurrence_svc: OfficeHoursRecurrenceService
+):
+    """Ensures that occurrences of virtual recurrence patterns are expanded and paginated in order."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now - timedelta(hours=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now - timedelta(days=2), now + timedelta(days=13)
+        ),
+    )[0]
+
+    first_page = course_site_svc.get_future_office_hour_events(
+        user_data.instructor, office_hours_data.comp_110_site.id, PaginationParams()
+    )
+    events = list(first_page.items)
+    for page in range(1, first_page.length // 10 + 1):
+        events += course_site_svc.get_future_office_hour_events(
+            user_data.instructor,
+            office_hours_data.comp_110_site.id,
+            PaginationParams(page=page),
+        ).items
+
+    virtual_events = [event for event in events if event.virtual]
+    # The 7 stored future events, plus one expanded occurrence per day ahead
+    assert first_page.length == len(events)
+    assert len(virtual_events) in (13, 14)
+    assert len(events) == 7 + len(virtual_events)
+    assert [event.start_time for event in events] == sorted(
+        event.start_time for event in events
+    )
+    for event in virtual_events:
+        assert event.id is None
+        assert event.recurrence_pattern_id == template.recurrence_pattern_id
+        assert event.occurrence_date == event.start_time.date()
+        assert event.start_time > now
+    assert len({event.occurrence_date for event in virtual_events}) == len(
+        virtual_events
+    )
+
+
+def test_get_future_office_hour_events_virtual_deleted(
+    course_site_svc: CourseSiteService, oh_recurrence_svc: OfficeHoursRecurrenceService
+):
+    """Ensures that a virtual recurrence pattern stops expanding once its events are deleted."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now + timedelta(days=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now + timedelta(days=1), now + timedelta(days=8)
+        ),
+    )[0]
+    oh_recurrence_svc.delete_recurring(
+        user_data.instructor, office_hours_data.comp_110_site.id, template.id
+    )
+
+    office_hours = course_site_svc.get_future_office_hour_events(
+        user_data.instructor, office_hours_data.comp_110_site.id, PaginationParams()
+    )
+    assert office_hours.length == 7
+    assert not any(event.virtual for event in office_hours.items)
+
+
+def test_get_current_office_hour_events_virtual_read_only(
+    course_site_svc: CourseSiteService,
+    oh_recurrence_svc: OfficeHoursRecurrenceService,
+    session: Session,
+):
+    """Ensures that an in-progress occurrence of a virtual recurrence pattern is listed without being stored."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now - timedelta(hours=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now - timedelta(days=2), now + timedelta(days=7)
+        ),
+    )[0]
+    stored_count = session.scalar(select(func.count(OfficeHoursEntity.id)))
+
+    office_hours = course_site_svc.get_current_office_hour_events(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    virtual_events = [event for event in office_hours if event.virtual]
+    assert len(virtual_events) == 1
+    assert virtual_events[0].id is None
+    assert virtual_events[0].recurrence_pattern_id == template.recurrence_pattern_id
+    assert virtual_events[0].occurrence_date == now.date()
+    assert virtual_events[0].start_time < now < virtual_events[0].end_time
+    assert session.scalar(select(func.count(OfficeHoursEntity.id))) == stored_count
+
+
+def test_materialize_office_hours_occurrence(
+    course_site_svc: CourseSiteService, oh_recurrence_svc: OfficeHoursRecurrenceService
+):
+    """Ensures that a stored occurrence replaces its expanded occurrence, once."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now + timedelta(hours=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now, now + timedelta(days=7)
+        ),
+    )[0]
+    before = _get_all_future_office_hour_events(course_site_svc)
+    day = (now + timedelta(days=2)).date()
+
+    occurrence = oh_recurrence_svc.materialize_occurrence(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        template.recurrence_pattern_id,
+        day,
+    )
+    assert occurrence.id != template.id
+    assert occurrence.start_time.date() == day
+    assert (
+        oh_recurrence_svc.materialize_occurrence(
+            user_data.instructor,
+            office_hours_data.comp_110_site.id,
+            template.recurrence_pattern_id,
+            day,
+        ).id
+        == occurrence.id
+    )
+
+    after = _get_all_future_office_hour_events(course_site_svc)
+    assert after.length == before.length
+    on_day = [
+        event
+        for event in after.items
+        if event.recurrence_pattern_id == template.recurrence_pattern_id
+        and event.start_time.date() == day
+    ]
+    assert [(event.id, event.virtual) for event in on_day] == [(occurrence.id, False)]
+
+
+def test_materialize_office_hours_occurrence_student(
+    oh_recurrence_svc: OfficeHoursRecurrenceService,
+):
+    """Ensures that students can only store occurrences in progress, to get help in them."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now - timedelta(hours=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now - timedelta(days=2), now + timedelta(days=7)
+        ),
+    )[0]
+    occurrence = oh_recurrence_svc.materialize_occurrence(
+        user_data.student,
+        office_hours_data.comp_110_site.id,
+        template.recurrence_pattern_id,
+        now.date(),
+    )
+    assert occurrence.start_time < now < occurrence.end_time
+
+    with pytest.raises(CoursePermissionException):
+        oh_recurrence_svc.materialize_occurrence(
+            user_data.student,
+            office_hours_data.comp_110_site.id,
+            template.recurrence_pattern_id,
+            (now + timedelta(days=1)).date(),
+        )
+
+
+def test_materialize_office_hours_occurrence_not_recurring(
+    oh_recurrence_svc: OfficeHoursRecurrenceService,
+):
+    """Ensures that only days a virtual recurrence pattern recurs on can be stored."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now + timedelta(hours=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now, now + timedelta(days=7)
+        ),
+    )[0]
+    with pytest.raises(ResourceNotFoundException):
+        oh_recurrence_svc.materialize_occurrence(
+            user_data.instructor,
+            office_hours_data.comp_110_site.id,
+            template.recurrence_pattern_id,
+            (now + timedelta(days=30)).date(),
+        )
+
+
+def test_delete_materialized_office_hours_occurrence(
+    course_site_svc: CourseSiteService,
+    oh_svc: OfficeHoursService,
+    oh_recurrence_svc: OfficeHoursRecurrenceService,
+):
+    """Ensures that a deleted occurrence is not expanded again."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now + timedelta(hours=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now, now + timedelta(days=7)
+        ),
+    )[0]
+    before = _get_all_future_office_hour_events(course_site_svc)
+    day = (now + timedelta(days=2)).date()
+    occurrence = oh_recurrence_svc.materialize_occurrence(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        template.recurrence_pattern_id,
+        day,
+    )
+    oh_svc.delete(
+        user_data.instructor, office_hours_data.comp_110_site.id, occurrence.id
+    )
+
+    after = _get_all_future_office_hour_events(course_site_svc)
+    assert after.length == before.length - 1
+    assert not any(
+        event.recurrence_pattern_id == template.recurrence_pattern_id
+        and event.start_time.date() == day
+        for event in after.items
+    )
+    with pytest.raises(ResourceNotFoundException):
+        oh_recurrence_svc.materialize_occurrence(
+            user_data.instructor,
+            office_hours_data.comp_110_site.id,
+            template.recurrence_pattern_id,
+            day,
+        )
+
+
+def test_update_virtual_template_keeps_pattern(
+    course_site_svc: CourseSiteService,
+    oh_svc: OfficeHoursService,
+    oh_recurrence_svc: OfficeHoursRecurrenceService,
+):
+    """Ensures that editing the first occurrence of a virtual pattern only edits that occurrence."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now + timedelta(hours=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now, now + timedelta(days=7)
+        ),
+    )[0]
+    before = _get_all_future_office_hour_events(course_site_svc)
+    oh_svc.update(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        template.model_copy(update={"description": "Moved to Zoom"}),
+    )
+
+    after = _get_all_future_office_hour_events(course_site_svc)
+    assert after.length == before.length
+    pattern_events = [
+        event
+        for event in after.items
+        if event.recurrence_pattern_id == template.recurrence_pattern_id
+    ]
+    assert pattern_events[0].id == template.id
+    assert pattern_events[0].description == "Moved to Zoom"
+    assert all(event.description == "Sample" for event in pattern_events[1:])
+
+
+def test_delete_virtual_template_keeps_pattern(
+    course_site_svc: CourseSiteService,
+    oh_svc: OfficeHoursService,
+    oh_recurrence_svc: OfficeHoursRecurrenceService,
+):
+    """Ensures that deleting the first occurrence of a virtual pattern only deletes that occurrence."""
+    now = datetime.now()
+    template = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_virtual_daily_event(now + timedelta(hours=1)),
+        office_hours_data.new_virtual_daily_recurrence_pattern(
+            now, now + timedelta(days=7)
+        ),
+    )[0]
+    before = _get_all_future_office_hour_events(course_site_svc)
+    oh_svc.delete(user_data.instructor, office_hours_data.comp_110_site.id, template.id)
+
+    after = _get_all_future_office_hour_events(course_site_svc)
+    assert after.length == before.length - 1
+    pattern_dates = [
+        event.start_time.date()
+        for event in after.items
+        if event.recurrence_pattern_id == template.recurrence_pattern_id
+    ]
+    assert template.start_time.date() not in pattern_dates
+    assert len(pattern_dates) == 7
+
+
 def test_get_future_office_hour_events_not_member(course_site_svc: CourseSiteService):
     """Ensures that non-members cannot access future office hour events."""
     pagination_params = PaginationParams()
@@ -213,6 +589,24 @@ def test_update(course_site_svc: CourseSiteService):
     assert course_site.term_id == office_hours_data.updated_comp_110_site.term_id
 
 
+def test_update_new_section_creates_reviews(
+    course_site_svc: CourseSiteService,
+    application_svc: ApplicationService,
+    hiring_svc: HiringService,
+):
+    """Ensures that applications to a section added to a course site appear on its hiring board."""
+    application_svc.update(user_data.root, hiring_data.application_five_comp_301_002)
+    course_site_svc.update(
+        user_data.instructor, office_hours_data.updated_comp_110_site_new_section
+    )
+    hiring_status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    assert hiring_data.application_five.id in [
+        review.application_id for review in hiring_status.not_processed
+    ]
+
+
 def test_update_term_mismatch(course_site_svc: CourseSiteService):
     """Ensures that a course site cannot be updated with sections of different terms."""
     with pytest.raises(CoursePermissionException):
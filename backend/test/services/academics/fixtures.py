@@ -8,6 +8,7 @@ from ....services.academics.section_member import SectionMemberService
 from ....services import PermissionService
 from ....services.academics import TermService, CourseService, SectionService
 from ....services.academics.course_site import CourseSiteService
+from ....services.academics.course_membership import CourseMembershipResolver
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2023"
@@ -47,4 +48,4 @@ def section_member_svc(session: Session, permission_svc: PermissionService):
 @pytest.fixture()
 def course_site_svc(session: Session):
     """CourseSiteService fixture."""
-    return CourseSiteService(session)
+    return CourseSiteService(session, CourseMembershipResolver(session))
@@ -131,6 +131,20 @@ application_five = Application(
     term_id=term_data.current_term.id,
 )
 
+application_five_comp_301_002 = application_five.model_copy(
+    update={
+        "preferred_sections": [
+            CatalogSectionIdentity(
+                id=section_data.comp_301_002_current_term.id,
+                subject_code="COMP",
+                course_number="301",
+                section_number="002",
+                title="Foundations of Programming",
+            )
+        ]
+    }
+)
+
 new_application = Application(
     id=6,
     type="new_uta",
@@ -0,0 +1,46 @@
+"""Tests for the hiring matching solver."""
+
+from .....services.academics.hiring_matching import (
+    HiringMatchingProblem,
+    solve_hiring_matching,
+)
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def _problem(**overrides) -> HiringMatchingProblem:
+    """Three applicants who all prefer site 0 over site 1, where site 0 needs one."""
+    problem = {
+        "site_needs": [1.0, 1.0],
+        "applicant_coverage": [1.0, 1.0, 1.0],
+        "applicant_costs": [100.0, 100.0, 100.0],
+        "applicant_choices": [[0, 1], [0, 1], [0, 1]],
+        "site_rankings": [{0: 2, 1: 0, 2: 1}, {0: 0, 1: 1, 2: 2}],
+    }
+    return HiringMatchingProblem(**(problem | overrides))
+
+
+def test_solve_hiring_matching_stable():
+    """Ensures sites keep the applicants they rank best, and others move on."""
+    assert solve_hiring_matching(_problem()) == [1, 0, None]
+
+
+def test_solve_hiring_matching_requires_site_ranking():
+    """Ensures applicants are only matched to sites that ranked them."""
+    problem = _problem(site_rankings=[{0: 0}, {1: 0}])
+    assert solve_hiring_matching(problem) == [0, 1, None]
+
+
+def test_solve_hiring_matching_fills_coverage_need():
+    """Ensures sites hold applicants until their coverage need is met."""
+    problem = _problem(site_needs=[0.6, 0.0], applicant_coverage=[0.25, 0.25, 0.25])
+    assert solve_hiring_matching(problem) == [0, 0, 0]
+
+
+def test_solve_hiring_matching_budget():
+    """Ensures the worst ranked assignments are dropped to stay within budget."""
+    problem = _problem(site_rankings=[{0: 2, 1: 0, 2: 1}, {0: 1, 1: 2}])
+    assert solve_hiring_matching(problem) == [1, 0, None]
+    assert solve_hiring_matching(problem, budget=150.0) == [None, 0, None]
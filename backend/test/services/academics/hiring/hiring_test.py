@@ -1,13 +1,18 @@
 """Tests for the HiringService class."""
 
 # PyTest
+import csv
+import io
 import pytest
 from unittest.mock import create_autospec
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from backend.services.exceptions import (
     UserPermissionException,
     ResourceNotFoundException,
     CoursePermissionException,
+    StaleResourceException,
 )
 
 # Tested Dependencies
@@ -15,13 +20,26 @@ from .....models.academics.hiring.application_review import (
     HiringStatus,
     ApplicationReviewOverview,
     ApplicationReviewStatus,
+    ApplicationReviewChange,
+)
+from .....models.academics.hiring.hiring_assignment import HiringAssignmentStatus
+from .....models.roster_role import RosterRole
+from .....entities.academics import SectionEntity
+from .....entities.academics.hiring.application_review_entity import (
+    ApplicationReviewEntity,
+)
+from .....entities.academics.hiring.hiring_assignment_entity import (
+    HiringAssignmentEntity,
 )
 from .....services.academics import HiringService
 from .....services.application import ApplicationService
 from .....services.academics.course_site import CourseSiteService
+from .....services.academics.section_labels import get_term_section_labels
+from .....services.academics.hiring_rollup import hiring_rollup_cache
 
 # Injected Service Fixtures
 from .fixtures import hiring_svc
+from ...fixtures import application_svc
 from ..course_site_test import course_site_svc
 
 # Import the setup_teardown fixture explicitly to load entities in database
@@ -49,6 +67,9 @@ __license__ = "MIT"
 
 def test_get_status(hiring_svc: HiringService):
     """Test that an instructor can get status on hiring."""
+    hiring_svc.create_missing_reviews_for_term(
+        user_data.root, term_data.current_term.id
+    )
     hiring_status = hiring_svc.get_status(
         user_data.instructor, office_hours_data.comp_110_site.id
     )
@@ -69,6 +90,84 @@ def test_get_status(hiring_svc: HiringService):
     )
 
 
+def test_get_status_read_only(hiring_svc: HiringService):
+    """Ensures that getting the status does not create reviews."""
+    hiring_status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    assert len(hiring_status.not_processed) == 1
+    assert (
+        hiring_status.not_processed[0].application_id
+        == hiring_data.application_three.id
+    )
+
+
+def test_create_missing_reviews_for_term(hiring_svc: HiringService):
+    """Ensures that missing reviews are created once for every course site."""
+    created = hiring_svc.create_missing_reviews_for_term(
+        user_data.root, term_data.current_term.id
+    )
+    assert created == 3
+
+    hiring_status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    assert [review.preference for review in hiring_status.not_processed] == [0, 1]
+    assert (
+        hiring_svc.create_missing_reviews_for_term(
+            user_data.root, term_data.current_term.id
+        )
+        == 0
+    )
+
+
+def test_create_application_creates_reviews(
+    hiring_svc: HiringService, application_svc: ApplicationService
+):
+    """Ensures a new application appears on the hiring boards of its course sites."""
+    application = application_svc.create(
+        user_data.ambassador,
+        hiring_data.new_application.model_copy(deep=True),
+    )
+    hiring_status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    assert [review.application_id for review in hiring_status.not_processed] == [
+        hiring_data.application_three.id,
+        application.id,
+    ]
+    assert hiring_status.not_processed[1].preference == 1
+
+
+def test_update_application_creates_reviews(
+    hiring_svc: HiringService, application_svc: ApplicationService
+):
+    """Ensures an updated application appears on newly preferred course sites' boards."""
+    application = hiring_data.application_five.model_copy(
+        update={
+            "preferred_sections": hiring_data.new_application.preferred_sections,
+        }
+    )
+    application_svc.update(user_data.root, application)
+    hiring_status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    assert hiring_data.application_five.id in [
+        review.application_id for review in hiring_status.not_processed
+    ]
+
+
+def test_create_missing_reviews_for_term_checks_permission(
+    hiring_svc: HiringService,
+):
+    """Ensures that only the admin can create missing reviews."""
+    with pytest.raises(UserPermissionException):
+        hiring_svc.create_missing_reviews_for_term(
+            user_data.instructor, term_data.current_term.id
+        )
+        pytest.fail()
+
+
 def test_get_status_site_not_found(hiring_svc: HiringService):
     """Ensures that hiring is not possible if a course site does not exist."""
     with pytest.raises(ResourceNotFoundException):
@@ -91,6 +190,9 @@ def test_get_status_with_permission(hiring_svc: HiringService):
 
 def test_update_status(hiring_svc: HiringService):
     """Test that an instructor can update the hiring status."""
+    hiring_svc.create_missing_reviews_for_term(
+        user_data.root, term_data.current_term.id
+    )
     status = hiring_svc.get_status(
         user_data.instructor, office_hours_data.comp_110_site.id
     )
@@ -116,6 +218,95 @@ def test_update_status(hiring_svc: HiringService):
     )
 
 
+def test_update_status_changes(hiring_svc: HiringService):
+    """Ensures that only changed reviews are saved and returned with new versions."""
+    status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    moved = status.not_preferred[0]
+    change = ApplicationReviewChange(
+        id=moved.id,
+        status=ApplicationReviewStatus.PREFERRED,
+        preference=1,
+        notes="Moved!",
+        version=moved.version,
+    )
+
+    saved = hiring_svc.update_status_changes(
+        user_data.instructor, office_hours_data.comp_110_site.id, [change]
+    )
+
+    assert saved == [change.model_copy(update={"version": moved.version + 1})]
+    new_status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    assert len(new_status.not_preferred) == 0
+    assert new_status.preferred[1].id == moved.id
+    assert new_status.preferred[1].notes == "Moved!"
+    assert new_status.preferred[1].version == moved.version + 1
+
+
+def test_update_status_changes_stale(hiring_svc: HiringService):
+    """Ensures that no changes are saved if any review changed since it was loaded."""
+    status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    first, second = status.not_processed[0], status.preferred[0]
+    changes = [
+        ApplicationReviewChange(
+            id=review.id,
+            status=review.status,
+            preference=review.preference,
+            notes="Edited by a co-instructor",
+            version=review.version,
+        )
+        for review in (first, second)
+    ]
+    hiring_svc.update_status_changes(
+        user_data.instructor, office_hours_data.comp_110_site.id, changes[1:]
+    )
+
+    with pytest.raises(StaleResourceException):
+        hiring_svc.update_status_changes(
+            user_data.instructor, office_hours_data.comp_110_site.id, changes
+        )
+        pytest.fail()
+
+    new_status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    assert new_status.not_processed[0].notes == first.notes
+
+
+def test_update_status_changes_other_site(hiring_svc: HiringService):
+    """Ensures that reviews of other course sites cannot be changed through a site."""
+    status = hiring_svc.get_status(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    review = status.preferred[0]
+    change = ApplicationReviewChange(
+        id=review.id,
+        status=review.status,
+        preference=review.preference,
+        notes=review.notes,
+        version=review.version,
+    )
+    with pytest.raises(StaleResourceException):
+        hiring_svc.update_status_changes(
+            user_data.root, office_hours_data.comp_301_site.id, [change]
+        )
+        pytest.fail()
+
+
+def test_update_status_changes_not_instructor(hiring_svc: HiringService):
+    """Ensures that only instructors can save changes to the hiring board."""
+    with pytest.raises(UserPermissionException):
+        hiring_svc.update_status_changes(
+            user_data.ambassador, office_hours_data.comp_110_site.id, []
+        )
+        pytest.fail()
+
+
 def test_update_status_site_not_found(hiring_svc: HiringService):
     """Ensures that updating hiring is not possible if a course site does not exist."""
     status = hiring_svc.get_status(
@@ -154,6 +345,20 @@ def test_get_hiring_admin_overview(hiring_svc: HiringService):
     assert hiring_admin_overview is not None
     assert len(hiring_admin_overview.sites) == 2
 
+    comp_110_overview = next(
+        site
+        for site in hiring_admin_overview.sites
+        if site.course_site_id == office_hours_data.comp_110_site.id
+    )
+    assert len(comp_110_overview.sections) == 2
+    assert [instructor.id for instructor in comp_110_overview.instructors] == [
+        user_data.instructor.id
+    ]
+    assert comp_110_overview.total_enrollment == 200
+    assert comp_110_overview.total_cost == hiring_data.uta_level.salary
+    assert comp_110_overview.coverage == pytest.approx(200 / 60 - 0.25)
+    assert len(comp_110_overview.assignments) == 1
+
 
 def test_get_hiring_admin_overview_checks_permission(hiring_svc: HiringService):
     """Ensures that nobody else is able to check the hiring data."""
@@ -296,6 +501,44 @@ def test_create_missing_course_sites_for_term(
     assert len(overview_post.sites) > len(overview_pre.sites)
 
 
+def test_create_missing_course_sites_for_term_groups_sections(
+    hiring_svc: HiringService, session: Session
+):
+    """Ensures sections of a course with the same instructors share a course site."""
+    term_id = term_data.current_term.id
+    missing_query = select(SectionEntity).where(
+        SectionEntity.term_id == term_id, SectionEntity.course_site_id.is_(None)
+    )
+    missing_ids = [section.id for section in session.scalars(missing_query)]
+    assert len(missing_ids) > 0
+
+    hiring_svc.create_missing_course_sites_for_term(user_data.root, term_id)
+
+    assert session.scalars(missing_query).all() == []
+    sites: dict[tuple[str, frozenset[int]], set[int]] = {}
+    for section_id in missing_ids:
+        section = session.get(SectionEntity, section_id)
+        instructors = frozenset(
+            member.user_id
+            for member in section.members
+            if member.member_role == RosterRole.INSTRUCTOR
+        )
+        sites.setdefault((section.course_id, instructors), set()).add(
+            section.course_site_id
+        )
+    assert all(len(site_ids) == 1 for site_ids in sites.values())
+    assert len(set().union(*sites.values())) == len(sites)
+
+
+def test_create_missing_course_sites_for_term_idempotent(hiring_svc: HiringService):
+    """Ensures creating missing course sites again makes no changes."""
+    term_id = term_data.current_term.id
+    hiring_svc.create_missing_course_sites_for_term(user_data.root, term_id)
+    overview = hiring_svc.get_hiring_admin_overview(user_data.root, term_id)
+    hiring_svc.create_missing_course_sites_for_term(user_data.root, term_id)
+    assert hiring_svc.get_hiring_admin_overview(user_data.root, term_id) == overview
+
+
 def test_get_phd_applicants(hiring_svc: HiringService):
     user = user_data.root
     term = term_data.current_term
@@ -303,3 +546,226 @@ def test_get_phd_applicants(hiring_svc: HiringService):
     assert len(applicants) > 0
     for applicant in applicants:
         assert applicant.program_pursued in {"PhD", "PhD (ABD)"}
+
+
+def test_get_phd_applicants_preferences(hiring_svc: HiringService):
+    """Ensures PhD applicants are listed with labels of the sections they prefer."""
+    applicants = hiring_svc.get_phd_applicants(
+        user_data.root, term_data.current_term.id
+    )
+    applicant = next(a for a in applicants if a.id == hiring_data.application_five.id)
+    section = section_data.comp_301_001_current_term
+    assert applicant.student_preferences == [f"{section.course_id}.{section.number}"]
+    assert applicant.instructor_preferences == []
+
+
+def test_get_term_section_labels(hiring_svc: HiringService):
+    """Ensures course sites are labelled by their first section, and labels are cached."""
+    labels = get_term_section_labels(hiring_svc._session, term_data.current_term.id)
+    section = office_hours_data.comp_110_sections[0][0]
+    assert labels.sections[section.id] == f"{section.course_id}.{section.number}"
+    assert labels.course_sites[office_hours_data.comp_110_site.id] == (
+        labels.sections[min(s.id for s in office_hours_data.comp_110_sections[0])]
+    )
+    assert [
+        catalog_section.id
+        for catalog_section in labels.course_site_catalog_sections(
+            office_hours_data.comp_110_site.id
+        )
+    ] == sorted(s.id for s in office_hours_data.comp_110_sections[0])
+    catalog_section = labels.catalog_sections[section.id]
+    assert (catalog_section.course_number, catalog_section.section_number) == (
+        "110",
+        section.number,
+    )
+    assert (
+        get_term_section_labels(hiring_svc._session, term_data.current_term.id)
+        is labels
+    )
+
+
+def test_propose_hiring_assignments(hiring_svc: HiringService):
+    """Ensures that preferred applicants are proposed to the sites they applied to."""
+    proposals = hiring_svc.propose_hiring_assignments(
+        user_data.root, term_data.current_term.id
+    )
+    assert len(proposals) == 1
+    assert proposals[0].user_id == hiring_data.application_two.user_id
+    assert proposals[0].course_site_id == office_hours_data.comp_110_site.id
+    assert proposals[0].level.id == hiring_data.uta_level.id
+    assert proposals[0].status == HiringAssignmentStatus.DRAFT
+
+
+def test_propose_hiring_assignments_within_budget(hiring_svc: HiringService):
+    """Ensures that proposals are dropped to stay within a budget."""
+    proposals = hiring_svc.propose_hiring_assignments(
+        user_data.root,
+        term_data.current_term.id,
+        budget=hiring_data.uta_level.salary - 1,
+    )
+    assert proposals == []
+
+
+def test_propose_hiring_assignments_checks_permission(hiring_svc: HiringService):
+    """Ensures that only the admin can propose hiring assignments."""
+    with pytest.raises(UserPermissionException):
+        hiring_svc.propose_hiring_assignments(
+            user_data.ambassador, term_data.current_term.id
+        )
+        pytest.fail()
+
+
+def test_get_hiring_summary_for_csv(hiring_svc: HiringService):
+    """Ensures the committed hires of a term are streamed as CSV rows."""
+    chunks = hiring_svc.get_hiring_summary_for_csv(
+        user_data.root, term_data.current_term.id
+    )
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == 1
+    assert rows[0]["onyen"] == user_data.student.onyen
+    assert rows[0]["level_title"] == hiring_data.uta_level.title
+    assert user_data.instructor.last_name in rows[0]["instructors"]
+
+
+def test_get_hiring_summary_for_csv_checks_permission(hiring_svc: HiringService):
+    """Ensures permissions are checked before the hiring summary is streamed."""
+    with pytest.raises(UserPermissionException):
+        hiring_svc.get_hiring_summary_for_csv(
+            user_data.student, term_data.current_term.id
+        )
+        pytest.fail()
+
+
+def test_get_course_site_hiring_status_csv(hiring_svc: HiringService):
+    """Ensures the applicants to a course site are streamed as CSV rows."""
+    chunks = hiring_svc.get_course_site_hiring_status_csv(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == len(hiring_data.reviews)
+    assert rows[0]["pid"] == str(user_data.student.pid)
+    assert "COMP 110-002" in rows[0]["preferred_sections"]
+
+
+def test_get_assignment_summary_for_instructors_csv(hiring_svc: HiringService):
+    """Ensures the committed hires of a course site are streamed as CSV rows."""
+    chunks = hiring_svc.get_assignment_summary_for_instructors_csv(
+        user_data.instructor, office_hours_data.comp_110_site.id
+    )
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert rows == [
+        {
+            "first_name": user_data.student.first_name,
+            "last_name": user_data.student.last_name,
+            "onyen": user_data.student.onyen,
+            "pid": str(user_data.student.pid),
+            "email": user_data.student.email,
+            "level_title": hiring_data.uta_level.title,
+        }
+    ]
+
+
+def test_conflict_check_matrix(hiring_svc: HiringService):
+    """Ensures the term matrix agrees with conflict checks of single applications."""
+    matrix = hiring_svc.conflict_check_matrix(user_data.root, term_data.current_term.id)
+    assert [(cell.application_id, cell.course_site_id) for cell in matrix.cells] == [
+        (hiring_data.application_two.id, office_hours_data.comp_110_site.id)
+    ]
+    single = hiring_svc.conflict_check(user_data.root, hiring_data.application_two.id)
+    assert matrix.cells[0].student_priority == single.priorities[0].student_priority
+    assert (
+        matrix.cells[0].instructor_priority == single.priorities[0].instructor_priority
+    )
+    assert [site.id for site in matrix.course_sites] == [
+        office_hours_data.comp_110_site.id
+    ]
+    assert matrix.assignments == []
+
+
+def test_conflict_check_matrix_assignments(hiring_svc: HiringService, session: Session):
+    """Ensures assignments made from reviews are included in the matrix."""
+    review_id = session.scalar(
+        select(ApplicationReviewEntity.id).where(
+            ApplicationReviewEntity.application_id == hiring_data.application_two.id
+        )
+    )
+    assignment = session.get(HiringAssignmentEntity, hiring_data.hiring_assignment.id)
+    assignment.application_review_id = review_id
+    session.commit()
+
+    matrix = hiring_svc.conflict_check_matrix(user_data.root, term_data.current_term.id)
+    assert len(matrix.assignments) == 1
+    assert matrix.assignments[0].application_id == hiring_data.application_two.id
+    assert matrix.assignments[0].level_title == hiring_data.uta_level.title
+    assert matrix.assignments[0].status == hiring_data.hiring_assignment.status
+
+
+def test_conflict_check_matrix_checks_permission(hiring_svc: HiringService):
+    """Ensures that only the admin can load the conflict check matrix."""
+    with pytest.raises(UserPermissionException):
+        hiring_svc.conflict_check_matrix(
+            user_data.instructor, term_data.current_term.id
+        )
+        pytest.fail()
+
+
+def test_get_hiring_rollup(hiring_svc: HiringService):
+    """Ensures the term-wide hiring totals agree with the admin overview."""
+    rollup = hiring_svc.get_hiring_rollup(user_data.root, term_data.current_term.id)
+    overview = hiring_svc.get_hiring_admin_overview(
+        user_data.root, term_data.current_term.id
+    )
+    assert rollup.total_enrollment == sum(
+        site.total_enrollment for site in overview.sites
+    )
+    assert rollup.total_cost == sum(site.total_cost for site in overview.sites)
+    assert rollup.coverage == pytest.approx(
+        sum(site.coverage for site in overview.sites)
+    )
+    assert [(level.level_id, level.count) for level in rollup.levels] == [
+        (hiring_data.uta_level.id, 1)
+    ]
+    assert rollup.status_counts[HiringAssignmentStatus.COMMIT] == 1
+    assert rollup.status_counts[HiringAssignmentStatus.FINAL] == 0
+
+
+def test_get_hiring_rollup_follows_assignments(hiring_svc: HiringService):
+    """Ensures the cached hiring totals are updated in place when assignments change."""
+    term_id = term_data.current_term.id
+    hiring_svc.get_hiring_rollup(user_data.root, term_id)
+
+    hiring_svc.create_hiring_assignment(
+        user_data.root, hiring_data.new_hiring_assignment
+    )
+    assert hiring_rollup_cache.contains(term_id)
+    rollup = hiring_svc.get_hiring_rollup(user_data.root, term_id)
+    assert rollup.levels[0].count == 2
+    assert rollup.total_cost == 2 * hiring_data.uta_level.salary
+    assert rollup.status_counts[HiringAssignmentStatus.FINAL] == 1
+
+    hiring_svc.update_hiring_assignment(
+        user_data.root, hiring_data.updated_hiring_assignment
+    )
+    rollup = hiring_svc.get_hiring_rollup(user_data.root, term_id)
+    assert rollup.status_counts[HiringAssignmentStatus.COMMIT] == 0
+    assert rollup.status_counts[HiringAssignmentStatus.FINAL] == 2
+
+    hiring_svc.delete_hiring_assignment(
+        user_data.root, hiring_data.hiring_assignment.id
+    )
+    rollup = hiring_svc.get_hiring_rollup(user_data.root, term_id)
+    assert rollup.levels[0].count == 1
+    assert rollup.status_counts[HiringAssignmentStatus.FINAL] == 1
+
+    recomputed = hiring_svc._load_hiring_rollup(term_id)
+    assert rollup.model_dump(exclude={"coverage"}) == recomputed.model_dump(
+        exclude={"coverage"}
+    )
+    assert rollup.coverage == pytest.approx(recomputed.coverage)
+
+
+def test_get_hiring_rollup_checks_permission(hiring_svc: HiringService):
+    """Ensures that only the admin can see the hiring totals of a term."""
+    with pytest.raises(UserPermissionException):
+        hiring_svc.get_hiring_rollup(user_data.instructor, term_data.current_term.id)
+        pytest.fail()
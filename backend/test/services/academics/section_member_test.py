@@ -3,10 +3,14 @@
 import pytest
 
 from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from ....models.office_hours.course_site_details import CourseSiteDetails
 from ....models.academics.section_member import SectionMember
 from ....models.roster_role import RosterRole
+from ....entities import UserEntity
+from ....entities.academics.section_member_entity import SectionMemberEntity
 from ....models.pagination import PaginationParams
 
 from ....services.academics.section_member import SectionMemberService
@@ -89,6 +93,57 @@ def test_create_from_csv_remove(section_member_svc: SectionMemberService):
     )
 
 
+def test_create_from_csv_diff(section_member_svc: SectionMemberService):
+    """Ensures roster imports report the users created, added, and removed."""
+    response = section_member_svc.import_users_from_csv(
+        user_data.instructor,
+        section_data.comp_301_001_current_term.id,
+        csv_data=section_data.roster_csv,
+    )
+    assert response.uploaded == 4
+    assert response.created == ["kjordan", "nstudent"]
+    assert response.added == ["kjordan", "nstudent", "rroot", "sstudent"]
+    assert response.removed == [user_data.student.onyen]
+
+    response = section_member_svc.import_users_from_csv(
+        user_data.instructor,
+        section_data.comp_301_001_current_term.id,
+        csv_data=section_data.smaller_roster_csv,
+    )
+    assert response.uploaded == 2
+    assert response.created == []
+    assert response.added == []
+    assert response.removed == ["nstudent", user_data.user.onyen]
+
+
+def test_create_from_csv_sync_roster(
+    section_member_svc: SectionMemberService, session: Session
+):
+    """Ensures roster imports leave exactly the CSV's students on the roster."""
+    section_member_svc.import_users_from_csv(
+        user_data.instructor,
+        section_data.comp_301_001_current_term.id,
+        csv_data=section_data.roster_csv,
+    )
+    section_member_svc.import_users_from_csv(
+        user_data.instructor,
+        section_data.comp_301_001_current_term.id,
+        csv_data=section_data.smaller_roster_csv,
+    )
+
+    roster_query = (
+        select(UserEntity.onyen, SectionMemberEntity.member_role)
+        .join(SectionMemberEntity.user)
+        .where(
+            SectionMemberEntity.section_id == section_data.comp_301_001_current_term.id
+        )
+    )
+    roster = dict(session.execute(roster_query).all())
+    assert roster[user_data.root.onyen] == RosterRole.STUDENT
+    assert user_data.user.onyen not in roster
+    assert roster[user_data.instructor.onyen] == RosterRole.INSTRUCTOR
+
+
 def test_create_from_csv_not_instructor(section_member_svc: SectionMemberService):
     with pytest.raises(CoursePermissionException):
         section_member_svc.import_users_from_csv(
@@ -3,6 +3,9 @@
 # PyTest
 import pytest
 from unittest.mock import create_autospec
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
 
 from backend.services.exceptions import (
     UserPermissionException,
@@ -12,9 +15,14 @@ from backend.services.exceptions import (
 # Tested Dependencies
 from ...models.application import Application, CatalogSectionIdentity
 from ...services import ApplicationService
+from ...services.application import eligible_sections_cache
+from ...services.academics import SectionService
+from ...entities.academics import TermEntity
 
 # Injected Service Fixtures
 from .fixtures import application_svc
+from .fixtures import permission_svc
+from .academics.fixtures import section_svc
 
 # Import the setup_teardown fixture explicitly to load entities in database
 from .core_data import setup_insert_data_fixture as insert_order_0
@@ -150,3 +158,53 @@ def test_delete_application_other_user(application_svc: ApplicationService):
 def test_eligible_sections(application_svc: ApplicationService):
     sections = application_svc.eligible_sections()
     assert len(sections) == 8
+
+
+@pytest.fixture()
+def open_applications(session: Session):
+    """Opens the application window of the Fall 2023 term and empties the cache."""
+    term_entity = session.get(TermEntity, term_data.f_23.id)
+    term_entity.applications_open = datetime.now() - timedelta(days=1)
+    term_entity.applications_close = datetime.now() + timedelta(days=1)
+    session.commit()
+    eligible_sections_cache.clear()
+    yield
+    eligible_sections_cache.clear()
+
+
+def test_eligible_sections_open_term(
+    application_svc: ApplicationService, open_applications
+):
+    sections = application_svc.eligible_sections()
+    section_ids = {section.id for section in sections}
+    expected = {
+        section.id
+        for section in section_data.sections
+        if section.term_id == term_data.f_23.id
+    }
+    assert section_ids == expected
+
+
+def test_eligible_sections_json(application_svc: ApplicationService, open_applications):
+    sections = application_svc.eligible_sections()
+    assert application_svc.eligible_sections_json() == TypeAdapter(
+        list[CatalogSectionIdentity]
+    ).dump_json(sections)
+
+
+def test_eligible_sections_cached(
+    application_svc: ApplicationService, open_applications
+):
+    assert application_svc.eligible_sections() is application_svc.eligible_sections()
+
+
+def test_eligible_sections_invalidated_on_section_delete(
+    application_svc: ApplicationService,
+    section_svc: SectionService,
+    open_applications,
+):
+    before = application_svc.eligible_sections()
+    section_svc.delete(user_data.root, section_data.comp_101_001.id)
+    after = application_svc.eligible_sections()
+    assert len(after) == len(before) - 1
+    assert section_data.comp_101_001.id not in {section.id for section in after}
@@ -48,6 +48,36 @@ def test_get_welcome_unauthenticated(article_svc: ArticleService):
     )
 
 
+def test_get_welcome_unauthenticated_json(article_svc: ArticleService):
+    """Ensures that the pre-serialized welcome overview matches the overview model."""
+    welcome_overview_json = article_svc.get_welcome_overview_json_unauthenticated()
+    assert WelcomeOverview.model_validate_json(
+        welcome_overview_json
+    ) == article_svc.get_welcome_overview(None)
+
+
+def test_get_welcome_overview_is_cached(article_svc: ArticleService):
+    """Ensures that the public part of the welcome overview is shared between requests."""
+    first = article_svc.get_welcome_overview(None)
+    second = article_svc.get_welcome_overview(user_data.student)
+    assert second.announcement == first.announcement
+    assert second.latest_news == first.latest_news
+    assert article_svc.get_welcome_overview(None) is first
+
+
+def test_get_welcome_overview_invalidated_on_delete(article_svc: ArticleService):
+    """Ensures that deleting an article refreshes the cached welcome overview."""
+    before = article_svc.get_welcome_overview(None)
+    article_svc.delete_article(user_data.root, article_data.article_one.id)
+    after = article_svc.get_welcome_overview(None)
+    assert after is not before
+    assert all(
+        article.id != article_data.article_one.id
+        for article in after.latest_news
+        + ([after.announcement] if after.announcement else [])
+    )
+
+
 def test_get_by_slug(article_svc: ArticleService):
     """Ensures that users can get articles."""
     article = article_svc.get_article(article_data.article_one.slug)
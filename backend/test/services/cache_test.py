@@ -0,0 +1,87 @@
+"""Tests for the ServiceCache class."""
+
+from datetime import timedelta
+
+# Tested Dependencies
+from ...services.cache import ServiceCache, clear_all_caches
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def test_get_or_compute_caches_value():
+    cache: ServiceCache[str, int] = ServiceCache()
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    assert cache.get_or_compute("key", compute) == 1
+    assert cache.get_or_compute("key", compute) == 1
+    assert len(calls) == 1
+
+
+def test_get_or_compute_caches_none():
+    cache: ServiceCache[str, int | None] = ServiceCache()
+    calls = []
+    compute = lambda: calls.append(1)
+    assert cache.get_or_compute("key", compute) is None
+    assert cache.get_or_compute("key", compute) is None
+    assert len(calls) == 1
+
+
+def test_invalidate():
+    cache: ServiceCache[str, int] = ServiceCache()
+    cache.set("key", 1)
+    cache.set("other", 2)
+    cache.invalidate("key")
+    assert cache.get("key") is None
+    assert cache.get("other") == 2
+
+
+def test_update():
+    cache: ServiceCache[str, int] = ServiceCache()
+    cache.set("key", 1)
+    cache.update("key", lambda value: value + 1)
+    cache.update("missing", lambda value: value + 1)
+    assert cache.get("key") == 2
+    assert not cache.contains("missing")
+
+
+def test_update_keeps_expiry():
+    cache: ServiceCache[str, int] = ServiceCache(ttl=timedelta(0))
+    cache.set("key", 1)
+    cache.update("key", lambda value: value + 1)
+    assert not cache.contains("key")
+
+
+def test_expired_entries_are_missing():
+    cache: ServiceCache[str, int] = ServiceCache(ttl=timedelta(0))
+    cache.set("key", 1)
+    assert not cache.contains("key")
+    assert cache.get("key") is None
+
+
+def test_invalidation_during_compute_is_not_stored():
+    cache: ServiceCache[str, int] = ServiceCache()
+
+    def compute() -> int:
+        cache.invalidate("key")
+        return 1
+
+    assert cache.get_or_compute("key", compute) == 1
+    assert not cache.contains("key")
+
+
+def test_invalidate_clears_dependent_caches():
+    dependency: ServiceCache[str, int] = ServiceCache()
+    dependent: ServiceCache[str, int] = ServiceCache(depends_on=[dependency])
+    dependency.set("key", 1)
+    dependent.set("derived", 2)
+    dependency.invalidate("key")
+    assert dependent.get("derived") is None
+
+
+def test_clear_all_caches():
+    cache: ServiceCache[str, int] = ServiceCache()
+    cache.set("key", 1)
+    clear_all_caches()
+    assert cache.get("key") is None
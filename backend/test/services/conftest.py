@@ -9,6 +9,7 @@ from sqlalchemy.exc import OperationalError, ProgrammingError
 from ...database import _engine_str
 from ...env import getenv
 from ... import entities
+from ...services.cache import clear_all_caches
 
 POSTGRES_DATABASE = f'{getenv("POSTGRES_DATABASE")}_test'
 POSTGRES_USER = getenv("POSTGRES_USER")
@@ -51,6 +52,7 @@ def test_engine() -> Engine:
 def session(test_engine: Engine):
     entities.EntityBase.metadata.drop_all(test_engine)
     entities.EntityBase.metadata.create_all(test_engine)
+    clear_all_caches()
     session = Session(test_engine)
     try:
         yield session
@@ -3,6 +3,7 @@
 from unittest.mock import create_autospec, call
 
 from ....services.coworking import OperatingHoursService
+from ....services.coworking.operating_hours import upcoming_schedule_cache
 from ....models.coworking import OperatingHours, TimeRange
 from ....services.coworking.exceptions import OperatingHoursCannotOverlapException
 from ....services import PermissionService
@@ -55,6 +56,43 @@ def test_schedule_multiple_match(
     assert result[1].id == operating_hours_data.future.id
 
 
+def test_upcoming_schedule(operating_hours_svc: OperatingHoursService):
+    """Upcoming schedule includes operating hours from now through the window."""
+    result = operating_hours_svc.upcoming_schedule(ONE_DAY * 2)
+    assert [operating_hours.id for operating_hours in result] == [
+        operating_hours_data.today.id,
+        operating_hours_data.tomorrow.id,
+        operating_hours_data.future.id,
+    ]
+
+
+def test_upcoming_schedule_excludes_closed_hours(
+    operating_hours_svc: OperatingHoursService, time: dict[str, datetime]
+):
+    """Operating hours that closed since the upcoming schedule was cached are not returned."""
+    hour = time[NOW].replace(minute=0, second=0, microsecond=0)
+    closed = OperatingHours(id=5, start=hour - ONE_HOUR, end=time[NOW] - ONE_MINUTE)
+    upcoming_schedule_cache.set(
+        (ONE_DAY * 2, hour), [closed, operating_hours_data.today]
+    )
+    result = operating_hours_svc.upcoming_schedule(ONE_DAY * 2)
+    assert [operating_hours.id for operating_hours in result] == [
+        operating_hours_data.today.id
+    ]
+
+
+def test_upcoming_schedule_invalidated_on_delete(
+    operating_hours_svc: OperatingHoursService,
+):
+    """Deleting operating hours removes them from the cached upcoming schedule."""
+    assert len(operating_hours_svc.upcoming_schedule(ONE_DAY * 2)) == 3
+    operating_hours_svc.delete(user_data.root, operating_hours_data.future)
+    result = operating_hours_svc.upcoming_schedule(ONE_DAY * 2)
+    assert operating_hours_data.future.id not in [
+        operating_hours.id for operating_hours in result
+    ]
+
+
 def test_create(operating_hours_svc: OperatingHoursService, time: dict[str, datetime]):
     """Creating an Operating Hours entity expected case."""
     time_range = TimeRange(
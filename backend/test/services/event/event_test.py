@@ -1,7 +1,11 @@
 """Tests for the EventService class."""
 
 # PyTest
+import csv
+import io
+import json
 import pytest
+from sqlalchemy import select, update
 from unittest.mock import create_autospec
 from backend.models.pagination import PaginationParams
 
@@ -18,7 +22,9 @@ from ..coworking.time import *
 
 # Tested Dependencies
 from ....models import EventDraft, EventOverview, EventPaginationParams
+from ....models.export_format import ExportFormat
 from ....services import EventService
+from ....entities import EventEntity
 
 # Injected Service Fixtures
 from ..fixtures import (
@@ -236,6 +242,75 @@ def test_register_for_event_as_user_twice(event_svc_integration: EventService):
     assert created_registration_1 == created_registration_2
 
 
+def test_register_for_event_increments_registration_count(
+    event_svc_integration: EventService,
+):
+    """Test that registering maintains the event's registration counter."""
+    event_details = event_svc_integration.get_by_id(event_one.id, root)  # type: ignore
+    event_svc_integration.register(root, root, event_details)
+    updated_details = event_svc_integration.get_by_id(event_one.id, root)  # type: ignore
+    assert updated_details.number_registered == event_details.number_registered + 1
+
+
+def test_register_for_event_twice_does_not_increment_registration_count(
+    event_svc_integration: EventService,
+):
+    """Test that an idempotent registration does not claim a second spot."""
+    event_details = event_svc_integration.get_by_id(event_one.id, root)  # type: ignore
+    event_svc_integration.register(root, root, event_details)
+    event_svc_integration.register(root, root, event_details)
+    updated_details = event_svc_integration.get_by_id(event_one.id, root)  # type: ignore
+    assert updated_details.number_registered == event_details.number_registered + 1
+
+
+def test_register_uses_current_registration_count(
+    event_svc_integration: EventService,
+):
+    """Test that the capacity check uses the database counter rather than a stale overview."""
+    stale_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    stale_details.number_registered = 0
+    with pytest.raises(EventRegistrationException):
+        event_svc_integration.register(user, user, stale_details)
+
+
+def test_unregister_decrements_registration_count(
+    event_svc_integration: EventService,
+):
+    """Test that unregistering releases the attendee's spot."""
+    event_details = event_svc_integration.get_by_id(event_three.id, ambassador)  # type: ignore
+    event_svc_integration.unregister(ambassador, ambassador, event_details)
+    updated_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    assert updated_details.number_registered == event_details.number_registered - 1
+    event_svc_integration.register(user, user, updated_details)
+
+
+def test_unregister_twice_decrements_registration_count_once(
+    event_svc_integration: EventService,
+):
+    """Test that a concurrent unregister that lost the race does not release a second spot."""
+    event_details = event_svc_integration.get_by_id(event_three.id, ambassador)  # type: ignore
+    registration = event_svc_integration.get_registration(
+        ambassador, ambassador, event_details
+    )
+    event_svc_integration.unregister(ambassador, ambassador, event_details)
+
+    # Simulate a second request that read the registration before it was deleted
+    event_svc_integration.get_registration = lambda *_: registration  # type: ignore
+    event_svc_integration.unregister(ambassador, ambassador, event_details)
+
+    updated_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    assert updated_details.number_registered == event_details.number_registered - 1
+
+
+def test_update_promoting_attendee_decrements_registration_count(
+    event_svc_integration: EventService,
+):
+    """Test that an attendee promoted to organizer no longer counts towards the limit."""
+    event_details = event_svc_integration.get_by_id(event_one.id)  # type: ignore
+    updated = event_svc_integration.update(root, updated_event_one_organizers)
+    assert updated.number_registered == event_details.number_registered - 1
+
+
 def test_register_for_event_enforces_permission(event_svc_integration: EventService):
     event_svc_integration._permission = create_autospec(
         event_svc_integration._permission
@@ -529,8 +604,139 @@ def test_get_registered_users_of_event_without_permissions(
     )
 
 
+def test_export_registered_users_of_event_csv(event_svc_integration: EventService):
+    """Tests streaming the attendees of an event as CSV"""
+    chunks = event_svc_integration.export_registered_users_of_event(
+        user, event_one.id, ExportFormat.CSV
+    )
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == 1
+    assert rows[0]["id"] == str(ambassador.id)
+    assert rows[0]["onyen"] == ambassador.onyen
+
+
+def test_export_registered_users_of_event_ndjson(event_svc_integration: EventService):
+    """Tests streaming the attendees of an event as newline-delimited JSON"""
+    chunks = event_svc_integration.export_registered_users_of_event(
+        root, event_one.id, ExportFormat.NDJSON
+    )
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [row["id"] for row in rows] == [ambassador.id]
+
+
+def test_export_registered_users_of_event_no_attendees(
+    event_svc_integration: EventService,
+):
+    """Tests that an export of an event without attendees contains only the header"""
+    chunks = event_svc_integration.export_registered_users_of_event(
+        root, event_two.id, ExportFormat.CSV
+    )
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert rows == []
+
+
+def test_export_registered_users_of_event_without_permissions(
+    event_svc_integration: EventService,
+):
+    """Tests that exporting attendees enforces permissions before streaming"""
+    with pytest.raises(UserPermissionException):
+        event_svc_integration.export_registered_users_of_event(
+            ambassador, event_one.id, ExportFormat.CSV
+        )
+
+
 def test_get_event_status(event_svc_integration: EventService):
     status = event_svc_integration.get_event_status(user)
     assert status is not None
     assert status.featured is not None
     assert len(status.registered) == 1
+
+
+def test_to_overview_models_matches_single_conversion(
+    event_svc_integration: EventService,
+):
+    """Tests that the bulk overview builder produces the same models as the per-entity conversion."""
+    entities = event_svc_integration._session.scalars(
+        select(EventEntity).order_by(EventEntity.id)
+    ).all()
+    overviews = event_svc_integration.to_overview_models(entities, ambassador)
+    assert overviews == [entity.to_overview_model(ambassador) for entity in entities]
+
+
+def test_to_overview_models_unauthenticated(event_svc_integration: EventService):
+    """Tests that the bulk overview builder omits registration types without a subject."""
+    entities = event_svc_integration._session.scalars(select(EventEntity)).all()
+    overviews = event_svc_integration.to_overview_models(entities)
+    assert len(overviews) == len(entities)
+    assert all(overview.user_registration_type is None for overview in overviews)
+
+
+def test_to_overview_models_empty(event_svc_integration: EventService):
+    """Tests that the bulk overview builder handles an empty list without querying."""
+    assert event_svc_integration.to_overview_models([], ambassador) == []
+
+
+def test_get_event_status_unauthenticated(event_svc_integration: EventService):
+    """Tests that unauthenticated users see the featured event without registrations."""
+    status = event_svc_integration.get_event_status_unauthenticated()
+    assert status.featured is not None
+    assert status.featured.user_registration_type is None
+    assert status.registered == []
+
+
+def test_get_event_status_featured_is_cached(event_svc_integration: EventService):
+    """Tests that the featured event is computed once and shared across requests."""
+    featured = event_svc_integration.get_featured_event()
+    assert featured is not None
+    event_svc_integration._session.execute(
+        update(EventEntity)
+        .where(EventEntity.id == featured.id)
+        .values(name="Renamed Outside The Service")
+    )
+    assert event_svc_integration.get_featured_event() == featured
+
+
+def test_get_event_status_featured_invalidated_on_delete(
+    event_svc_integration: EventService,
+):
+    """Tests that deleting the featured event recomputes the cached featured event."""
+    featured = event_svc_integration.get_featured_event()
+    assert featured is not None
+    event_svc_integration.delete(root, featured.id)
+    refreshed = event_svc_integration.get_featured_event()
+    assert refreshed is None or refreshed.id != featured.id
+
+
+def test_get_event_status_featured_updated_on_register(
+    event_svc_integration: EventService,
+):
+    """Tests that registering for the featured event updates its cached registration count."""
+    featured = event_svc_integration.get_featured_event()
+    assert featured is not None
+    event_svc_integration._session.execute(
+        update(EventEntity)
+        .where(EventEntity.id == featured.id)
+        .values(name="Renamed Outside The Service")
+    )
+    event_svc_integration.register(root, root, featured)
+    refreshed = event_svc_integration.get_featured_event()
+    assert refreshed is not None
+    assert refreshed.name == featured.name
+    assert refreshed.number_registered == featured.number_registered + 1
+
+    event_svc_integration.unregister(root, root, featured)
+    refreshed = event_svc_integration.get_featured_event()
+    assert refreshed is not None
+    assert refreshed.number_registered == featured.number_registered
+
+
+def test_get_event_status_featured_shows_user_registration(
+    event_svc_integration: EventService,
+):
+    """Tests that the featured event reflects the subject's registration."""
+    featured = event_svc_integration.get_featured_event()
+    assert featured is not None
+    event_svc_integration.register(root, root, featured)
+    status = event_svc_integration.get_event_status(root)
+    assert status.featured is not None
+    assert status.featured.user_registration_type is not None
@@ -97,6 +97,7 @@ def article_svc(session: Session):
         PermissionService(session),
         PolicyService(),
         OperatingHoursService(session, PermissionService(session)),
+        EventService(session, PermissionService(session)),
     )
 
 
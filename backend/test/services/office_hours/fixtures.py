@@ -8,6 +8,7 @@ from ....services.office_hours.office_hours_recurrence import (
     OfficeHoursRecurrenceService,
 )
 from ....services import PermissionService
+from ....services.academics.course_membership import CourseMembershipResolver
 from ....services.office_hours import OfficeHourTicketService, OfficeHoursService
 
 __authors__ = ["Meghan Sun", "Jade Keegan"]
@@ -24,7 +25,7 @@ def permission_svc(session: Session):
 @pytest.fixture()
 def oh_svc(session: Session):
     """OfficeHoursEventService fixture."""
-    return OfficeHoursService(session)
+    return OfficeHoursService(session, CourseMembershipResolver(session))
 
 
 @pytest.fixture()
@@ -42,4 +43,6 @@ def oh_ticket_svc(session: Session):
 @pytest.fixture()
 def oh_recurrence_svc(session: Session):
     """OfficeHoursRecurrenceService fixture."""
-    return OfficeHoursRecurrenceService(session, OfficeHoursService(session))
+    return OfficeHoursRecurrenceService(
+        session, OfficeHoursService(session, CourseMembershipResolver(session))
+    )
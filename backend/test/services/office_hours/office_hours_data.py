@@ -371,6 +371,8 @@ def insert_fake_data(session: Session):
                         {
                             "ticket_id": ticket.id,
                             "member_id": user_id,
+                            "office_hours_id": ticket.office_hours_id,
+                            "queued": ticket.state == TicketState.QUEUED,
                         }
                     )
                 )
@@ -446,6 +448,18 @@ updated_comp_110_site = UpdatedCourseSite(
     gtas=[],
 )
 
+updated_comp_110_site_new_section = UpdatedCourseSite(
+    id=1,
+    title="New Course Site",
+    term_id=term_data.current_term.id,
+    section_ids=[
+        section_data.comp_110_001_current_term.id,
+        section_data.comp_301_002_current_term.id,
+    ],
+    utas=[],
+    gtas=[],
+)
+
 updated_comp_110_site_term_mismatch = UpdatedCourseSite(
     id=1,
     title="New Course Site",
@@ -548,6 +562,23 @@ updated_recurrence_pattern = NewOfficeHoursRecurrencePattern(
     recur_sunday=True,
 )
 
+
+def new_virtual_daily_event(start_time: datetime) -> NewOfficeHours:
+    """Builds a two hour event to start a virtual daily recurrence pattern with."""
+    return new_event.model_copy(
+        update={"start_time": start_time, "end_time": start_time + timedelta(hours=2)}
+    )
+
+
+def new_virtual_daily_recurrence_pattern(
+    start_date: datetime, end_date: datetime
+) -> NewOfficeHoursRecurrencePattern:
+    """Builds a virtual recurrence pattern for every day from start_date to end_date."""
+    return new_recurrence_pattern.model_copy(
+        update={"start_date": start_date, "end_date": end_date, "virtual": True}
+    )
+
+
 invalid_recurrence_pattern_days = NewOfficeHoursRecurrencePattern(
     start_date=datetime.now(),
     end_date=datetime.now() + timedelta(days=14),
@@ -1,6 +1,16 @@
 """Tests for the OfficeHoursRecurrenceService."""
 
 import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ....entities.office_hours import OfficeHoursEntity, OfficeHoursTicketEntity
+from ....models.office_hours.office_hours_recurrence_pattern import (
+    NewOfficeHoursRecurrencePattern,
+)
+from ....models.office_hours.ticket_state import TicketState
+from ....models.office_hours.ticket_type import TicketType
 
 from ....services.exceptions import (
     CoursePermissionException,
@@ -44,6 +54,44 @@ def test_create_recurring_oh_event_instructor(
     assert new_events[0].recurrence_pattern_id is not None
 
 
+def test_create_recurring_oh_event_occurrences(
+    oh_recurrence_svc: OfficeHoursRecurrenceService,
+):
+    """Ensures one event is created per selected weekday, in order, keeping the event's times."""
+    start = datetime.now()
+    pattern = NewOfficeHoursRecurrencePattern(
+        start_date=start,
+        end_date=start + timedelta(days=13),
+        recur_monday=True,
+        recur_tuesday=False,
+        recur_wednesday=True,
+        recur_thursday=False,
+        recur_friday=True,
+        recur_saturday=False,
+        recur_sunday=False,
+    )
+    new_events = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_event,
+        pattern,
+    )
+
+    duration = (
+        office_hours_data.new_event.end_time - office_hours_data.new_event.start_time
+    )
+    # Two weeks contain each selected weekday exactly twice
+    assert len(new_events) == 6
+    assert {event.start_time.weekday() for event in new_events} == {0, 2, 4}
+    assert [event.start_time for event in new_events] == sorted(
+        event.start_time for event in new_events
+    )
+    for event in new_events:
+        assert event.start_time.time() == office_hours_data.new_event.start_time.time()
+        assert event.end_time - event.start_time == duration
+    assert len({event.recurrence_pattern_id for event in new_events}) == 1
+
+
 def test_create_recurring_oh_event_not_authenticated(
     oh_recurrence_svc: OfficeHoursRecurrenceService,
 ):
@@ -112,6 +160,39 @@ def test_delete_recurring_oh_event_instructor(
     )
 
 
+def test_delete_recurring_oh_event_deletes_future_events_and_tickets(
+    oh_recurrence_svc: OfficeHoursRecurrenceService, session: Session
+):
+    """Ensures deleting a recurring event removes it, later events in its pattern, and their tickets."""
+    events = oh_recurrence_svc.create_recurring(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        office_hours_data.new_event,
+        office_hours_data.new_recurrence_pattern,
+    )
+    ticket = OfficeHoursTicketEntity(
+        description="Help with recursion",
+        type=TicketType.CONCEPTUAL_HELP,
+        state=TicketState.QUEUED,
+        office_hours_id=events[2].id,
+    )
+    session.add(ticket)
+    session.commit()
+    ticket_id = ticket.id
+
+    oh_recurrence_svc.delete_recurring(
+        user_data.instructor, office_hours_data.comp_110_site.id, events[1].id
+    )
+
+    remaining_ids = session.scalars(
+        select(OfficeHoursEntity.id).where(
+            OfficeHoursEntity.recurrence_pattern_id == events[0].recurrence_pattern_id
+        )
+    ).all()
+    assert remaining_ids == [events[0].id]
+    assert session.get(OfficeHoursTicketEntity, ticket_id) is None
+
+
 def test_delete_recurring_oh_event_not_found(
     oh_recurrence_svc: OfficeHoursRecurrenceService,
 ):
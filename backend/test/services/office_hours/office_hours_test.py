@@ -8,11 +8,11 @@ from ....models.academics.my_courses import (
     OfficeHourEventRoleOverview,
 )
 from ....models.office_hours.office_hours import NewOfficeHours, OfficeHours
-from ....services.office_hours import OfficeHoursService
+from ....services.office_hours import OfficeHoursService, OfficeHourTicketService
 from ....services.exceptions import CoursePermissionException, ResourceNotFoundException
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
-from .fixtures import oh_svc
+from .fixtures import oh_svc, oh_ticket_svc
 
 # Import the setup_teardown fixture explicitly to load entities in database
 from ..core_data import setup_insert_data_fixture as insert_order_0
@@ -44,6 +44,30 @@ def test_get_office_hour_queue(oh_svc: OfficeHoursService):
     assert queue.queue[0].id == office_hours_data.comp_110_queued_ticket.id
 
 
+def test_get_office_hour_queue_statistics(oh_svc: OfficeHoursService):
+    """Ensures the queue overview aggregates the tickets called so far."""
+    queue = oh_svc.get_office_hour_queue(
+        user_data.instructor, office_hours_data.comp_110_current_office_hours.id
+    )
+    # One called and one closed ticket, each waiting about a minute to be called
+    assert queue.total_tickets_called == 2
+    assert queue.personal_tickets_called == 2
+    assert queue.average_minutes == 1
+    assert queue.average_handle_minutes == 1
+    assert queue.median_wait_minutes == 1
+    assert queue.p90_wait_minutes == 1
+
+
+def test_get_office_hour_queue_statistics_for_other_staff(oh_svc: OfficeHoursService):
+    """Ensures personal statistics only count tickets called by the requesting user."""
+    queue = oh_svc.get_office_hour_queue(
+        user_data.uta, office_hours_data.comp_110_current_office_hours.id
+    )
+    assert queue.total_tickets_called == 2
+    assert queue.personal_tickets_called == 0
+    assert queue.average_minutes == 0
+
+
 def test_get_office_hour_queue_not_member(oh_svc: OfficeHoursService):
     """Ensures that non-members of the course cannot access the office hour queue."""
     with pytest.raises(CoursePermissionException):
@@ -73,6 +97,34 @@ def test_get_help_overview(oh_svc: OfficeHoursService):
     assert overview.queue_position == 1
 
 
+def test_get_help_overview_queue_position_behind_earlier_tickets(
+    oh_svc: OfficeHoursService, oh_ticket_svc: OfficeHourTicketService
+):
+    """Ensures a new ticket is positioned behind the tickets queued before it."""
+    created = oh_ticket_svc.create_ticket(user_data.user, office_hours_data.new_ticket)
+    overview = oh_svc.get_office_hour_get_help_overview(
+        user_data.user, office_hours_data.comp_110_current_office_hours.id
+    )
+    assert overview.ticket is not None
+    assert overview.ticket.id == created.id
+    assert overview.queue_position == 2
+
+
+def test_get_help_overview_called_ticket_has_no_position(
+    oh_svc: OfficeHoursService, oh_ticket_svc: OfficeHourTicketService
+):
+    """Ensures a ticket that has been called is no longer given a queue position."""
+    oh_ticket_svc.cancel_ticket(
+        user_data.instructor, office_hours_data.comp_110_queued_ticket.id
+    )
+    overview = oh_svc.get_office_hour_get_help_overview(
+        user_data.student, office_hours_data.comp_110_current_office_hours.id
+    )
+    assert overview.ticket is not None
+    assert overview.ticket.id == office_hours_data.comp_110_called_ticket.id
+    assert overview.queue_position == -1
+
+
 def test_get_help_overview_not_member(oh_svc: OfficeHoursService):
     """Ensures non-members cannot access the get help overview information."""
     with pytest.raises(CoursePermissionException):
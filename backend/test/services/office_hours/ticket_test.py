@@ -1,12 +1,22 @@
 """Tests for the OfficeHoursTicketService."""
 
+import asyncio
 import pytest
-
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ....entities.office_hours import (
+    OfficeHoursTicketEntity,
+    user_created_tickets_table,
+)
 from ....models.academics.my_courses import OfficeHourTicketOverview
 
 from ....models.office_hours.ticket import TicketState
+from ....models.office_hours.queue_event import OfficeHoursQueueEvent, QueueEventType
 
 from ....services.office_hours import OfficeHourTicketService
+from ....services.office_hours.queue_broadcaster import queue_broadcaster
 from ....services.exceptions import CoursePermissionException, ResourceNotFoundException
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
@@ -200,3 +210,125 @@ def test_create_ticket_not_student(oh_ticket_svc: OfficeHourTicketService):
     with pytest.raises(CoursePermissionException):
         oh_ticket_svc.create_ticket(user_data.instructor, office_hours_data.new_ticket)
         pytest.fail()
+
+
+def test_create_ticket_after_cancel(oh_ticket_svc: OfficeHourTicketService):
+    """Ensures that students can create a new ticket once their queued ticket is canceled."""
+    first = oh_ticket_svc.create_ticket(user_data.user, office_hours_data.new_ticket)
+    oh_ticket_svc.cancel_ticket(user_data.user, first.id)
+    second = oh_ticket_svc.create_ticket(user_data.user, office_hours_data.new_ticket)
+    assert second.id != first.id
+    assert second.state == TicketState.QUEUED.to_string()
+
+
+def test_create_ticket_after_call(oh_ticket_svc: OfficeHourTicketService):
+    """Ensures that students can create a new ticket once their queued ticket is called."""
+    first = oh_ticket_svc.create_ticket(user_data.user, office_hours_data.new_ticket)
+    oh_ticket_svc.call_ticket(user_data.instructor, first.id)
+    second = oh_ticket_svc.create_ticket(user_data.user, office_hours_data.new_ticket)
+    assert second.state == TicketState.QUEUED.to_string()
+
+
+def test_queued_ticket_creators_are_unique(
+    oh_ticket_svc: OfficeHourTicketService, session: Session
+):
+    """Ensures that the database rejects a second queued ticket for the same creator and event."""
+    created = oh_ticket_svc.create_ticket(user_data.user, office_hours_data.new_ticket)
+    member_id = session.execute(
+        select(user_created_tickets_table.c.member_id).where(
+            user_created_tickets_table.c.ticket_id == created.id
+        )
+    ).scalar_one()
+    duplicate = OfficeHoursTicketEntity.from_new_model(office_hours_data.new_ticket)
+    session.add(duplicate)
+    session.flush()
+    with pytest.raises(IntegrityError):
+        session.execute(
+            user_created_tickets_table.insert().values(
+                ticket_id=duplicate.id,
+                member_id=member_id,
+                office_hours_id=office_hours_data.new_ticket.office_hours_id,
+                queued=True,
+            )
+        )
+    session.rollback()
+
+
+# Queue Event Tests
+
+
+def _publish_during(office_hours_id: int, action) -> list[OfficeHoursQueueEvent]:
+    """Runs an action while subscribed to a queue and returns the events published."""
+
+    async def collect() -> list[OfficeHoursQueueEvent]:
+        subscription = queue_broadcaster.subscribe(office_hours_id)
+        try:
+            action()
+            await asyncio.sleep(0)
+            events = []
+            while not subscription._events.empty():
+                events.append(await subscription.get())
+            return events
+        finally:
+            queue_broadcaster.unsubscribe(subscription)
+
+    return asyncio.run(collect())
+
+
+def test_call_ticket_publishes_event(oh_ticket_svc: OfficeHourTicketService):
+    """Ensures that calling a ticket notifies subscribers of its queue."""
+    events = _publish_during(
+        office_hours_data.comp_110_current_office_hours.id,
+        lambda: oh_ticket_svc.call_ticket(
+            user_data.instructor, office_hours_data.comp_110_queued_ticket.id
+        ),
+    )
+    assert len(events) == 1
+    assert events[0].type == QueueEventType.CALLED
+    assert events[0].ticket_id == office_hours_data.comp_110_queued_ticket.id
+    assert events[0].ticket is not None
+    assert events[0].ticket.state == TicketState.CALLED.to_string()
+
+
+def test_create_ticket_publishes_event(oh_ticket_svc: OfficeHourTicketService):
+    """Ensures that creating a ticket notifies subscribers of its queue."""
+    created: list[OfficeHourTicketOverview] = []
+    events = _publish_during(
+        office_hours_data.new_ticket.office_hours_id,
+        lambda: created.append(
+            oh_ticket_svc.create_ticket(user_data.user, office_hours_data.new_ticket)
+        ),
+    )
+    assert len(events) == 1
+    assert events[0].type == QueueEventType.CREATED
+    assert events[0].ticket_id == created[0].id
+    assert events[0].ticket_created_at == created[0].created_at
+
+
+def test_failed_action_publishes_nothing(oh_ticket_svc: OfficeHourTicketService):
+    """Ensures that subscribers are not notified of changes that were not committed."""
+
+    def close_queued_ticket():
+        with pytest.raises(CoursePermissionException):
+            oh_ticket_svc.close_ticket(
+                user_data.instructor, office_hours_data.comp_110_queued_ticket.id
+            )
+
+    events = _publish_during(
+        office_hours_data.comp_110_current_office_hours.id, close_queued_ticket
+    )
+    assert events == []
+
+
+def test_events_only_reach_subscribers_of_the_queue(
+    oh_ticket_svc: OfficeHourTicketService,
+):
+    """Ensures that events are delivered only to subscribers of the changed queue."""
+    events = _publish_during(
+        404,
+        lambda: oh_ticket_svc.cancel_ticket(
+            user_data.instructor, office_hours_data.comp_110_queued_ticket.id
+        ),
+    )
+    assert events == []
+    assert queue_broadcaster.subscriber_count(404) == 0
@@ -1,10 +1,14 @@
 """Tests for the UserService class."""
 
+import csv
+import io
+import json
 import pytest
 
 # Tested Dependencies
 from ...models.user import User, NewUser
 from ...models.pagination import PaginationParams
+from ...models.export_format import ExportFormat
 from ...services import UserService, PermissionService
 from ...services.exceptions import ResourceNotFoundException
 
@@ -188,6 +192,31 @@ def test_list_enforces_permission(
     permission_svc_mock.enforce.assert_called_with(ambassador, "user.list", "user/")
 
 
+def test_export_csv(user_svc: UserService):
+    """Test that users are streamed as CSV rows ordered by id."""
+    chunks = user_svc.export(ambassador, "", ExportFormat.CSV)
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == len(user_data.users)
+    assert rows[0]["id"] == str(root.id)
+    assert rows[0]["onyen"] == root.onyen
+
+
+def test_export_ndjson_filter(user_svc: UserService):
+    """Test that users are filtered and streamed as newline-delimited JSON."""
+    chunks = user_svc.export(ambassador, "amy", ExportFormat.NDJSON)
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["id"] == ambassador.id
+
+
+def test_export_enforces_permission_before_streaming(
+    user_svc: UserService, permission_svc_mock: PermissionService
+):
+    """Test that user.list on user/ is enforced before any row is streamed"""
+    user_svc.export(ambassador, "", ExportFormat.CSV)
+    permission_svc_mock.enforce.assert_called_with(ambassador, "user.list", "user/")
+
+
 def test_create_user_as_user_registration(user_svc: UserService):
     """Test that a user can be created for registration purposes."""
     new_user = NewUser(pid=123456789, onyen="new_user", email="new_user@unc.edu")
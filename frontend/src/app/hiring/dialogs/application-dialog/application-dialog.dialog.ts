@@ -9,19 +9,23 @@
 import { Component, Inject, OnDestroy, OnInit } from '@angular/core';
 import { MAT_DIALOG_DATA, MatDialogRef } from '@angular/material/dialog';
 import {
-  ApplicationReviewOverview,
-  ApplicationReviewStatus,
-  HiringStatus
+  ApplicationReviewChange,
+  ApplicationReviewOverview
 } from '../../hiring.models';
 import { FormControl } from '@angular/forms';
 import { HiringService } from '../../hiring.service';
-import { Subscription, debounce, debounceTime, interval, timer } from 'rxjs';
+import {
+  Observable,
+  Subscription,
+  concatMap,
+  debounceTime,
+  tap
+} from 'rxjs';
 
 export interface ApplicationDialogData {
   courseSiteId: number;
   review: ApplicationReviewOverview;
   viewOnly?: boolean;
-  status?: HiringStatus;
 }
 
 @Component({
@@ -45,10 +49,12 @@ export class ApplicationDialog implements OnInit, OnDestroy {
   ngOnInit(): void {
     if (!this.data.viewOnly) {
       this.notesSubcription = this.notesSubcription = this.notes.valueChanges
-        .pipe(debounceTime(200))
-        .subscribe((_) => {
-          this.saveData();
-        });
+        .pipe(
+          debounceTime(200),
+          // Save one change at a time so each is made from the latest version
+          concatMap(() => this.saveData())
+        )
+        .subscribe();
     }
   }
 
@@ -62,26 +68,24 @@ export class ApplicationDialog implements OnInit, OnDestroy {
     return splitUrl?.length ?? 0 > 0 ? splitUrl![1] : undefined;
   }
 
-  saveData() {
-    // Replace the current review based on its place in the hiring status.
-    if (this.data.review.status == ApplicationReviewStatus.NOT_PREFERRED) {
-      this.data.status!.not_preferred[this.data.review.preference].notes =
-        this.notes.value ?? '';
-    }
-    if (this.data.review.status == ApplicationReviewStatus.NOT_PROCESSED) {
-      this.data.status!.not_processed[this.data.review.preference].notes =
-        this.notes.value ?? '';
-    }
-    if (this.data.review.status == ApplicationReviewStatus.PREFERRED) {
-      this.data.status!.preferred[this.data.review.preference].notes =
-        this.notes.value ?? '';
-    }
-
-    // Persist the data
-    this.hiringService
-      .updateStatus(this.data.courseSiteId, this.data.status!)
-      .subscribe((hiringStatus) => {
-        this.data.status = hiringStatus;
-      });
+  /** Saves the notes of the review, and the version of the review they were saved as. */
+  saveData(): Observable<ApplicationReviewChange[]> {
+    const review = this.data.review;
+    return this.hiringService
+      .updateStatusChanges(this.data.courseSiteId, [
+        {
+          id: review.id!,
+          status: review.status,
+          preference: review.preference,
+          notes: this.notes.value ?? '',
+          version: review.version
+        }
+      ])
+      .pipe(
+        tap((saved) => {
+          review.notes = saved[0].notes;
+          review.version = saved[0].version;
+        })
+      );
   }
 }
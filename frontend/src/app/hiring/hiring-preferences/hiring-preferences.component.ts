@@ -15,8 +15,7 @@ import {
 import { Component, WritableSignal, signal } from '@angular/core';
 import {
   ApplicationReviewOverview,
-  ApplicationReviewStatus,
-  HiringStatus
+  ApplicationReviewStatus
 } from '../hiring.models';
 import { HiringService } from '../hiring.service';
 import { ActivatedRoute } from '@angular/router';
@@ -57,13 +56,7 @@ export class HiringPreferencesComponent {
     // Load route data
     this.courseSiteId = this.route.parent!.snapshot.params['courseSiteId'];
     // Load the initial hiring status.
-    this.hiringService
-      .getStatus(this.courseSiteId)
-      .subscribe((hiringStatus) => {
-        this.notPreferred = hiringStatus.not_preferred;
-        this.notProcessed = hiringStatus.not_processed;
-        this.preferred = hiringStatus.preferred;
-      });
+    this.loadHiringStatus();
   }
 
   drop(event: CdkDragDrop<ApplicationReviewOverview[]>) {
@@ -87,38 +80,67 @@ export class HiringPreferencesComponent {
     this.updateHiringStatus();
   }
 
-  /** Updates the hiring status data from the API. */
+  /** Loads the hiring status data from the API. */
+  loadHiringStatus() {
+    this.hiringService
+      .getStatus(this.courseSiteId)
+      .subscribe((hiringStatus) => {
+        this.notPreferred = hiringStatus.not_preferred;
+        this.notProcessed = hiringStatus.not_processed;
+        this.preferred = hiringStatus.preferred;
+      });
+  }
+
+  /** Saves the reviews whose column or position changed to the API. */
   updateHiringStatus() {
-    // Ensure that the indexes are updated for all of the columns.
-    for (let i = 0; i < this.notPreferred.length; i++) {
-      this.notPreferred[i].preference = i;
-      this.notPreferred[i].status = ApplicationReviewStatus.NOT_PREFERRED;
-    }
-    for (let i = 0; i < this.notProcessed.length; i++) {
-      this.notProcessed[i].preference = i;
-      this.notProcessed[i].status = ApplicationReviewStatus.NOT_PROCESSED;
-    }
-    for (let i = 0; i < this.preferred.length; i++) {
-      this.preferred[i].preference = i;
-      this.preferred[i].status = ApplicationReviewStatus.PREFERRED;
+    // Ensure that the indexes are updated for all of the columns, and collect
+    // only the reviews that moved.
+    const changed: ApplicationReviewOverview[] = [];
+    const renumber = (
+      column: ApplicationReviewOverview[],
+      status: ApplicationReviewStatus
+    ) => {
+      column.forEach((review, index) => {
+        if (review.preference !== index || review.status !== status) {
+          review.preference = index;
+          review.status = status;
+          changed.push(review);
+        }
+      });
+    };
+    renumber(this.notPreferred, ApplicationReviewStatus.NOT_PREFERRED);
+    renumber(this.notProcessed, ApplicationReviewStatus.NOT_PROCESSED);
+    renumber(this.preferred, ApplicationReviewStatus.PREFERRED);
+
+    if (changed.length === 0) {
+      this.isDropProcessing = false;
+      return;
     }
 
-    // Update in the database and sync
+    // Update in the database and keep the saved versions for the next change
     this.hiringService
-      .updateStatus(this.courseSiteId, {
-        not_preferred: this.notPreferred,
-        not_processed: this.notProcessed,
-        preferred: this.preferred
-      })
+      .updateStatusChanges(
+        this.courseSiteId,
+        changed.map((review) => ({
+          id: review.id!,
+          status: review.status,
+          preference: review.preference,
+          notes: review.notes,
+          version: review.version
+        }))
+      )
       .subscribe({
-        next: (hiringStatus) => {
-          this.notPreferred = hiringStatus.not_preferred;
-          this.notProcessed = hiringStatus.not_processed;
-          this.preferred = hiringStatus.preferred;
+        next: (saved) => {
+          const versions = new Map(saved.map((r) => [r.id, r.version]));
+          for (const review of changed) {
+            review.version = versions.get(review.id!) ?? review.version;
+          }
           this.isDropProcessing = false;
         },
         error: (error) => {
           this.saveErrorSnackBar(error);
+          // Nothing was saved, so show the board as it is in the database
+          this.loadHiringStatus();
           this.isDropProcessing = false;
         }
       });
@@ -127,7 +149,10 @@ export class HiringPreferencesComponent {
   private saveErrorSnackBar(error: Error) {
     let message = 'Error Saving Preferences: ';
     if (error instanceof HttpErrorResponse) {
-      if (error.status == 403) {
+      if (error.status == 409) {
+        message +=
+          'These applications were changed by someone else. The latest preferences have been reloaded, please try again.';
+      } else if (error.status == 403) {
         message +=
           "Request payload blocked by UNC's firewall. Be sure you are connected to Eduroam or via VPN, reload the page, and try again.";
       } else {
@@ -150,23 +175,12 @@ export class HiringPreferencesComponent {
       width: '800px',
       data: {
         courseSiteId: this.courseSiteId,
-        review: application,
-        status: {
-          not_preferred: this.notPreferred,
-          not_processed: this.notProcessed,
-          preferred: this.preferred
-        }
+        review: application
       }
     });
     dialogRef.afterClosed().subscribe((_) => {
       // Update the hiring data.
-      this.hiringService
-        .getStatus(this.courseSiteId)
-        .subscribe((hiringStatus) => {
-          this.notPreferred = hiringStatus.not_preferred;
-          this.notProcessed = hiringStatus.not_processed;
-          this.preferred = hiringStatus.preferred;
-        });
+      this.loadHiringStatus();
     });
   }
 
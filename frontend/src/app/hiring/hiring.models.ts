@@ -39,6 +39,7 @@ export interface ApplicationReviewOverview {
   status: ApplicationReviewStatus;
   preference: number;
   notes: string;
+  version: number;
   applicant_course_ranking: number;
 }
 
@@ -48,6 +49,14 @@ export interface HiringStatus {
   preferred: ApplicationReviewOverview[];
 }
 
+export interface ApplicationReviewChange {
+  id: number;
+  status: ApplicationReviewStatus;
+  preference: number;
+  notes: string;
+  version: number;
+}
+
 export enum ApplicationReviewStatus {
   NOT_PREFERRED = 'Not Preferred',
   NOT_PROCESSED = 'Not Processed',
@@ -181,3 +190,46 @@ export interface ConflictCheck {
   assignments: HiringAssignmentSummaryOverview[];
   priorities: ApplicationPriority[];
 }
+
+export interface HiringLevelRollup {
+  level_id: number;
+  title: string;
+  count: number;
+  cost: number;
+}
+
+export interface HiringRollup {
+  term_id: string;
+  total_enrollment: number;
+  total_cost: number;
+  coverage: number;
+  levels: HiringLevelRollup[];
+  status_counts: { [status in HiringAssignmentStatus]?: number };
+}
+
+export interface ConflictCheckCell {
+  application_id: number;
+  course_site_id: number;
+  student_priority: number;
+  instructor_priority: number;
+}
+
+export interface ConflictCheckAssignment {
+  id: number;
+  application_id: number;
+  course_site_id: number;
+  level_title: string;
+  status: HiringAssignmentStatus;
+}
+
+export interface ConflictCheckCourseSite {
+  id: number;
+  title: string;
+}
+
+export interface ConflictCheckMatrix {
+  term_id: string;
+  course_sites: ConflictCheckCourseSite[];
+  cells: ConflictCheckCell[];
+  assignments: ConflictCheckAssignment[];
+}
@@ -11,12 +11,15 @@ import { HttpClient, HttpParams } from '@angular/common/http';
 import { computed, Injectable, signal, WritableSignal } from '@angular/core';
 import { Observable, tap } from 'rxjs';
 import {
+  ApplicationReviewChange,
   ConflictCheck,
+  ConflictCheckMatrix,
   HiringAdminCourseOverview,
   HiringAdminOverview,
   HiringAssignmentDraft,
   HiringAssignmentOverview,
   HiringLevel,
+  HiringRollup,
   HiringStatus
 } from './hiring.models';
 import saveAs from 'file-saver';
@@ -52,6 +55,22 @@ export class HiringService {
     return this.http.put<HiringStatus>(`/api/hiring/${courseSiteId}`, status);
   }
 
+  /**
+   * Saves only the moved or edited reviews of a course site's hiring board.
+   * @param courseSiteId: ID of the course site the reviews belong to.
+   * @param changes: Changed reviews, with the versions they were changed from.
+   * @returns the saved reviews with their new versions.
+   */
+  updateStatusChanges(
+    courseSiteId: number,
+    changes: ApplicationReviewChange[]
+  ): Observable<ApplicationReviewChange[]> {
+    return this.http.patch<ApplicationReviewChange[]>(
+      `/api/hiring/${courseSiteId}`,
+      changes
+    );
+  }
+
   /**
    * Returns the state of hiring to the admin.
    * @param termId: ID for the term to get the hiring data for.
@@ -166,4 +185,19 @@ export class HiringService {
       `/api/hiring/conflict_check/${applicationId}`
     );
   }
+
+  /**
+   * Returns the term-wide coverage, costs, and assignment counts of hiring.
+   * @param termId: ID for the term to get the totals for.
+   * @returns { Observable<HiringRollup> }
+   */
+  getHiringRollup(termId: string): Observable<HiringRollup> {
+    return this.http.get<HiringRollup>(`/api/hiring/admin/${termId}/rollup`);
+  }
+
+  conflictCheckMatrix(termId: string): Observable<ConflictCheckMatrix> {
+    return this.http.get<ConflictCheckMatrix>(
+      `/api/hiring/admin/${termId}/conflict_check`
+    );
+  }
 }
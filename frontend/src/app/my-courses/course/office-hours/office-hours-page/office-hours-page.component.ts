@@ -11,7 +11,7 @@ import { Component, WritableSignal, signal } from '@angular/core';
 import { MatDialog } from '@angular/material/dialog';
 import { PageEvent } from '@angular/material/paginator';
 import { MatSnackBar } from '@angular/material/snack-bar';
-import { ActivatedRoute } from '@angular/router';
+import { ActivatedRoute, Router } from '@angular/router';
 import { DeleteRecurringEventDialog } from 'src/app/my-courses/dialogs/delete-recurring-event/delete-recurring-event.dialog';
 import {
   OfficeHourEventOverview,
@@ -72,6 +72,7 @@ export class OfficeHoursPageComponent {
 
   constructor(
     private route: ActivatedRoute,
+    private router: Router,
     protected myCoursesService: MyCoursesService,
     private snackBar: MatSnackBar,
     protected dialog: MatDialog
@@ -160,7 +161,25 @@ export class OfficeHoursPageComponent {
       });
   }
 
+  /** Opens the editor for office hours, storing a virtual occurrence first */
+  editOfficeHours(officeHours: OfficeHourEventOverview) {
+    this.myCoursesService
+      .getOfficeHoursId(+this.courseSiteId, officeHours)
+      .subscribe((id) => {
+        this.router.navigate([id, 'edit'], { relativeTo: this.route });
+      });
+  }
+
+  /** Deletes office hours, storing a virtual occurrence first */
   deleteOfficeHours(officeHours: OfficeHourEventOverview) {
+    this.myCoursesService
+      .getOfficeHoursId(+this.courseSiteId, officeHours)
+      .subscribe((id) => {
+        this.deleteStoredOfficeHours({ ...officeHours, id });
+      });
+  }
+
+  private deleteStoredOfficeHours(officeHours: OfficeHourEventOverview) {
     if (officeHours.recurrence_pattern_id) {
       // Options for deleting recurring evnets
       let dialogRef = this.dialog.open(DeleteRecurringEventDialog, {
@@ -186,7 +205,7 @@ export class OfficeHoursPageComponent {
       );
       confirmDelete.onAction().subscribe(() => {
         this.myCoursesService
-          .deleteOfficeHours(+this.courseSiteId, officeHours.id)
+          .deleteOfficeHours(+this.courseSiteId, officeHours.id!)
           .subscribe(() => {
             this.futureOfficeHourEventsPaginator
               .loadPage<OfficeHourEventOverviewJson>(
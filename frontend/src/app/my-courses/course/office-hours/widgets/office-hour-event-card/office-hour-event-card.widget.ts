@@ -8,6 +8,7 @@
  */
 
 import { Component, Input, OnInit } from '@angular/core';
+import { ActivatedRoute, Router } from '@angular/router';
 import {
   OfficeHourEventOverview,
   OfficeHourEventRoleOverview
@@ -23,15 +24,36 @@ import { Observable, map, of } from 'rxjs';
 export class OfficeHourEventCardWidget implements OnInit {
   /** The event to show */
   @Input() event!: OfficeHourEventOverview;
-  @Input() editRoute: string = '';
+  /** The course site the event belongs to */
+  @Input() courseSiteId!: number;
   /** Role for the event */
   role$: Observable<string> = of('');
 
-  constructor(protected myCoursesService: MyCoursesService) {}
+  constructor(
+    protected myCoursesService: MyCoursesService,
+    private router: Router,
+    private route: ActivatedRoute
+  ) {}
 
   ngOnInit(): void {
-    this.role$ = this.myCoursesService
-      .getOfficeHoursRole(this.event.id)
-      .pipe(map((roleData) => roleData.role));
+    // Occurrences of virtual recurrence patterns are not stored yet, so the
+    // user's role comes from the course site instead of the event
+    this.role$ =
+      this.event.id === null
+        ? of(
+            this.myCoursesService.courseOverview(this.courseSiteId)?.role ?? ''
+          )
+        : this.myCoursesService
+            .getOfficeHoursRole(this.event.id)
+            .pipe(map((roleData) => roleData.role));
+  }
+
+  /** Opens a page of the event, storing a virtual occurrence first */
+  open(page: string): void {
+    this.myCoursesService
+      .getOfficeHoursId(this.courseSiteId, this.event)
+      .subscribe((id) => {
+        this.router.navigate([id, page], { relativeTo: this.route });
+      });
   }
 }
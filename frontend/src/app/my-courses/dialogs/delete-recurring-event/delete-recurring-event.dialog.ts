@@ -23,13 +23,13 @@ export class DeleteRecurringEventDialog {
   confirm(): void {
     if (this.deleteAll) {
       this.myCoursesService
-        .deleteRecurringOfficeHours(this.data.siteId, this.data.officeHours.id)
+        .deleteRecurringOfficeHours(this.data.siteId, this.data.officeHours.id!)
         .subscribe(() => {
           this.close();
         });
     } else {
       this.myCoursesService
-        .deleteOfficeHours(this.data.siteId, this.data.officeHours.id)
+        .deleteOfficeHours(this.data.siteId, this.data.officeHours.id!)
         .subscribe(() => {
           this.close();
         });
@@ -63,9 +63,11 @@ export class ImportRosterDialog {
           .importRosterFromCanvasCSV(this.selectedSection.value!.id, csvData)
           .subscribe({
             next: (count) => {
-              this.snackBar.open(`Imported ${count.uploaded} students.`, '', {
-                duration: 5000
-              });
+              this.snackBar.open(
+                `Imported ${count.uploaded} students (${count.added.length} added, ${count.removed.length} removed).`,
+                '',
+                { duration: 5000 }
+              );
               // Close the dialog
               this.close();
             },
@@ -87,7 +87,7 @@ export interface CourseRosterOverview {
 }
 
 export interface OfficeHourEventOverviewJson {
-  id: number;
+  id: number | null;
   type: string;
   mode: string;
   description: string;
@@ -98,10 +98,12 @@ export interface OfficeHourEventOverviewJson {
   queued: number;
   total_tickets: number;
   recurrence_pattern_id: number;
+  virtual: boolean;
+  occurrence_date: string | null;
 }
 
 export interface OfficeHourEventOverview {
-  id: number;
+  id: number | null;
   type: string;
   mode: string;
   description: string;
@@ -112,6 +114,8 @@ export interface OfficeHourEventOverview {
   queued: number;
   total_tickets: number;
   recurrence_pattern_id: number;
+  virtual: boolean;
+  occurrence_date: string | null;
 }
 
 export interface OfficeHourTicketOverviewJson {
@@ -147,6 +151,9 @@ export interface OfficeHourQueueOverviewJson {
   personal_tickets_called: number;
   average_minutes: number;
   total_tickets_called: number;
+  average_handle_minutes: number;
+  median_wait_minutes: number;
+  p90_wait_minutes: number;
   history: OfficeHourTicketOverviewJson[];
 }
 
@@ -161,6 +168,9 @@ export interface OfficeHourQueueOverview {
   personal_tickets_called: number;
   average_minutes: number;
   total_tickets_called: number;
+  average_handle_minutes: number;
+  median_wait_minutes: number;
+  p90_wait_minutes: number;
   history: OfficeHourTicketOverview[];
 }
 
@@ -229,6 +239,13 @@ export interface CourseSite {
   term_id: string;
 }
 
+export interface RosterImportResponse {
+  uploaded: number;
+  created: string[];
+  added: string[];
+  removed: string[];
+}
+
 export interface NewOfficeHoursJson {
   type: number;
   mode: number;
@@ -261,6 +278,7 @@ export interface NewOfficeHoursRecurrencePattern {
   recur_friday: boolean;
   recur_saturday: boolean;
   recur_sunday: boolean;
+  virtual?: boolean;
 }
 
 export interface OfficeHoursRecurrencePattern {
@@ -274,6 +292,7 @@ export interface OfficeHoursRecurrencePattern {
   recur_friday: boolean;
   recur_saturday: boolean;
   recur_sunday: boolean;
+  virtual?: boolean;
 }
 
 export interface OfficeHoursJson {
@@ -36,9 +36,10 @@ import {
   parseOfficeHoursJson,
   NewOfficeHours,
   UpdatedCourseSite,
-  NewOfficeHoursRecurrencePattern
+  NewOfficeHoursRecurrencePattern,
+  RosterImportResponse
 } from './my-courses.model';
-import { Observable, map } from 'rxjs';
+import { Observable, map, of } from 'rxjs';
 
 /** Enum for days of the week */
 export enum Weekday {
@@ -255,13 +256,13 @@ export class MyCoursesService {
 
   /**
    * Imports a roster for from a Canvas CSV File
-   * @returns {Observable<{ uploaded: number }>}
+   * @returns {Observable<RosterImportResponse>}
    */
   importRosterFromCanvasCSV(
     section_id: number,
     csvData: string
-  ): Observable<{ uploaded: number }> {
-    return this.http.post<{ uploaded: number }>(
+  ): Observable<RosterImportResponse> {
+    return this.http.post<RosterImportResponse>(
       `/api/academics/section-member/import-from-canvas/${section_id}`,
       {
         csv_data: csvData
@@ -359,6 +360,28 @@ export class MyCoursesService {
       );
   }
 
+  /**
+   * Gets the ID of an office hours event, first storing it if it is an occurrence of
+   * a virtual recurrence pattern that has no ID of its own yet.
+   * @param siteId: ID of the site the office hours belong to.
+   * @param event: Office hours event to get the ID of.
+   * @returns {Observable<number>}
+   */
+  getOfficeHoursId(
+    siteId: number,
+    event: OfficeHourEventOverview
+  ): Observable<number> {
+    if (event.id !== null) {
+      return of(event.id);
+    }
+    return this.http
+      .post<OfficeHoursJson>(
+        `/api/office-hours/${siteId}/recurring/${event.recurrence_pattern_id}/${event.occurrence_date}`,
+        null
+      )
+      .pipe(map((officeHours) => officeHours.id));
+  }
+
   /**
    * Delete office hours.
    * @param siteId: ID of the site to look for office hours.